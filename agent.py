@@ -2,14 +2,31 @@
 # AGENT
 # ============================================================================
 import pickle
+import random
 
-from constants import ACTIONS, GAMMA, ALPHA, EPSILON
-from random import choice, random
+import numpy as np
+
+from constants import ACTIONS, GAMMA, ALPHA, EPSILON, LAMBDA, TRACE_MIN
+from environment import FEATURE_BOUNDS, STATE_BOUNDS, ActionRepeat
+from checkpoint import open_checkpoint, read_header, summarize, write_checkpoint
+from profiling import uninstrument
+from qtable import DenseQTable, LazyQTable, qtable_to_arrays
+from mlp import MLP, Adam, set_blas_threads
+from replay_buffer import PrioritizedReplay, ReplayBuffer
+from tile_coding import TileCoder
 
 
 class Agent:
-    def __init__(self, env):
+    # Fichier de sauvegarde par défaut (main.train/play)
+    checkpoint_name = "agent.pkl"
+    # Apprend de transitions (s, a, r, s', done) sur états 18D via learn():
+    # requis par ParallelCollector, le replay prioritaire et les traces
+    learns_from_transitions = True
+
+    def __init__(self, env, seed=None):
         self.env = env
+        # Flux aléatoire propre à l'agent (exploration, départage des ex-aequo)
+        self.rng = random.Random(seed)
         self.qtable = {}
         self.history = []
         self.score = 0
@@ -25,35 +42,72 @@ class Agent:
         self.progress_history = []
         self.win_history = []
 
+        # Ticks de simulation par décision (voir enable_action_repeat)
+        self.action_repeat = 1
+
+        # Experience replay (désactivé par défaut, voir enable_replay)
+        self.replay = None
+        self.replay_batch_size = 64
+        self.replay_batches = 8
+
+    def enable_action_repeat(self, k):
+        """Une décision (et une mise à jour) tous les `k` ticks: env enveloppé dans
+        environment.ActionRepeat et actualisation γ^k entre deux décisions."""
+        if k <= 1 or self.action_repeat > 1:
+            return
+        self.env = ActionRepeat(self.env, k, self.gamma)
+        self.gamma = self.gamma ** k
+        self.action_repeat = k
+
+    def enable_replay(self, capacity=20_000, batch_size=64, batches=8, alpha=0.6, beta=0.4):
+        """Garder les transitions vues par learn() et les rejouer par lots (replay_learn)."""
+        self.replay = PrioritizedReplay(capacity, alpha=alpha, beta=beta,
+                                        seed=self.rng.randrange(2 ** 32))
+        self.replay_batch_size = batch_size
+        self.replay_batches = batches
+
     def reset(self):
         if self.score != 0:
             self.history.append(self.score)
         self.score = 0
         return self.env.reset()
 
-    def best_action(self):
-        state = self.env.get_state()
+    def best_action(self, state=None):
+        """Action epsilon-greedy; `state` évite de redemander l'observation à l'env."""
+        if state is None:
+            state = self.env.get_state()
 
         # Exploration vs Exploitation (epsilon-greedy)
-        if random() < self.epsilon:
+        if self.rng.random() < self.epsilon:
             # Exploration: action aléatoire
-            return choice(ACTIONS)
+            return self.rng.choice(ACTIONS)
 
         # Exploitation : meilleure action connue
         if state in self.qtable:
             q_values = self.qtable[state]
             max_q = max(q_values.values())
             best_actions = [a for a, q in q_values.items() if q == max_q]
-            return choice(best_actions)
+            return self.rng.choice(best_actions)
         else:
             # État non vu, initialiser
             self.qtable[state] = {a: 0 for a in ACTIONS}
-            return choice(ACTIONS)
+            return self.rng.choice(ACTIONS)
 
-    def do(self, action):
-        state = self.env.get_state()
+    def do(self, action, state=None):
+        """Jouer `action` depuis `state` (état courant de l'env) et apprendre."""
+        if state is None:
+            state = self.env.get_state()
         next_state, reward, done = self.env.do(action)
+        self.learn(state, action, reward, next_state, done)
+        # Score en rewards bruts, même si l'apprentissage voit la somme actualisée
+        if self.action_repeat > 1:
+            self.score = self.env.total_reward
+        else:
+            self.score += reward
+        return next_state, reward, done
 
+    def learn(self, state, action, reward, next_state, done):
+        """Mise à jour Q-learning pour une transition (s, a, r, s', done)."""
         # Initialiser Q-values si nécessaire
         if state not in self.qtable:
             self.qtable[state] = {a: 0 for a in ACTIONS}
@@ -65,11 +119,54 @@ class Agent:
         max_next_q = 0 if done else max(self.qtable[next_state].values())
 
         # Formule: Q(s,a) = Q(s,a) + α[r + γ*maxQ(s',a') - Q(s,a)]
-        new_q = old_q + self.alpha * (reward + self.gamma * max_next_q - old_q)
-        self.qtable[state][action] = new_q
+        td_error = reward + self.gamma * max_next_q - old_q
+        self.qtable[state][action] = old_q + self.alpha * td_error
 
-        self.score += reward
-        return next_state, reward, done
+        if self.replay is not None:
+            self.replay.add(state, action, reward, next_state, done, td_error)
+
+    def replay_learn(self, batches=None):
+        """Rejouer `batches` lots tirés du replay (entre deux épisodes).
+
+        Returns: états dont les Q-values ont changé.
+        """
+        touched = set()
+        if self.replay is None or len(self.replay) == 0:
+            return touched
+        for _ in range(self.replay_batches if batches is None else batches):
+            slots, keys, actions, rewards, next_keys, dones, weights = \
+                self.replay.sample(self.replay_batch_size)
+            td_errors = self._learn_batch(keys, actions, rewards, next_keys, dones, weights, touched)
+            self.replay.update_priorities(slots, td_errors)
+        return touched
+
+    def _learn_batch(self, keys, actions, rewards, next_keys, dones, weights, touched):
+        """Mises à jour Q-learning pondérées d'un lot, dans l'ordre. Returns: erreurs TD."""
+        decode_batch = self.replay.codec.decode_batch
+        td_errors = np.empty(len(keys))
+        for i, (state, action, reward, next_state, done, weight) in enumerate(zip(
+                decode_batch(keys), actions.tolist(), rewards.tolist(), decode_batch(next_keys),
+                dones.tolist(), weights.tolist())):
+            if state not in self.qtable:
+                self.qtable[state] = {a: 0 for a in ACTIONS}
+            q_values = self.qtable[state]
+            if done or next_state not in self.qtable:
+                max_next_q = 0
+            else:
+                max_next_q = max(self.qtable[next_state].values())
+
+            old_q = q_values[action]
+            td_errors[i] = td_error = reward + self.gamma * max_next_q - old_q
+            q_values[action] = old_q + self.alpha * weight * td_error
+            touched.add(state)
+        return td_errors
+
+    def enable_profiling(self, profiler):
+        """Chronométrer best_action/learn et l'environnement (None: désactiver)."""
+        uninstrument(self, ('best_action', 'learn', 'replay_learn'))
+        if profiler is not None:
+            profiler.instrument(self, ('best_action', 'learn', 'replay_learn'), prefix="agent.")
+        self.env.enable_profiling(profiler)
 
     def get_metrics(self):
         """Calcule les métriques d'apprentissage simplifiées."""
@@ -86,22 +183,461 @@ class Agent:
         return {
             'win_rate': win_rate,
             'avg_score': avg_score,
-            'q_size': len(self.qtable),
+            'q_size': self.model_size(),
             'epsilon': self.epsilon,
         }
 
+    def model_size(self):
+        """Taille du modèle affichée dans les logs (nombre d'états de la Q-table)."""
+        return len(self.qtable)
+
+    def _import_qtable(self, qtable):
+        """Q-table lue depuis l'ancien format pickle {état: {action: q}}."""
+        return qtable
+
+    def _export_arrays(self):
+        """(clés triées, Q-values) pour le checkpoint."""
+        return qtable_to_arrays(self.qtable)
+
+    def _import_arrays(self, keys, values):
+        """Q-table adossée aux tableaux mappés du checkpoint (chargement paresseux)."""
+        return LazyQTable(keys, values)
+
+    def _model_arrays(self):
+        """Tableaux du modèle à sauvegarder (nom → ndarray)."""
+        keys, values = self._export_arrays()
+        return {'keys': keys, 'values': values}
+
+    def _load_model(self, arrays):
+        self.qtable = self._import_arrays(arrays['keys'], arrays['values'])
+
+    def _detach_model(self):
+        """Lâcher les tableaux mappés par load(): save() remplace souvent ce même fichier,
+        ce que Windows refuse tant qu'il reste mappé."""
+        if isinstance(self.qtable, LazyQTable):
+            self.qtable.detach()
+
     def save(self, filename):
-        with open(filename, 'wb') as f:
-            pickle.dump((self.qtable, self.history, self.win_history, self.progress_history), f)
+        """Sauvegarde atomique au format checkpoint (voir checkpoint.py)."""
+        self._detach_model()
+        model = self._model_arrays()
+        metrics = summarize(self.history, self.win_history, self.progress_history)
+        metrics['q_size'] = self.model_size()
+        write_checkpoint(filename, {
+            **model,
+            'history': np.asarray(self.history, dtype=np.float64),
+            'win_history': np.asarray(self.win_history, dtype=np.int8),
+            'progress_history': np.asarray(self.progress_history, dtype=np.float64),
+        }, metrics)
 
     def load(self, filename):
+        if read_header(filename) is None:
+            self._load_pickle(filename)
+            return
+        _, arrays = open_checkpoint(filename)
+        self._load_model(arrays)
+        self.history = arrays['history'].tolist()
+        self.win_history = arrays['win_history'].tolist()
+        self.progress_history = arrays['progress_history'].tolist()
+
+    def _load_pickle(self, filename):
+        """Ancien format: un seul pickle (qtable, histories)."""
         with open(filename, 'rb') as f:
             data = pickle.load(f)
             # Support ancien format (qtable, history) et nouveau (qtable, history, win_history, progress_history)
             if len(data) == 2:
-                self.qtable, self.history = data
+                qtable, self.history = data
+                self.qtable = self._import_qtable(qtable)
                 # Reconstruire win_history et progress_history à partir de history (approximation)
                 self.win_history = [1 if s > 1000 else 0 for s in self.history]
                 self.progress_history = []  # Pas de données historiques
             elif len(data) == 4:
-                self.qtable, self.history, self.win_history, self.progress_history = data
\ No newline at end of file
+                qtable, self.history, self.win_history, self.progress_history = data
+                self.qtable = self._import_qtable(qtable)
+
+
+class DenseAgent(Agent):
+    """Agent Q-learning sur Q-table dense float32 (voir qtable.DenseQTable).
+
+    Même politique et même règle de mise à jour que `Agent`, même format de
+    sauvegarde.
+    """
+
+    def __init__(self, env, seed=None):
+        super().__init__(env, seed)
+        self.qtable = DenseQTable()
+        # Départage des ex-aequo de DenseQTable.best_actions (dérivé du flux de l'agent)
+        self.np_rng = np.random.default_rng(self.rng.randrange(2 ** 32))
+
+    def best_action(self, state=None):
+        if state is None:
+            state = self.env.get_state()
+
+        if self.rng.random() < self.epsilon:
+            return self.rng.choice(ACTIONS)
+
+        # État nouveau: ligne à 0, donc tirage uniforme parmi les ex-aequo
+        row = self.qtable.row(state)
+        return ACTIONS[self.qtable.best_actions([row], self.np_rng)[0]]
+
+    def learn(self, state, action, reward, next_state, done):
+        row = self.qtable.row(state)
+        next_row = self.qtable.row(next_state)
+        # Récupérer la vue après row(): le tableau peut avoir été agrandi
+        values = self.qtable.values
+
+        old_q = values[row, action]
+        max_next_q = 0 if done else values[next_row].max()
+        td_error = reward + self.gamma * max_next_q - old_q
+        values[row, action] = old_q + self.alpha * td_error
+
+        if self.replay is not None:
+            self.replay.add(state, action, reward, next_state, done, td_error)
+
+    def _learn_batch(self, keys, actions, rewards, next_keys, dones, weights, touched):
+        """Mise à jour vectorisée du lot (erreurs TD calculées avant mise à jour)."""
+        rows = self.qtable.rows(keys)
+        next_rows = self.qtable.rows(next_keys)
+        values = self.qtable.values
+
+        max_next_q = np.where(dones, 0.0, values[next_rows].max(axis=1))
+        td_errors = rewards + self.gamma * max_next_q - values[rows, actions]
+        # add.at: une même (ligne, action) tirée deux fois reçoit les deux mises à jour
+        np.add.at(values, (rows, actions), (self.alpha * weights * td_errors).astype(np.float32))
+        return td_errors
+
+    def _import_qtable(self, qtable):
+        return DenseQTable.from_dict(qtable)
+
+    def _export_arrays(self):
+        return self.qtable.to_arrays()
+
+    def _import_arrays(self, keys, values):
+        return DenseQTable.from_arrays(keys, values)
+
+    def _detach_model(self):
+        self.qtable.detach()
+
+
+class TraceAgent(Agent):
+    """Q(λ) de Watkins ou SARSA(λ), avec traces d'éligibilité creuses.
+
+    Les traces (remplaçantes) sont un dict {(état, action): e} ne gardant que
+    les paires visitées récemment: chaque step multiplie les traces par γλ et
+    élague celles sous TRACE_MIN, d'où au plus log(TRACE_MIN)/log(γλ) entrées
+    (~35 avec les valeurs par défaut) et un coût par step indépendant de la
+    taille de la Q-table. Une récompense terminale remonte ainsi d'un coup
+    sur toute la fin de trajectoire au lieu d'un état par visite.
+
+    mode="watkins": cible max Q(s', ·); les traces sont coupées quand l'action
+    jouée n'est pas gloutonne (exploration). mode="sarsa": cible Q(s', a'),
+    la mise à jour d'un step attend donc l'action suivante (learn suivant).
+    Tout passe par learn(): fonctionne aussi avec les transitions rejouées
+    par ParallelCollector.
+    """
+
+    MODES = ("watkins", "sarsa")
+
+    def __init__(self, env, seed=None, mode="watkins", lam=LAMBDA, trace_min=TRACE_MIN):
+        if mode not in self.MODES:
+            raise ValueError(f"mode doit être l'un de {self.MODES}, reçu {mode!r}")
+        super().__init__(env, seed)
+        self.mode = mode
+        self.lam = lam
+        self.trace_min = trace_min
+        self.traces = {}
+        self._pending = None      # SARSA: transition en attente de a'
+        self._expected = None     # état suivant attendu (détection d'un nouvel épisode)
+
+    def reset(self):
+        self._end_trajectory()
+        return super().reset()
+
+    def _q_values(self, state):
+        if state not in self.qtable:
+            self.qtable[state] = {a: 0 for a in ACTIONS}
+        return self.qtable[state]
+
+    def _end_trajectory(self):
+        """Épisode interrompu (MAX_STEPS): la transition SARSA en attente bootstrappe sur max Q."""
+        if self._pending is not None:
+            state, action, reward, next_state = self._pending
+            self._pending = None
+            target = reward + self.gamma * max(self._q_values(next_state).values())
+            self._trace_update(state, action, target - self._q_values(state)[action])
+        self.traces = {}
+        self._expected = None
+
+    def _trace_update(self, state, action, td_error):
+        """e(s, a) = 1, Q += α δ e sur toutes les traces, puis décroissance et élagage."""
+        traces = self.traces
+        traces[(state, action)] = 1.0
+        step = self.alpha * td_error
+        decay = self.gamma * self.lam
+        trace_min = self.trace_min
+        qtable = self.qtable
+        kept = {}
+        for key, e in traces.items():
+            qtable[key[0]][key[1]] += step * e
+            e *= decay
+            if e >= trace_min:
+                kept[key] = e
+        self.traces = kept
+
+    def learn(self, state, action, reward, next_state, done):
+        if self._expected is not None and state != self._expected:
+            self._end_trajectory()  # transitions d'un autre épisode
+        q_values = self._q_values(state)
+        next_q = self._q_values(next_state)
+
+        if self.mode == "watkins":
+            if self.traces and q_values[action] != max(q_values.values()):
+                self.traces = {}  # action exploratoire: coupure de Watkins
+            max_next_q = 0 if done else max(next_q.values())
+            td_error = reward + self.gamma * max_next_q - q_values[action]
+            self._trace_update(state, action, td_error)
+        else:
+            if self._pending is not None:
+                p_state, p_action, p_reward, _ = self._pending
+                self._pending = None
+                target = p_reward + self.gamma * q_values[action]
+                self._trace_update(p_state, p_action, target - self.qtable[p_state][p_action])
+            if done:
+                td_error = reward - q_values[action]
+                self._trace_update(state, action, td_error)
+            else:
+                # a' inconnu: priorité de replay estimée avec max Q(s', ·)
+                td_error = reward + self.gamma * max(next_q.values()) - q_values[action]
+                self._pending = (state, action, reward, next_state)
+
+        if self.replay is not None:
+            self.replay.add(state, action, reward, next_state, done, td_error)
+
+        if done:
+            self.traces = {}
+            self._expected = None
+        else:
+            self._expected = next_state
+
+
+class TileCodingAgent(Agent):
+    """Q-learning linéaire sur tile coding des features continues (voir tile_coding.py).
+
+    Q(s, a) = somme des poids des tuiles actives de s pour a, poids dans un
+    tableau float32 (size, n_actions) de taille fixe: la mémoire ne dépend
+    plus du nombre d'états visités et deux observations voisines partagent
+    la plupart de leurs tuiles (généralisation). L'observation est
+    `env.get_features()`; l'état 18D passé par la boucle d'entraînement est
+    ignoré. Apprend dans do(), pas de transitions 18D: ni workers, ni
+    replay, ni traces (refusés par main.train et ParallelCollector).
+    """
+
+    checkpoint_name = "agent_tiles.pkl"
+    learns_from_transitions = False
+
+    # (indices dans environment.FEATURE_BOUNDS, tuiles par dimension)
+    GROUPS = (
+        ((0,), 32),             # position dans le niveau
+        ((0, 1), 16),           # position (x, y)
+        ((4, 3, 5, 7), 6),      # saut: au sol, vitesse verticale, fossé, sol restant
+        ((5, 6, 2), 8),         # fossé: distance, largeur, vitesse horizontale
+        ((8, 9, 4), 8),         # plateforme devant: distance, hauteur, au sol
+        ((10, 11), 8),          # ennemi le plus proche: dx, dy
+        ((12, 4), 8),           # balle dangereuse la plus proche
+    )
+
+    def __init__(self, env, seed=None, n_tilings=8, size=2 ** 18):
+        super().__init__(env, seed)
+        self.coder = TileCoder(FEATURE_BOUNDS, self.GROUPS, n_tilings, size)
+        self.weights = np.zeros((size, len(ACTIONS)), dtype=np.float32)
+        # α réparti sur les tuiles actives: un pas complet = α · δ sur Q(s, a)
+        self.alpha = 0.1
+        self._tiles = None
+        self._tiles_version = None
+
+    def enable_replay(self, *args, **kwargs):
+        raise ValueError("TileCodingAgent: pas de replay (les transitions sont des états 18D)")
+
+    def _active_tiles(self):
+        """Tuiles de l'observation courante, calculées une fois par version de l'env."""
+        if self._tiles_version != self.env.version:
+            self._tiles = self.coder.tiles(self.env.get_features())
+            self._tiles_version = self.env.version
+        return self._tiles
+
+    def best_action(self, state=None):
+        if self.rng.random() < self.epsilon:
+            return self.rng.choice(ACTIONS)
+        q_values = self.weights[self._active_tiles()].sum(axis=0)
+        best_actions = np.flatnonzero(q_values == q_values.max())
+        return ACTIONS[self.rng.choice(best_actions)]
+
+    def do(self, action, state=None):
+        tiles = self._active_tiles()
+        next_state, reward, done = self.env.do(action)
+        self._update(tiles, action, reward, None if done else self._active_tiles())
+        if self.action_repeat > 1:
+            self.score = self.env.total_reward
+        else:
+            self.score += reward
+        return next_state, reward, done
+
+    def _update(self, tiles, action, reward, next_tiles):
+        """Descente de gradient semi-linéaire sur les poids des tuiles actives."""
+        weights = self.weights
+        max_next_q = 0.0 if next_tiles is None else weights[next_tiles].sum(axis=0).max()
+        td_error = reward + self.gamma * max_next_q - weights[tiles, action].sum()
+        # add.at: deux tuiles hachées sur la même ligne reçoivent chacune leur pas
+        np.add.at(weights[:, action], tiles, np.float32(self.alpha / len(tiles) * td_error))
+        return td_error
+
+    def model_size(self):
+        """Nombre de lignes de poids déjà touchées (le tableau lui-même est de taille fixe)."""
+        return int(np.count_nonzero(self.weights.any(axis=1)))
+
+    def _model_arrays(self):
+        return {'weights': self.weights}
+
+    def _load_model(self, arrays):
+        weights = arrays['weights']
+        if weights.shape != self.weights.shape:
+            raise ValueError(f"checkpoint: poids {weights.shape}, agent {self.weights.shape}")
+        self.weights = np.array(weights)
+
+    def _load_pickle(self, filename):
+        raise ValueError(f"{filename}: pas un checkpoint de TileCodingAgent")
+
+
+class DQNAgent(Agent):
+    """DQN compact sur CPU: MLP NumPy (voir mlp.py), réseau cible et replay uniforme.
+
+    Entrée: l'état 18D normalisé (inputs="state", bornes STATE_BOUNDS) ou les
+    features continues (inputs="features", bornes FEATURE_BOUNDS), ramenés
+    dans [-1, 1]. Chaque do() range la transition dans le replay; tous les
+    `train_every` steps, un minibatch est appris d'un bloc (forward, perte de
+    Huber sur Q(s, a), backward, Adam). La cible r + γ max Q_cible(s', ·) vient
+    d'une copie du réseau resynchronisée tous les `target_every` steps.
+    Les rewards sont multipliés par `reward_scale` pour l'apprentissage
+    (drapeau = 1200): seule l'échelle des Q-values change, pas la politique.
+
+    blas_threads: limiter BLAS à n threads pour tout le process (voir
+    mlp.set_blas_threads); None par défaut, le choix revient au point d'entrée
+    (main.py train --blas-threads, benchmark.py run --blas-threads).
+    Comme TileCodingAgent, apprend dans do(): ni workers, ni traces, ni --replay.
+    """
+
+    checkpoint_name = "agent_dqn.pkl"
+    learns_from_transitions = False
+
+    INPUTS = {"state": STATE_BOUNDS, "features": FEATURE_BOUNDS}
+
+    def __init__(self, env, seed=None, inputs="state", hidden=(64, 64), lr=1e-3,
+                 batch_size=64, buffer_size=50_000, warmup=1_000, train_every=4,
+                 target_every=2_000, reward_scale=0.01, blas_threads=None):
+        if inputs not in self.INPUTS:
+            raise ValueError(f"inputs doit être l'un de {tuple(self.INPUTS)}, reçu {inputs!r}")
+        super().__init__(env, seed)
+        self.alpha = lr  # affiché dans les logs de main.train
+        if blas_threads is not None:
+            set_blas_threads(blas_threads)
+        self.inputs = inputs
+        bounds = np.array(self.INPUTS[inputs], dtype=np.float32)
+        self._low = bounds[:, 0]
+        self._scale = 2.0 / (bounds[:, 1] - bounds[:, 0])
+
+        self.np_rng = np.random.default_rng(self.rng.randrange(2 ** 32))
+        sizes = (len(bounds), *hidden, len(ACTIONS))
+        self.net = MLP(sizes, self.np_rng)
+        self.target = MLP(sizes, self.np_rng)
+        self.target.copy_from(self.net)
+        self.optimizer = Adam(self.net.flat, lr=lr)
+
+        self.buffer = ReplayBuffer(buffer_size, len(bounds), seed=self.rng.randrange(2 ** 32))
+        self.batch_size = batch_size
+        self.warmup = warmup
+        self.train_every = train_every
+        self.target_every = target_every
+        self.reward_scale = reward_scale
+        self.updates = 0
+        self.steps_done = 0
+        self.losses = []  # perte moyenne de chaque minibatch (métriques)
+
+        self._obs = None
+        self._obs_version = None
+
+    def enable_replay(self, *args, **kwargs):
+        raise ValueError("DQNAgent: replay uniforme intégré (voir ReplayBuffer), pas de replay prioritaire")
+
+    def _observe(self):
+        """Observation normalisée de l'env, calculée une fois par version."""
+        if self._obs_version != self.env.version:
+            raw = self.env.get_state() if self.inputs == "state" else self.env.get_features()
+            obs = (np.asarray(raw, dtype=np.float32) - self._low) * self._scale - 1.0
+            self._obs = np.clip(obs, -1.0, 1.0, out=obs)
+            self._obs_version = self.env.version
+        return self._obs
+
+    def best_action(self, state=None):
+        if self.rng.random() < self.epsilon:
+            return self.rng.choice(ACTIONS)
+        q_values = self.net.predict(self._observe()[None])[0]
+        best_actions = np.flatnonzero(q_values == q_values.max())
+        return ACTIONS[self.rng.choice(best_actions)]
+
+    def do(self, action, state=None):
+        obs = self._observe()
+        next_state, reward, done = self.env.do(action)
+        self.buffer.add(obs, action, reward * self.reward_scale, self._observe(), done)
+        self.steps_done += 1
+        if len(self.buffer) >= self.warmup and self.steps_done % self.train_every == 0:
+            self._train_batch()
+        if self.steps_done % self.target_every == 0:
+            self.target.copy_from(self.net)
+        if self.action_repeat > 1:
+            self.score = self.env.total_reward
+        else:
+            self.score += reward
+        return next_state, reward, done
+
+    def _train_batch(self):
+        """Une descente de gradient sur un minibatch tiré du replay."""
+        obs, actions, rewards, next_obs, dones = self.buffer.sample(self.batch_size)
+        max_next_q = self.target.predict(next_obs).max(axis=1)
+        targets = rewards + np.where(dones, 0.0, self.gamma * max_next_q).astype(np.float32)
+
+        q_values = self.net.forward(obs)
+        rows = np.arange(len(actions))
+        errors = q_values[rows, actions] - targets
+        # Huber (δ = 1): gradient écrêté à ±1, seulement sur l'action jouée
+        grad = np.zeros_like(q_values)
+        grad[rows, actions] = np.clip(errors, -1.0, 1.0) / len(actions)
+        self.optimizer.step(self.net.backward(grad))
+        self.updates += 1
+
+        abs_errors = np.abs(errors)
+        self.losses.append(float(np.where(abs_errors < 1.0, 0.5 * errors ** 2, abs_errors - 0.5).mean()))
+
+    def get_metrics(self):
+        metrics = super().get_metrics()
+        metrics['loss'] = sum(self.losses[-100:]) / min(100, len(self.losses)) if self.losses else 0
+        return metrics
+
+    def model_size(self):
+        """Nombre de paramètres du réseau (taille fixe)."""
+        return self.net.n_params()
+
+    def _model_arrays(self):
+        # Vecteurs de paramètres à plat (voir mlp.MLP); l'état d'Adam n'est pas sauvegardé
+        return {'net': self.net.flat, 'target': self.target.flat,
+                'sizes': np.array(self.net.sizes, dtype=np.int64)}
+
+    def _load_model(self, arrays):
+        sizes = tuple(arrays['sizes'].tolist()) if 'sizes' in arrays else None
+        if sizes != self.net.sizes:
+            raise ValueError(f"checkpoint: réseau {sizes}, agent {self.net.sizes} (inputs={self.inputs!r})")
+        self.net.flat[...] = arrays['net']
+        self.target.flat[...] = arrays['target']
+        self.optimizer = Adam(self.net.flat, lr=self.optimizer.lr)
+
+    def _load_pickle(self, filename):
+        raise ValueError(f"{filename}: pas un checkpoint de DQNAgent")
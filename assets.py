@@ -0,0 +1,45 @@
+"""Images optionnelles du dossier assets/, chargées une seule fois par process.
+
+Rien n'est lu avant le premier appel (c.-à-d. le premier draw): l'entraînement
+headless ne touche jamais au disque ni à pygame.image. Chaque image est
+convertie pour l'écran, mise à l'échelle et retournée horizontalement une
+fois pour toutes; une image absente est mémorisée comme None.
+"""
+
+import os
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# (nom, taille, alpha) → (image, image retournée), ou (None, None) si absente
+_cache = {}
+
+
+def _load(name, size, alpha):
+    path = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(path):
+        return None, None
+    import pygame
+    img = pygame.image.load(path)
+    img = img.convert_alpha() if alpha else img.convert()
+    if size is not None:
+        img = pygame.transform.scale(img, size)
+    return img, pygame.transform.flip(img, True, False)
+
+
+def sprite(name, size=None, flip=False, alpha=True):
+    """Image `name` (mise à l'échelle si size=(w, h) ou côté d'un carré), ou None si absente.
+
+    flip: variante retournée horizontalement (précalculée).
+    """
+    if isinstance(size, int):
+        size = (size, size)
+    key = (name, size, alpha)
+    variants = _cache.get(key)
+    if variants is None:
+        variants = _cache[key] = _load(name, size, alpha)
+    return variants[1] if flip else variants[0]
+
+
+def clear_cache():
+    """Oublier les images chargées (p. ex. après pygame.quit(), les surfaces converties sont invalides)."""
+    _cache.clear()
@@ -0,0 +1,302 @@
+"""Benchmarks reproductibles de la simulation et de l'agent.
+
+Usage:
+    python benchmark.py run [--out bench.json] [--seed 0] [--quick] [--blas-threads N]
+    python benchmark.py compare ancien.json nouveau.json [--threshold 0.10]
+
+`run` mesure le débit de Environment.step (actions aléatoires et scriptées),
+la latence de reset, le coût de get_state, best_action/do de Agent et
+DenseAgent à plusieurs tailles de Q-table, et train() headless de bout en bout.
+Chaque mesure est répétée et on garde la meilleure (la moins bruitée).
+
+`compare` affiche le ratio nouveau/ancien par mesure et sort avec le code 1
+si une mesure se dégrade de plus de `threshold`.
+
+--blas-threads: limiter BLAS à N threads pendant les mesures (voir
+mlp.set_blas_threads); sans l'option, la configuration du process est gardée.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from constants import ACTIONS, ACTION_RIGHT, ACTION_JUMP, ACTION_SHOOT, ACTION_IDLE
+from environment import Environment
+from agent import Agent, DenseAgent
+from mlp import set_blas_threads
+from qtable import StateCodec
+
+# Séquence scriptée: surtout avancer, avec sauts et tirs réguliers
+SCRIPT = [ACTION_RIGHT] * 6 + [ACTION_JUMP] + [ACTION_RIGHT] * 4 + [ACTION_SHOOT, ACTION_IDLE]
+
+FULL = {"steps": 20000, "resets": 2000, "states": 20000, "agent_ops": 20000,
+        "q_sizes": (0, 10_000, 100_000), "train_episodes": 30, "repeat": 3}
+QUICK = {"steps": 3000, "resets": 300, "states": 3000, "agent_ops": 3000,
+         "q_sizes": (0, 10_000), "train_episodes": 5, "repeat": 2}
+
+
+def _best_time(fn, repeat):
+    """Meilleur temps (s) de `repeat` exécutions de fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _result(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+# ----------------------------------------------------------------------
+# Environment
+# ----------------------------------------------------------------------
+def bench_step(env, n_steps, actions, seed, repeat):
+    """Steps/s sur un flux d'actions, reset automatique en fin d'épisode."""
+    def run():
+        rng = random.Random(seed)
+        env.reset()
+        for i in range(n_steps):
+            _, _, done = env.step(actions(i, rng))
+            if done:
+                env.reset()
+    return _result(n_steps / _best_time(run, repeat), "steps/s", True)
+
+
+def bench_reset(env, n_resets, seed, repeat):
+    """Latence moyenne de reset() (µs), après quelques steps pour salir l'état."""
+    rng = random.Random(seed)
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(n_resets):
+            for _ in range(20):
+                if env.step(rng.choice(ACTIONS))[2]:
+                    break
+            t0 = time.perf_counter()
+            env.reset()
+            elapsed += time.perf_counter() - t0
+        best = min(best, elapsed)
+    return _result(best / n_resets * 1e6, "us/reset", False)
+
+
+def bench_get_state(env, n_states, seed, repeat):
+    """Coût d'un get_state() non caché (µs), le long d'une trajectoire aléatoire."""
+    rng = random.Random(seed)
+    env.reset()
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(n_states):
+            if env.step(rng.choice(ACTIONS))[2]:
+                env.reset()
+            env.invalidate_state()
+            t0 = time.perf_counter()
+            env.get_state()
+            elapsed += time.perf_counter() - t0
+        best = min(best, elapsed)
+    return _result(best / n_states * 1e6, "us/call", False)
+
+
+# ----------------------------------------------------------------------
+# Agent
+# ----------------------------------------------------------------------
+def _fill_qtable(agent, size, seed):
+    """Ajouter `size` états synthétiques (tirés dans STATE_BOUNDS) à la Q-table."""
+    codec = StateCodec()
+    space = 1
+    for radix in codec.radices:
+        space *= radix
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, space, size=size, dtype=np.int64)
+    q_values = rng.normal(size=(size, len(ACTIONS)))
+    for key, q in zip(keys.tolist(), q_values.tolist()):
+        state = codec.decode(key)
+        # Transition terminale depuis Q=0: la nouvelle valeur vaut alpha * reward = q
+        for action, value in zip(ACTIONS, q):
+            agent.learn(state, action, value / agent.alpha, state, True)
+
+
+def bench_agent(agent_class, q_size, n_ops, seed, repeat):
+    """(best_action/s, do/s) en exploitation pure sur une Q-table de `q_size` états."""
+    env = Environment()
+    agent = agent_class(env, seed=seed)
+    _fill_qtable(agent, q_size, seed)
+    agent.epsilon = 0.0
+
+    # Trajectoire réelle: mêmes états pour toutes les répétitions
+    rng = random.Random(seed)
+    states = [env.reset()]
+    for _ in range(n_ops):
+        state, _, done = env.step(rng.choice(ACTIONS))
+        states.append(env.reset() if done else state)
+
+    def run_best_action():
+        agent.rng.seed(seed)
+        for state in states:
+            agent.best_action(state)
+
+    def run_do():
+        agent.rng.seed(seed)
+        state = agent.reset()
+        for _ in range(n_ops):
+            state, _, done = agent.do(agent.best_action(state), state)
+            if done:
+                state = agent.reset()
+
+    best_action_rate = len(states) / _best_time(run_best_action, repeat)
+    do_rate = n_ops / _best_time(run_do, repeat)
+    return _result(best_action_rate, "calls/s", True), _result(do_rate, "steps/s", True)
+
+
+# ----------------------------------------------------------------------
+# Bout en bout
+# ----------------------------------------------------------------------
+def bench_train(episodes, seed):
+    """Épisodes/s de main.train() headless, dans un dossier temporaire (agent neuf)."""
+    import main
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                main.train(episodes=episodes, render_every=0, seed=seed)
+                elapsed = time.perf_counter() - t0
+        finally:
+            os.chdir(cwd)
+    return _result(episodes / elapsed, "episodes/s", True)
+
+
+# ----------------------------------------------------------------------
+# Exécution / comparaison
+# ----------------------------------------------------------------------
+def _metadata(seed, config, blas_threads=None):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": commit or None,
+        "seed": seed,
+        "config": {k: list(v) if isinstance(v, tuple) else v for k, v in config.items()},
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "blas_threads": blas_threads,
+        "platform": platform.platform(),
+    }
+
+
+def run_benchmarks(seed=0, quick=False, blas_threads=None):
+    """Returns: {"meta": ..., "results": {nom: {value, unit, higher_is_better}}}."""
+    if blas_threads is not None:
+        set_blas_threads(blas_threads)
+    config = QUICK if quick else FULL
+    repeat = config["repeat"]
+    results = {}
+
+    env = Environment()
+    results["env.step.random"] = bench_step(
+        env, config["steps"], lambda i, rng: rng.choice(ACTIONS), seed, repeat)
+    results["env.step.scripted"] = bench_step(
+        env, config["steps"], lambda i, rng: SCRIPT[i % len(SCRIPT)], seed, repeat)
+    results["env.reset"] = bench_reset(env, config["resets"], seed, repeat)
+    results["env.get_state"] = bench_get_state(env, config["states"], seed, repeat)
+
+    for agent_class in (Agent, DenseAgent):
+        for q_size in config["q_sizes"]:
+            best_action, do = bench_agent(agent_class, q_size, config["agent_ops"], seed, repeat)
+            results[f"{agent_class.__name__}.best_action.q{q_size}"] = best_action
+            results[f"{agent_class.__name__}.do.q{q_size}"] = do
+
+    results["train.episodes"] = bench_train(config["train_episodes"], seed)
+    return {"meta": _metadata(seed, config, blas_threads), "results": results}
+
+
+def compare(old, new, threshold=0.10):
+    """Lignes (nom, ancien, nouveau, ratio, régression?) des mesures communes.
+
+    ratio > 1 signifie toujours "mieux" (inversé pour les mesures en temps).
+    """
+    rows = []
+    for name, new_result in new["results"].items():
+        old_result = old["results"].get(name)
+        if old_result is None or not old_result["value"] or not new_result["value"]:
+            continue
+        if new_result["higher_is_better"]:
+            ratio = new_result["value"] / old_result["value"]
+        else:
+            ratio = old_result["value"] / new_result["value"]
+        rows.append((name, old_result["value"], new_result["value"], ratio, ratio < 1 - threshold))
+    return rows
+
+
+def _print_results(data):
+    for name, result in data["results"].items():
+        print(f"  {name:<32}{result['value']:>14.1f} {result['unit']}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python benchmark.py", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="mesurer et sauvegarder les résultats")
+    run_parser.add_argument("--out", default="bench.json")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--quick", action="store_true")
+    run_parser.add_argument("--blas-threads", type=int, help="limiter BLAS à N threads")
+    compare_parser = commands.add_parser("compare", help="comparer deux fichiers de résultats")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    return parser
+
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        data = run_benchmarks(seed=args.seed, quick=args.quick, blas_threads=args.blas_threads)
+        _print_results(data)
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"✓ Résultats sauvegardés: {args.out}")
+        return 0
+
+    threshold = args.threshold
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    regressions = 0
+    print(f"  {'mesure':<32}{'ancien':>14}{'nouveau':>14}{'ratio':>8}")
+    for name, old_value, new_value, ratio, regressed in compare(old, new, threshold):
+        flag = "  ✗ RÉGRESSION" if regressed else ""
+        regressions += regressed
+        print(f"  {name:<32}{old_value:>14.1f}{new_value:>14.1f}{ratio:>8.2f}{flag}")
+    print(f"{regressions} régression(s) au-delà de {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,136 @@
+"""Format de sauvegarde de l'agent: en-tête JSON + tableaux bruts mappés en mémoire.
+
+Layout du fichier:
+    MAGIC (8 octets) | taille de l'en-tête (uint32 LE) | en-tête JSON | tableaux
+
+Chaque tableau est aligné sur 64 octets; l'en-tête donne son dtype, sa forme
+et son offset relatif au début de la zone de données. Les métriques résumées
+(progression, win rate...) sont dans l'en-tête, ce qui permet de comparer
+deux modèles sans lire la Q-table. L'écriture passe par un fichier temporaire
+renommé atomiquement: un crash pendant la sauvegarde laisse l'ancien fichier intact.
+"""
+
+import json
+import os
+import pickle
+import struct
+
+import numpy as np
+
+MAGIC = b"CONTRAQ1"
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sI")
+
+
+def _aligned(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def write_checkpoint(path, arrays, metrics):
+    """Écrire `arrays` (nom → ndarray) et `metrics` de façon atomique."""
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps({"version": 1, "metrics": metrics, "arrays": layout}).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_prefix(f):
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) < _PREFIX.size:
+        return None
+    magic, header_size = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        return None
+    return json.loads(f.read(header_size).decode("utf-8")), _aligned(_PREFIX.size + header_size)
+
+
+def read_header(path):
+    """En-tête d'un checkpoint, ou None si le fichier est à l'ancien format pickle."""
+    with open(path, "rb") as f:
+        prefix = _read_prefix(f)
+    return prefix[0] if prefix else None
+
+
+def open_checkpoint(path):
+    """Returns: (header, {nom: tableau}) — tableaux mappés en copy-on-write, chargés à la demande."""
+    with open(path, "rb") as f:
+        prefix = _read_prefix(f)
+    if prefix is None:
+        raise ValueError(f"{path}: pas un checkpoint {MAGIC.decode()}")
+    header, data_start = prefix
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        shape = tuple(spec["shape"])
+        if 0 in shape:
+            arrays[name] = np.zeros(shape, dtype=spec["dtype"])
+        else:
+            arrays[name] = np.memmap(path, dtype=spec["dtype"], mode="c",
+                                     offset=data_start + spec["offset"], shape=shape)
+    return header, arrays
+
+
+def summarize(history, win_history, progress_history):
+    """Métriques résumées stockées dans l'en-tête (100 derniers épisodes)."""
+    def avg_last_100(seq):
+        return sum(seq[-100:]) / min(100, len(seq)) if seq else 0
+
+    return {
+        "episodes": len(history),
+        "avg_score": avg_last_100(history),
+        "win_rate": avg_last_100(win_history) * 100,
+        "avg_progress": avg_last_100(progress_history),
+    }
+
+
+def read_saved_metrics(path):
+    """(avg_progress, win_rate) d'un modèle sauvegardé, en lisant seulement l'en-tête.
+
+    Les fichiers pickle de l'ancien format sont encore acceptés (lecture complète).
+    """
+    header = read_header(path)
+    if header is not None:
+        return header["metrics"]["avg_progress"], header["metrics"]["win_rate"]
+
+    with open(path, 'rb') as f:
+        old_data = pickle.load(f)
+
+    # Support ancien format et nouveau format
+    if len(old_data) == 2:
+        old_qtable, old_history = old_data
+        old_win_history = [1 if s > 1000 else 0 for s in old_history]
+        # Ancien format: pas de progression historique, on approxime
+        old_avg_progress = 0  # Inconnu, on sauvegarde le nouveau
+    elif len(old_data) == 4:
+        old_qtable, old_history, old_win_history, old_progress_history = old_data
+        # Calculer progression moyenne de l'ancien modèle
+        if len(old_progress_history) > 0:
+            old_avg_progress = sum(old_progress_history[-100:]) / min(100, len(old_progress_history))
+        else:
+            old_avg_progress = 0
+    else:
+        # Format inconnu
+        old_avg_progress = 0
+        old_win_history = []
+
+    old_wins = sum(old_win_history[-100:]) if old_win_history else 0
+    old_win_rate = (old_wins / min(100, len(old_win_history))) * 100 if old_win_history else 0
+    return old_avg_progress, old_win_rate
@@ -0,0 +1,74 @@
+"""Broad phase des collisions dynamiques (balles, ennemis, joueur).
+
+Les objets sont triés une fois par step sur leur bord gauche; une requête
+par intervalle en x (bisect) ne renvoie que les candidats dont la projection
+chevauche, puis le test AABB exact (geometry.overlap) tranche. Les résultats
+sont rendus dans l'ordre d'insertion pour garder la sémantique des anciennes
+boucles imbriquées: premier touché = premier dans l'ordre de liste.
+
+En dessous de BRUTE_FORCE_MAX objets, le tri coûte plus qu'il ne rapporte:
+les requêtes parcourent alors simplement la liste.
+"""
+
+from bisect import bisect_left
+
+from geometry import overlap
+
+BRUTE_FORCE_MAX = 8
+
+
+class SweepAndPrune:
+    """Objets indexés par bord gauche, reconstruits par build() à chaque step."""
+
+    def __init__(self):
+        self.objects = []  # dans l'ordre d'insertion
+        self.lefts = None  # bords gauches triés, None en mode force brute
+        self.sorted = []   # (rank, box, obj) dans l'ordre de lefts
+        self.max_width = 0
+
+    def build(self, objects):
+        """Indexer `objects` (ayant bounds()) dans leur ordre d'itération."""
+        objects = self.objects = list(objects)
+        if len(objects) <= BRUTE_FORCE_MAX:
+            self.lefts = None
+            return
+        boxes = [obj.bounds() for obj in objects]
+        # Tri stable: à bord gauche égal, l'ordre d'insertion est conservé
+        order = sorted(range(len(objects)), key=lambda rank: boxes[rank][0])
+        self.sorted = [(rank, boxes[rank], objects[rank]) for rank in order]
+        self.lefts = [boxes[rank][0] for rank in order]
+        self.max_width = max(box[2] - box[0] for box in boxes)
+
+    def __bool__(self):
+        return bool(self.objects)
+
+    def _candidates(self, box):
+        """Entrées triées dont la projection en x peut chevaucher `box`."""
+        # left < box.right et left + largeur > box.left
+        lo = bisect_left(self.lefts, box[0] - self.max_width + 1)
+        hi = bisect_left(self.lefts, box[2], lo)
+        return self.sorted[lo:hi]
+
+    def query(self, box):
+        """Objets dont la boîte chevauche `box`, dans l'ordre d'insertion."""
+        if self.lefts is None:
+            return [obj for obj in self.objects if overlap(box, obj.bounds())]
+        hits = [(rank, obj) for rank, obj_box, obj in self._candidates(box)
+                if overlap(box, obj_box)]
+        hits.sort(key=lambda hit: hit[0])
+        return [obj for _, obj in hits]
+
+    def first(self, box, alive):
+        """Premier objet (ordre d'insertion) qui chevauche `box` et vérifie alive(obj), ou None."""
+        if self.lefts is None:
+            for obj in self.objects:
+                if alive(obj) and overlap(box, obj.bounds()):
+                    return obj
+            return None
+        best_rank = None
+        best = None
+        for rank, obj_box, obj in self._candidates(box):
+            if (best_rank is None or rank < best_rank) and overlap(box, obj_box) and alive(obj):
+                best_rank = rank
+                best = obj
+        return best
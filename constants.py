@@ -30,6 +30,10 @@ ACTION_IDLE = 4
 
 ACTIONS = [ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_SHOOT, ACTION_IDLE]
 
+# Bullet owners
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
 # Colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
@@ -55,6 +59,8 @@ ALPHA = 0.05    # Learning rate
 GAMMA = 0.97   # Discount factor
 EPSILON_DECAY = 0.9995  # Décroissance plus lente
 EPSILON_MIN = 0.02     # Exploration minimale pour éviter l'exploitation totale
+LAMBDA = 0.9    # Décroissance des traces d'éligibilité (TraceAgent)
+TRACE_MIN = 0.01  # Trace élaguée en dessous de ce seuil
 
 # ============================================================================
 # RADAR CONFIGURATION (Système d'observation 18D)
@@ -1,13 +1,15 @@
 """Bullet entity for Contra RL game."""
 
-import pygame
-from constants import BULLET_SIZE, BULLET_SPEED, LEVEL_LENGTH, SCREEN_WIDTH, YELLOW, RED
+from constants import BULLET_SIZE, BULLET_SPEED, LEVEL_LENGTH, SCREEN_WIDTH, YELLOW, RED, OWNER_ENEMY, OWNER_PLAYER
+from geometry import bounds
 
 
 class Bullet:
     """Bullet projectile for player and enemies."""
 
-    def __init__(self, x, y, direction, owner='player'):
+    __slots__ = ('x', 'y', 'direction', 'owner', 'size', 'speed', 'active', 'pending')
+
+    def __init__(self, x, y, direction, owner=OWNER_PLAYER):
         self.x = x
         self.y = y
         self.direction = direction
@@ -15,9 +17,11 @@ class Bullet:
         self.size = BULLET_SIZE
         self.speed = BULLET_SPEED
         self.active = True
+        # Balle joueur qui n'a encore rien touché (pénalité si elle se perd)
+        self.pending = owner == OWNER_PLAYER
 
-    def update(self, platforms):
-        """Update bullet position and check collisions."""
+    def update(self, platform_index):
+        """Update bullet position and check collisions (platform_index: level SpatialIndex)."""
         self.x += self.speed * self.direction
 
         # Out of bounds check
@@ -26,19 +30,146 @@ class Bullet:
             return
 
         # Platform collision
-        bullet_rect = self.get_rect()
-        for platform in platforms:
-            if bullet_rect.colliderect(platform.get_rect()):
+        left, top, right, bottom = self.bounds()
+        for _, (p_left, p_top, p_right, p_bottom) in platform_index.near(left, right):
+            if left < p_right and p_left < right and top < p_bottom and p_top < bottom:
                 self.active = False
                 return
 
+    def bounds(self):
+        """Collision box (left, top, right, bottom), same truncation as pygame.Rect."""
+        return bounds(self.x, self.y, self.size, self.size)
+
     def get_rect(self):
-        """Get collision rectangle."""
+        """Get collision rectangle (pygame, for rendering)."""
+        import pygame
         return pygame.Rect(self.x, self.y, self.size, self.size)
 
     def draw(self, screen, camera_x):
         """Draw bullet on screen."""
+        import pygame
         screen_x = self.x - camera_x
         if -50 < screen_x < SCREEN_WIDTH + 50:
-            color = YELLOW if self.owner == 'player' else RED
+            color = YELLOW if self.owner == OWNER_PLAYER else RED
             pygame.draw.circle(screen, color, (int(screen_x), int(self.y)), self.size // 2)
+
+
+class BulletPool:
+    """Balles préallouées, réutilisées via une free-list (aucune allocation par tir).
+
+    `order[:count]` liste les slots vivants dans l'ordre de tir. Une balle
+    désactivée y reste jusqu'au prochain `sweep()`, qui la rend à la free-list:
+    même cycle de vie que l'ancienne liste `Environment.bullets`. L'itération
+    renvoie les balles dans cet ordre.
+
+    `enemy_slots`: slots des balles ennemies de `order[:count]`, ajoutés par
+    spawn() et retirés par sweep() (expiration, impact) et clear(): les
+    observations ne parcourent que ces balles-là (voir enemy_bullets()).
+    """
+
+    def __init__(self, capacity=64):
+        self.slots = []
+        self.order = []
+        self.free = []
+        self.count = 0
+        self.enemy_slots = set()
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        """Ajouter des slots (filet de sécurité: la capacité par défaut suffit en jeu)."""
+        start = len(self.slots)
+        for _ in range(start, capacity):
+            bullet = Bullet(0, 0, 1)
+            bullet.active = False
+            bullet.pending = False
+            self.slots.append(bullet)
+        self.order.extend([0] * (capacity - start))
+        # pop() rend les plus petits indices en premier
+        self.free.extend(range(capacity - 1, start - 1, -1))
+
+    def spawn(self, x, y, direction, owner):
+        """Activer un slot libre et l'ajouter en fin d'ordre de tir."""
+        if not self.free:
+            self._grow(2 * len(self.slots))
+        i = self.free.pop()
+        bullet = self.slots[i]
+        bullet.x = x
+        bullet.y = y
+        bullet.direction = direction
+        bullet.owner = owner
+        bullet.active = True
+        bullet.pending = owner == OWNER_PLAYER
+        self.order[self.count] = i
+        self.count += 1
+        if owner == OWNER_ENEMY:
+            self.enemy_slots.add(i)
+        return bullet
+
+    def sweep(self, platform_index):
+        """Libérer les balles désactivées, avancer les autres (passe linéaire, ordre conservé).
+
+        Returns: nombre de balles joueur perdues sans avoir touché d'ennemi.
+        """
+        slots = self.slots
+        order = self.order
+        free = self.free
+        enemy_slots = self.enemy_slots
+        wasted = 0
+        kept = 0
+        for k in range(self.count):
+            i = order[k]
+            bullet = slots[i]
+            if not bullet.active:
+                if bullet.pending:
+                    wasted += 1
+                enemy_slots.discard(i)
+                free.append(i)
+                continue
+            bullet.update(platform_index)
+            order[kept] = i
+            kept += 1
+        self.count = kept
+        return wasted
+
+    def live(self, owner):
+        """Balles actives de `owner`, dans l'ordre de tir."""
+        return [bullet for bullet in map(self.slots.__getitem__, self.order[:self.count])
+                if bullet.active and bullet.owner == owner]
+
+    def enemy_bullets(self):
+        """Balles ennemies actives, sans ordre garanti (seuls min/compte en dépendent)."""
+        slots = self.slots
+        for i in self.enemy_slots:
+            bullet = slots[i]
+            if bullet.active:  # désactivée au tick courant, rendue au prochain sweep()
+                yield bullet
+
+    def snapshot(self):
+        """Balles encore dans l'ordre de tir: tuple de (x, y, direction, owner, active, pending)."""
+        return tuple([(b.x, b.y, b.direction, b.owner, b.active, b.pending)
+                      for b in map(self.slots.__getitem__, self.order[:self.count])])
+
+    def restore(self, snapshot):
+        """Remplacer le contenu du pool par un état produit par `snapshot()`."""
+        self.clear()
+        for x, y, direction, owner, active, pending in snapshot:
+            bullet = self.spawn(x, y, direction, owner)
+            bullet.active = active
+            bullet.pending = pending
+
+    def clear(self):
+        for k in range(self.count):
+            i = self.order[k]
+            self.slots[i].active = False
+            self.free.append(i)
+        self.count = 0
+        self.enemy_slots.clear()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        slots = self.slots
+        order = self.order
+        for k in range(self.count):
+            yield slots[order[k]]
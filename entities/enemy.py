@@ -1,33 +1,17 @@
 """Enemy entity for Contra RL game."""
 
-import os
-import pygame
-from constants import ENEMY_SIZE, ENEMY_SPEED, ENEMY_SHOOT_RANGE, RED, ORANGE, PURPLE, WHITE, DARK_GRAY
-from entities.bullet import Bullet
-
-
-_enemy_sprite_cache = {}
-
-
-def _load_sprite(name, size):
-    """Load enemy sprite if present; cache results."""
-    key = (name, size)
-    if key in _enemy_sprite_cache:
-        return _enemy_sprite_cache[key]
-    assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets")
-    path = os.path.join(assets_dir, name)
-    if os.path.exists(path):
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (size, size))
-        _enemy_sprite_cache[key] = img
-        return img
-    _enemy_sprite_cache[key] = None
-    return None
+import assets
+from constants import (ENEMY_SIZE, ENEMY_SPEED, ENEMY_SHOOT_RANGE, RED, ORANGE, PURPLE, WHITE, DARK_GRAY,
+                       OWNER_ENEMY)
+from geometry import bounds
 
 
 class Enemy:
     """Enemy with walker, shooter, or stationary behavior."""
 
+    __slots__ = ('x', 'y', 'size', 'enemy_type', 'speed', 'hp', 'shoot_cooldown',
+                 'active', 'spawned', 'direction', 'platform', 'sprite_name')
+
     def __init__(self, x, y, enemy_type='walker', platform=None):
         self.x = x
         self.y = y
@@ -40,16 +24,24 @@ class Enemy:
         self.spawned = False
         self.direction = -1
         self.platform = platform
-        # Optional sprite by type
-        sprite_name = {
+        # Optional sprite by type (loaded on first draw)
+        self.sprite_name = {
             'walker': 'enemy_walker.png',
             'shooter': 'enemy_shooter.png',
             'stationary': 'enemy_stationary.png'
         }.get(enemy_type, 'enemy_walker.png')
-        self.sprite = _load_sprite(sprite_name, self.size)
 
-    def update(self, player_x, player_y):
-        """Update enemy behavior and shooting."""
+    def snapshot(self):
+        """Compact mutable state: (x, y, hp, shoot_cooldown, active, spawned, direction)."""
+        return (self.x, self.y, self.hp, self.shoot_cooldown, self.active, self.spawned, self.direction)
+
+    def restore(self, snapshot):
+        """Restore a state produced by `snapshot()`."""
+        (self.x, self.y, self.hp, self.shoot_cooldown,
+         self.active, self.spawned, self.direction) = snapshot
+
+    def update(self, player_x, player_y, bullets):
+        """Update enemy behavior and shooting (bullets: BulletPool)."""
         # Deactivate if too far behind player
         if self.x < player_x - 1000:
             self.active = False
@@ -74,16 +66,16 @@ class Enemy:
             distance = abs(self.x - player_x)
             if distance < ENEMY_SHOOT_RANGE and self.shoot_cooldown == 0:
                 self.shoot_cooldown = 120
-                return self.shoot(player_x, player_y)
+                return self.shoot(player_x, player_y, bullets)
 
         return None
 
-    def shoot(self, player_x, player_y):
-        """Fire bullet towards player."""
+    def shoot(self, player_x, player_y, bullets):
+        """Fire bullet towards player, from the pool."""
         direction = -1 if player_x < self.x else 1
         bullet_x = self.x + self.size // 2
         bullet_y = self.y + self.size // 2
-        return Bullet(bullet_x, bullet_y, direction, 'enemy')
+        return bullets.spawn(bullet_x, bullet_y, direction, OWNER_ENEMY)
 
     def take_damage(self):
         """Take damage and check if dead."""
@@ -93,8 +85,13 @@ class Enemy:
             return True
         return False
 
+    def bounds(self):
+        """Collision box (left, top, right, bottom), same truncation as pygame.Rect."""
+        return bounds(self.x, self.y, self.size, self.size)
+
     def get_rect(self):
-        """Get collision rectangle."""
+        """Get collision rectangle (pygame, for rendering)."""
+        import pygame
         return pygame.Rect(self.x, self.y, self.size, self.size)
 
     def draw(self, screen, camera_x):
@@ -102,11 +99,13 @@ class Enemy:
         if not self.spawned:
             return
 
+        import pygame
         screen_x = self.x - camera_x
         base_rect = pygame.Rect(int(screen_x), int(self.y), self.size, self.size)
 
-        if self.sprite:
-            screen.blit(self.sprite, (base_rect.x, base_rect.y))
+        sprite = assets.sprite(self.sprite_name, self.size)
+        if sprite:
+            screen.blit(sprite, (base_rect.x, base_rect.y))
         else:
             if self.enemy_type == 'walker':
                 pygame.draw.rect(screen, RED, base_rect, border_radius=3)
@@ -1,40 +1,45 @@
 """Player entity for Contra RL game."""
 
-import os
-import pygame
+import assets
 from constants import (SCREEN_HEIGHT, PLAYER_SIZE, GRAVITY, JUMP_FORCE,
                        PLAYER_SPEED, LEVEL_LENGTH, GREEN, PLAYER_MAX_LIVES, ACTION_LEFT, ACTION_RIGHT, ACTION_IDLE,
-                       ACTION_JUMP, ACTION_SHOOT, DARK_GRAY, WHITE, BLUE)
-from entities.bullet import Bullet
-
-
-def _load_sprite(filename, size):
-    """Load a sprite if present in assets folder, else return None."""
-    assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets")
-    path = os.path.join(assets_dir, filename)
-    if os.path.exists(path):
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(img, (size, size))
-    return None
+                       ACTION_JUMP, ACTION_SHOOT, DARK_GRAY, WHITE, BLUE, OWNER_PLAYER)
+from geometry import bounds
 
 
 class Player:
     """Player character with physics and actions."""
 
+    __slots__ = ('x', 'y', 'size', 'vel_y', 'vel_x', 'on_ground', 'direction',
+                 'lives', 'shoot_cooldown')
+
     def __init__(self):
+        self.size = PLAYER_SIZE
+        self.reset()
+
+    def reset(self):
+        """Restore the mutable state of a new episode."""
         self.x = 100
         self.y = SCREEN_HEIGHT - 100
-        self.size = PLAYER_SIZE
         self.vel_y = 0
         self.vel_x = 0
         self.on_ground = False
         self.direction = 1
         self.lives = PLAYER_MAX_LIVES
         self.shoot_cooldown = 0
-        self.sprite = _load_sprite("player.png", self.size)
 
-    def move(self, action):
-        """Execute action: 0=LEFT, 1=RIGHT, 2=JUMP, 3=SHOOT, 4=IDLE."""
+    def snapshot(self):
+        """Compact mutable state: (x, y, vel_y, vel_x, on_ground, direction, lives, shoot_cooldown)."""
+        return (self.x, self.y, self.vel_y, self.vel_x, self.on_ground,
+                self.direction, self.lives, self.shoot_cooldown)
+
+    def restore(self, snapshot):
+        """Restore a state produced by `snapshot()`."""
+        (self.x, self.y, self.vel_y, self.vel_x, self.on_ground,
+         self.direction, self.lives, self.shoot_cooldown) = snapshot
+
+    def move(self, action, bullets):
+        """Execute action: 0=LEFT, 1=RIGHT, 2=JUMP, 3=SHOOT, 4=IDLE (bullets: BulletPool)."""
         if action == ACTION_LEFT:
             self.vel_x = -PLAYER_SPEED
             self.direction = -1
@@ -49,30 +54,30 @@ class Player:
             self.on_ground = False
 
         if action == ACTION_SHOOT:
-            return self.shoot()
+            return self.shoot(bullets)
         return None
 
-    def shoot(self):
-        """Fire a bullet."""
+    def shoot(self, bullets):
+        """Fire a bullet from the pool."""
         if self.shoot_cooldown == 0:
             self.shoot_cooldown = 15
             bullet_x = self.x + (self.size if self.direction == 1 else 0)
             bullet_y = self.y + self.size // 2
-            return Bullet(bullet_x, bullet_y, self.direction, 'player')
+            return bullets.spawn(bullet_x, bullet_y, self.direction, OWNER_PLAYER)
         return None
 
-    def update(self, platforms):
-        """Update physics with gravity and collision detection."""
+    def update(self, platform_index):
+        """Update physics with gravity and collision detection (platform_index: level SpatialIndex)."""
         # Apply gravity
         self.vel_y += GRAVITY
 
         # Horizontal movement with collision
         self.x += self.vel_x
-        player_rect = self.get_rect()
+        left, top, right, bottom = self.bounds()
 
         # Horizontal collision (walls)
-        for platform in platforms:
-            if player_rect.colliderect(platform.get_rect()):
+        for platform, (p_left, p_top, p_right, p_bottom) in platform_index.near(left, right):
+            if left < p_right and p_left < right and top < p_bottom and p_top < bottom:
                 if self.vel_x > 0:  # Moving right
                     self.x = platform.x - self.size
                 elif self.vel_x < 0:  # Moving left
@@ -80,13 +85,12 @@ class Player:
 
         # Vertical movement
         self.y += self.vel_y
-        player_rect = self.get_rect()
+        left, top, right, bottom = self.bounds()
         self.on_ground = False
 
         # Vertical collision (floor/ceiling)
-        for platform in platforms:
-            plat_rect = platform.get_rect()
-            if player_rect.colliderect(plat_rect):
+        for platform, (p_left, p_top, p_right, p_bottom) in platform_index.near(left, right):
+            if left < p_right and p_left < right and top < p_bottom and p_top < bottom:
                 if self.vel_y > 0:  # Falling
                     self.y = platform.y - self.size
                     self.vel_y = 0
@@ -113,15 +117,21 @@ class Player:
         self.lives -= 1
         return self.lives <= 0
 
+    def bounds(self):
+        """Collision box (left, top, right, bottom), same truncation as pygame.Rect."""
+        return bounds(self.x, self.y, self.size, self.size)
+
     def get_rect(self):
-        """Get collision rectangle."""
+        """Get collision rectangle (pygame, for rendering)."""
+        import pygame
         return pygame.Rect(self.x, self.y, self.size, self.size)
 
     def draw(self, screen, camera_x):
         """Draw player on screen."""
+        import pygame
         screen_x = self.x - camera_x
-        if self.sprite:
-            sprite = pygame.transform.flip(self.sprite, self.direction == -1, False)
+        sprite = assets.sprite("player.png", self.size, flip=self.direction == -1)
+        if sprite:
             screen.blit(sprite, (int(screen_x), int(self.y)))
         else:
             body_rect = pygame.Rect(int(screen_x), int(self.y), self.size, self.size)
@@ -1,23 +1,82 @@
-import pygame
+from collections import namedtuple
+from operator import attrgetter
+
 from constants import (
-    PLAYER_SIZE, RADAR_RANGE_NEAR, RADAR_RANGE_FAR, RADAR_RANGE_MID,
+    PLAYER_SIZE, PLAYER_SPEED, JUMP_FORCE, SCREEN_HEIGHT, RADAR_RANGE_NEAR, RADAR_RANGE_FAR, RADAR_RANGE_MID,
     BUCKET_SIZE, LEVEL_LENGTH, ACTION_IDLE,
     MAX_STEPS,
     REWARD_SHOOT, REWARD_PROGRESS, REWARD_BACKWARD, REWARD_IDLE,
     REWARD_ENEMY_HIT, REWARD_DAMAGE, REWARD_WASTED_BULLET,
     REWARD_SHOOT_NO_TARGET, REWARD_ENEMY_PASSED,
-    REWARD_DEATH, REWARD_GOAL, REWARD_LIFE_BONUS, REWARD_TIMEOUT
+    REWARD_DEATH, REWARD_GOAL, REWARD_LIFE_BONUS, REWARD_TIMEOUT,
+    OWNER_PLAYER, OWNER_ENEMY
 )
 from entities.player import Player
 from entities.enemy import Enemy
-from level.static_level import StaticLevel
+from entities.bullet import BulletPool
+from geometry import overlap
+from collision import SweepAndPrune
+from radar import Radar
+from profiling import uninstrument
+from level.static_level import get_shared_level
 from rendering.camera import Camera
 
 
+_is_active = attrgetter('active')
+
+# État complet d'une partie (valeur immuable, voir Environment.snapshot)
+EnvSnapshot = namedtuple('EnvSnapshot', ('player', 'enemies', 'bullets', 'steps', 'max_x',
+                                         'game_over', 'victory', 'camera_x'))
+
+
+# Bornes (min, max) de chaque dimension de get_state(), dans l'ordre du tuple 18D
+STATE_BOUNDS = (
+    (0, 59),    # x_bucket
+    (0, 1),     # on_ground
+    (0, 2),     # vel_y_bucket
+    (-1, 1),    # vel_x_bucket
+    (0, 1),     # can_jump
+    (0, 12),    # pit_distance
+    (0, 5),     # pit_width
+    (0, 4),     # ground_under_feet
+    (0, 12),    # platform_ahead_dist
+    (-2, 2),    # platform_ahead_height
+    (0, 12),    # closest_enemy_dist
+    (0, 2),     # closest_enemy_type
+    (0, 3),     # enemy_count_near
+    (0, 3),     # bullet_danger_level
+    (0, 8),     # closest_bullet_dist
+    (0, 3),     # bullet_count
+    (-1, 1),    # flag_direction
+    (0, 10),    # flag_distance
+)
+
+# Bornes (min, max) de chaque dimension de get_features(), dans l'ordre du tuple
+# (les valeurs hors bornes, p. ex. vel_y en chute libre, sont à écrêter par l'utilisateur)
+FEATURE_BOUNDS = (
+    (0, LEVEL_LENGTH),                      # x
+    (0, SCREEN_HEIGHT),                     # y
+    (-PLAYER_SPEED, PLAYER_SPEED),          # vel_x
+    (JUMP_FORCE, -JUMP_FORCE),              # vel_y
+    (0, 1),                                 # on_ground
+    (0, RADAR_RANGE_FAR),                   # pit_distance (RADAR_RANGE_FAR: aucun fossé)
+    (0, 200),                               # pit_width
+    (0, RADAR_RANGE_FAR),                   # ground_left (pixels avant le vide, 0: en l'air)
+    (0, RADAR_RANGE_FAR),                   # platform_distance (RADAR_RANGE_FAR: aucune)
+    (-300, 300),                            # platform_height (> 0: plus haute que le joueur)
+    (-RADAR_RANGE_FAR, RADAR_RANGE_FAR),    # enemy_dx (RADAR_RANGE_FAR: aucun ennemi)
+    (-300, 300),                            # enemy_dy
+    (0, RADAR_RANGE_FAR),                   # bullet_distance (RADAR_RANGE_FAR: aucune balle)
+)
+
+
 class Environment:
+    # Ticks de simulation joués par le dernier step (voir ActionRepeat)
+    ticks = 1
+
     def __init__(self):
-        # Utiliser StaticLevel au lieu du parsing ASCII
-        self.level = StaticLevel()
+        # StaticLevel partagé: géométrie et textures construites une fois par process
+        self.level = get_shared_level()
 
         # Utiliser Player au lieu de player_pos
         self.player = Player()
@@ -25,14 +84,54 @@ class Environment:
         # Utiliser Enemy instances au lieu de dicts
         self.enemies = [Enemy(e.x, e.y, e.enemy_type, e.platform if hasattr(e, 'platform') else None)
                        for e in self.level.enemies]
+        # État initial compact des ennemis, restauré à chaque reset
+        self._enemy_initial_states = tuple(e.snapshot() for e in self.enemies)
 
-        # Bullet system
-        self.bullets = []
-        self.player_bullets_shot = []  # Track bullets pour punir tirs inutiles
+        # Bullet system: slots préalloués, Bullet.pending marque les tirs joueur à punir s'ils ratent
+        self.bullets = BulletPool()
 
         # Camera pour la map 3000px
         self.camera = Camera()
 
+        # Radar incrémental (curseurs obstacles + ennemis visibles)
+        self.radar = Radar(self.level, self.enemies)
+
+        # Broad phase des collisions, reconstruite à chaque step (voir collision.py)
+        self._enemy_sweep = SweepAndPrune()
+        self._enemy_bullet_sweep = SweepAndPrune()
+
+        # Observation en cache, recalculée seulement quand la simulation avance
+        self.version = 0
+        self._state_cache = None
+        self._state_cache_version = -1
+        self._features = None
+        self._features_version = -1
+
+        # Instrumentation opt-in (voir profiling.py et enable_profiling)
+        self.profiler = None
+
+        self._reset_state()
+
+    _PROFILED_METHODS = ('step', '_tick', 'get_state', '_observe_pits', '_observe_platforms',
+                         '_observe_enemies', '_observe_bullets', '_observe_goal')
+
+    def enable_profiling(self, profiler):
+        """Chronométrer les phases de step() et les modules d'observation (None: désactiver)."""
+        uninstrument(self, self._PROFILED_METHODS)
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self, self._PROFILED_METHODS, prefix="env.")
+
+    def _reset_state(self):
+        """Restaurer l'état mutable (joueur, ennemis, balles, compteurs) sans reconstruire le niveau."""
+        self.version += 1
+        self.player.reset()
+        for enemy, initial_state in zip(self.enemies, self._enemy_initial_states):
+            enemy.restore(initial_state)
+        self.bullets.clear()
+        self.radar.reset()
+        self.camera.x = 0
+
         # Tracking
         self.steps = 0
         self.max_x = 0  # Progression maximale (empêche reward pour surplace)
@@ -40,37 +139,49 @@ class Environment:
         self.victory = False
 
     def reset(self):
-        self.__init__()
+        self._reset_state()
         return self.get_state()
 
     def step(self, action):
         """Execute one game step with given action.
         Returns: (state, reward, done)
         """
+        reward, done = self._tick(action)
+        return self.get_state(), reward, done
+
+    def _tick(self, action):
+        """Avancer la simulation d'un tick, sans calculer l'observation. Returns: (reward, done)."""
+        self.version += 1
         self.steps += 1
         reward = 0
+        prof = self.profiler
+        if prof is not None:
+            prof.start()
         old_x = self.player.x
         old_max_x = self.max_x
 
         # 1. PLAYER ACTION (delegate to Player)
-        new_bullet = self.player.move(action)
+        new_bullet = self.player.move(action, self.bullets)
         if new_bullet:
-            self.bullets.append(new_bullet)
-            self.player_bullets_shot.append(new_bullet)  # Track pour punir si rate
             reward += REWARD_SHOOT  # Neutre (0)
             # Tir inutile si aucune menace proche
             nearest_enemy_dist = min(
-                (abs(e.x - self.player.x) for e in self.enemies if e.active and e.spawned),
+                (abs(e.x - self.player.x) for e in self.radar.visible_enemies),
                 default=None
             )
             if nearest_enemy_dist is None or nearest_enemy_dist > RADAR_RANGE_NEAR:
                 reward += REWARD_SHOOT_NO_TARGET
 
+        if prof is not None:
+            prof.lap("step.1_action")
+
         # 2. PLAYER PHYSICS (delegate to Player)
-        fell_off = self.player.update(self.level.platforms)
+        fell_off = self.player.update(self.level.platform_index)
+        if prof is not None:
+            prof.lap("step.2_physics")  # avant le retour anticipé en cas de chute
         if fell_off:
             self.game_over = True
-            return self.get_state(), REWARD_DEATH, True
+            return REWARD_DEATH, True
 
         # 3. PROGRESSION REWARDS (basé sur max_x, pas juste mouvement)
         self.max_x = max(self.max_x, self.player.x)
@@ -88,140 +199,178 @@ class Environment:
         if action == ACTION_IDLE:
             reward += REWARD_IDLE
 
+        if prof is not None:
+            prof.lap("step.3_rewards")
+
         # 5. ENEMY SPAWNING & UPDATE
-        for enemy in self.enemies:
-            # Spawn when player approaches
-            if not enemy.spawned and enemy.x < self.player.x + 500:
-                enemy.spawned = True
+        # Spawn when player approaches
+        self.radar.spawn(self.player.x)
+
+        # Update (movement + shooting for shooters); un ennemi non spawné n'a rien à faire
+        for enemy in self.radar.visible_enemies[:]:
+            enemy.update(self.player.x, self.player.y, self.bullets)
+            if not enemy.active:
+                self.radar.remove_enemy(enemy)
 
-            # Update (movement + shooting for shooters)
-            if enemy.active:
-                enemy_bullet = enemy.update(self.player.x, self.player.y)
-                if enemy_bullet:
-                    self.bullets.append(enemy_bullet)
+        if prof is not None:
+            prof.lap("step.5_enemies")
 
         # 6. BULLET UPDATE & WASTED BULLET PENALTY
-        for bullet in self.bullets[:]:
-            if not bullet.active:
-                # Punir bullets du joueur qui n'ont touché personne
-                if bullet.owner == 'player' and bullet in self.player_bullets_shot:
-                    reward += REWARD_WASTED_BULLET
-                    self.player_bullets_shot.remove(bullet)
-                self.bullets.remove(bullet)
-                continue
-            bullet.update(self.level.platforms)
+        # Punir bullets du joueur qui n'ont touché personne (une addition par balle)
+        for _ in range(self.bullets.sweep(self.level.platform_index)):
+            reward += REWARD_WASTED_BULLET
+
+        if prof is not None:
+            prof.lap("step.6_bullets")
 
         # 7. COLLISION DETECTION
-        player_rect = self.player.get_rect()
+        player_box = self.player.bounds()
+        bullet_slots = self.bullets.slots
+        bullet_order = self.bullets.order
+
+        # Broad phase: ennemis visibles et balles ennemies triés par x une fois par step;
+        # les requêtes rendent les touchés dans l'ordre de liste (premier touché inchangé)
+        enemy_sweep = self._enemy_sweep
+        enemy_sweep.build(self.radar.visible_enemies)
+        enemy_bullet_sweep = self._enemy_bullet_sweep
+        enemy_bullet_sweep.build(self.bullets.live(OWNER_ENEMY))
 
         # Enemy-Player collision
-        for enemy in self.enemies:
-            if enemy.active and enemy.spawned:
-                if player_rect.colliderect(enemy.get_rect()):
-                    if self.player.take_damage():
-                        self.game_over = True
-                        return self.get_state(), REWARD_DEATH, True
-                    else:
-                        reward += REWARD_DAMAGE  # Déjà négatif
-                        enemy.active = False
+        for enemy in enemy_sweep.query(player_box):
+            if self.player.take_damage():
+                self.game_over = True
+                if prof is not None:
+                    prof.lap("step.7_collisions")
+                return REWARD_DEATH, True
+            else:
+                reward += REWARD_DAMAGE  # Déjà négatif
+                enemy.active = False
+                self.radar.remove_enemy(enemy)
 
         # Enemy Bullet-Player collision
-        for bullet in self.bullets[:]:
-            if bullet.owner == 'enemy' and bullet.active:
-                if player_rect.colliderect(bullet.get_rect()):
-                    bullet.active = False
-                    if self.player.take_damage():
-                        self.game_over = True
-                        return self.get_state(), REWARD_DEATH, True
-                    else:
-                        reward += REWARD_DAMAGE  # Déjà négatif
-
-        # Player Bullet-Enemy collision
-        for bullet in self.bullets[:]:
-            if bullet.owner == 'player' and bullet.active:
-                for enemy in self.enemies:
-                    if enemy.active and enemy.spawned:
-                        if bullet.get_rect().colliderect(enemy.get_rect()):
-                            bullet.active = False
-                            # Retirer de la liste des bullets à punir (a touché un ennemi!)
-                            if bullet in self.player_bullets_shot:
-                                self.player_bullets_shot.remove(bullet)
-                            if enemy.take_damage():
-                                reward += REWARD_ENEMY_HIT
-                            break
+        for bullet in enemy_bullet_sweep.query(player_box):
+            bullet.active = False
+            if self.player.take_damage():
+                self.game_over = True
+                if prof is not None:
+                    prof.lap("step.7_collisions")
+                return REWARD_DEATH, True
+            else:
+                reward += REWARD_DAMAGE  # Déjà négatif
+
+        # Player Bullet-Enemy collision: premier ennemi encore actif touché par chaque balle
+        if enemy_sweep:
+            for k in range(self.bullets.count):
+                bullet = bullet_slots[bullet_order[k]]
+                if bullet.owner == OWNER_PLAYER and bullet.active:
+                    enemy = enemy_sweep.first(bullet.bounds(), _is_active)
+                    if enemy is not None:
+                        bullet.active = False
+                        # Plus à punir (a touché un ennemi!)
+                        bullet.pending = False
+                        if enemy.take_damage():
+                            reward += REWARD_ENEMY_HIT
+                            self.radar.remove_enemy(enemy)
 
         # 7bis. Punir les ennemis laissés derrière (non éliminés)
-        for enemy in self.enemies:
-            if enemy.active and enemy.spawned and enemy.x < self.player.x - 250:
+        for enemy in self.radar.visible_enemies:
+            if enemy.x < self.player.x - 250:
                 reward += REWARD_ENEMY_PASSED
 
+        if prof is not None:
+            prof.lap("step.7_collisions")
+
         # 8. VICTORY CHECK
-        flag_rect = pygame.Rect(self.level.flag_x, self.level.flag_y, 60, 60)
-        if player_rect.colliderect(flag_rect):
+        if overlap(player_box, self.level.flag_bounds):
             # Bonus vitesse: moins de steps = plus de points
             # Optimal ~1000 steps, max 5000
             speed_bonus = max(0, (5000 - self.steps) / 5)  # 0-1000 points
             reward = REWARD_GOAL + (REWARD_LIFE_BONUS * self.player.lives) + speed_bonus
             self.victory = True
-            return self.get_state(), reward, True
-
+            done = True
         # 9. TIMEOUT
-        if self.steps > MAX_STEPS:
-            return self.get_state(), REWARD_TIMEOUT, True
+        elif self.steps > MAX_STEPS:
+            reward = REWARD_TIMEOUT
+            done = True
+        else:
+            done = False
 
-        return self.get_state(), reward, False
+        if prof is not None:
+            prof.lap("step.8_9_end_checks")
+
+        return reward, done
 
     def do(self, action):
         """Wrapper pour compatibilité avec Agent"""
         return self.step(action)
 
+    def snapshot(self):
+        """État courant sous forme de valeur immuable (EnvSnapshot de tuples).
+
+        La simulation est déterministe: restore(s) puis les mêmes actions
+        reproduisent exactement les mêmes états et rewards. Le niveau statique
+        n'est pas copié; un snapshot peut être restauré dans n'importe quel
+        Environment.
+        """
+        return EnvSnapshot(
+            self.player.snapshot(),
+            tuple([enemy.snapshot() for enemy in self.enemies]),
+            self.bullets.snapshot(),
+            self.steps, self.max_x, self.game_over, self.victory, self.camera.x,
+        )
+
+    def restore(self, snapshot):
+        """Revenir à un état produit par `snapshot()`."""
+        self.player.restore(snapshot.player)
+        for enemy, enemy_state in zip(self.enemies, snapshot.enemies):
+            enemy.restore(enemy_state)
+        self.bullets.restore(snapshot.bullets)
+        self.steps = snapshot.steps
+        self.max_x = snapshot.max_x
+        self.game_over = snapshot.game_over
+        self.victory = snapshot.victory
+        self.camera.x = snapshot.camera_x
+        self.radar.rebuild()
+        self.invalidate_state()
+        return self.get_state()
+
     def _observe_pits(self):
         """Détection fossés avec largeur et sol restant."""
         # 1. Chercher fossé le plus proche (0-600px devant)
-        closest_pit = None
-        pit_distance = 0
-        pit_width = 0
-
-        for pit in self.level.pits:
-            dist = pit.x - self.player.x
-            if 0 < dist < RADAR_RANGE_FAR:
-                if closest_pit is None or dist < pit_distance:
-                    closest_pit = pit
-                    pit_distance = dist
-                    pit_width = pit.width
+        closest_pit = self.radar.pits.first_ahead(self.player.x, RADAR_RANGE_FAR)
+        pit_distance = closest_pit.x - self.player.x if closest_pit else 0
+        pit_width = closest_pit.width if closest_pit else 0
 
         # Bucketing
         pit_dist_bucket = min(12, int(pit_distance / BUCKET_SIZE)) if closest_pit else 0
         pit_width_bucket = min(5, int(pit_width / BUCKET_SIZE) + 1) if closest_pit else 0
 
         # 2. Sol sous les pieds (pixels avant le vide)
+        # Première plateforme (ordre de liste) à hauteur des pieds qui continue devant
         ground_under_feet = 0
-        for platform in self.level.platforms:
-            if platform.y <= self.player.y + PLAYER_SIZE <= platform.y + platform.height:
-                pixels_remaining = (platform.x + platform.width) - (self.player.x + PLAYER_SIZE)
-                if pixels_remaining > 0:
-                    if pixels_remaining < 30:
-                        ground_under_feet = 1
-                    elif pixels_remaining < 60:
-                        ground_under_feet = 2
-                    elif pixels_remaining < 100:
-                        ground_under_feet = 3
-                    else:
-                        ground_under_feet = 4
-                    break
+        platform = self.level.platform_index.first_spanning(self.player.y + PLAYER_SIZE,
+                                                            self.player.x + PLAYER_SIZE)
+        if platform:
+            pixels_remaining = (platform.x + platform.width) - (self.player.x + PLAYER_SIZE)
+            if pixels_remaining < 30:
+                ground_under_feet = 1
+            elif pixels_remaining < 60:
+                ground_under_feet = 2
+            elif pixels_remaining < 100:
+                ground_under_feet = 3
+            else:
+                ground_under_feet = 4
 
         return (pit_dist_bucket, pit_width_bucket, ground_under_feet)
 
     def _observe_platforms(self):
         """Analyser plateformes devant pour navigation."""
-        platforms_ahead = [p for p in self.level.platforms
-                          if 0 < p.x - self.player.x < RADAR_RANGE_FAR]
+        # Plateforme la plus proche devant (0-600px)
+        closest = self.radar.platforms.first_ahead(self.player.x, RADAR_RANGE_FAR)
 
-        if not platforms_ahead:
+        if not closest:
             return (0, 0)
 
-        # Plateforme la plus proche
-        closest = min(platforms_ahead, key=lambda p: abs(p.x - self.player.x))
         distance = closest.x - self.player.x
 
         # Distance bucket
@@ -244,7 +393,7 @@ class Environment:
 
     def _observe_enemies(self):
         """Tracker ennemis multiples avec type."""
-        spawned = [e for e in self.enemies if e.active and e.spawned]
+        spawned = self.radar.visible_enemies
 
         if not spawned:
             return (0, 0, 0)
@@ -264,28 +413,22 @@ class Environment:
 
     def _observe_bullets(self):
         """Tracker balles multiples incoming."""
-        enemy_bullets = [b for b in self.bullets if b.owner == 'enemy' and b.active]
-
-        if not enemy_bullets:
-            return (0, 0, 0)
-
-        # Filtrer balles dangereuses (incoming + même hauteur)
+        # Filtrer balles ennemies actives dangereuses (incoming + même hauteur)
         dangerous = []
-        for b in enemy_bullets:
+        for b in self.bullets.enemy_bullets():
             distance = abs(b.x - self.player.x)
             coming = (b.direction == 1 and b.x < self.player.x) or \
                     (b.direction == -1 and b.x > self.player.x)
             same_height = abs(b.y - self.player.y) < 50
 
             if coming and same_height:
-                dangerous.append((distance, b))
+                dangerous.append(distance)
 
         if not dangerous:
             return (0, 0, 0)
 
-        # Trier par distance
-        dangerous.sort()
-        closest_dist = dangerous[0][0]
+        # Plus proche (min, sans trier: les ex-aequo comparaient des Bullet)
+        closest_dist = min(dangerous)
 
         # Niveau danger
         if closest_dist < 100:
@@ -319,7 +462,63 @@ class Environment:
 
         return (flag_direction, flag_distance)
 
+    def invalidate_state(self):
+        """Forcer le recalcul de l'observation (après modification directe de l'état)."""
+        self.version += 1
+
     def get_state(self):
+        """État 18D courant, calculé une seule fois par version de la simulation."""
+        if self._state_cache_version != self.version:
+            self._state_cache = self._compute_state()
+            self._state_cache_version = self.version
+        return self._state_cache
+
+    def get_features(self):
+        """Observation continue (non discrétisée), bornes dans FEATURE_BOUNDS.
+
+        Mêmes sources que get_state() (radar, index de plateformes, balles),
+        mais en pixels: pour les agents à approximation de fonction.
+        """
+        if self._features_version != self.version:
+            self._features = self._compute_features()
+            self._features_version = self.version
+        return self._features
+
+    def _compute_features(self):
+        player = self.player
+        x, y = player.x, player.y
+
+        pit = self.radar.pits.first_ahead(x, RADAR_RANGE_FAR)
+        pit_distance = pit.x - x if pit else RADAR_RANGE_FAR
+        pit_width = pit.width if pit else 0
+
+        ground_left = 0
+        platform = self.level.platform_index.first_spanning(y + PLAYER_SIZE, x + PLAYER_SIZE)
+        if platform:
+            ground_left = (platform.x + platform.width) - (x + PLAYER_SIZE)
+
+        ahead = self.radar.platforms.first_ahead(x, RADAR_RANGE_FAR)
+        platform_distance = ahead.x - x if ahead else RADAR_RANGE_FAR
+        platform_height = y - ahead.y if ahead else 0
+
+        enemy_dx, enemy_dy = RADAR_RANGE_FAR, 0
+        spawned = self.radar.visible_enemies
+        if spawned:
+            closest = min(spawned, key=lambda e: abs(e.x - x))
+            enemy_dx, enemy_dy = closest.x - x, y - closest.y
+
+        bullet_distance = RADAR_RANGE_FAR
+        for b in self.bullets.enemy_bullets():
+            if abs(b.y - y) >= 50:
+                continue
+            if (b.direction == 1 and b.x < x) or (b.direction == -1 and b.x > x):
+                bullet_distance = min(bullet_distance, abs(b.x - x))
+
+        return (x, y, player.vel_x, player.vel_y, 1 if player.on_ground else 0,
+                pit_distance, pit_width, ground_left, platform_distance, platform_height,
+                enemy_dx, enemy_dy, bullet_distance)
+
+    def _compute_state(self):
         """État enrichi 18D avec radar multi-menaces."""
         # A. Player state (5D)
         x_bucket = min(59, int(self.player.x / BUCKET_SIZE))  # 50px buckets
@@ -353,3 +552,60 @@ class Environment:
         # Retour état 18D (5 + 3 + 2 + 3 + 3 + 2 = 18)
         return (x_bucket, on_ground, vel_y_bucket, vel_x_bucket, can_jump,
                 *pit_state, *platform_state, *enemy_state, *bullet_state, *goal_state)
+
+
+class ActionRepeat:
+    """Frame-skip: chaque action est répétée `k` ticks, une décision de l'agent par step.
+
+    step() renvoie la somme actualisée Σ γ^i r_i des rewards des ticks joués,
+    en s'arrêtant dès done; le bootstrap de l'agent doit alors utiliser γ^k
+    (voir Agent.enable_action_repeat). L'observation n'est calculée qu'une
+    fois par décision. `ticks` est le nombre de ticks du dernier step et
+    `total_reward` la somme non actualisée des rewards depuis reset(), tick par
+    tick (même arrondi qu'un score accumulé sans frame-skip, voir replay.py);
+    les autres attributs sont ceux de l'Environment enveloppé.
+
+    log_ticks=True: `tick_log` garde les (reward, état) de chaque tick du
+    dernier step, pour les checksums par tick de replay.py (l'observation est
+    alors calculée à chaque tick).
+    """
+
+    def __init__(self, env, k, gamma):
+        self.env = env
+        self.k = k
+        self.gamma = gamma
+        self.ticks = 0
+        self.total_reward = 0
+        self.log_ticks = False
+        self.tick_log = []
+
+    def __getattr__(self, name):
+        return getattr(self.env, name)
+
+    def reset(self):
+        self.ticks = 0
+        self.total_reward = 0
+        return self.env.reset()
+
+    def step(self, action):
+        tick = self.env._tick
+        gamma = self.gamma
+        discount = 1.0
+        discounted = 0.0
+        total = self.total_reward
+        log = self.tick_log = [] if self.log_ticks else None
+        for ticks in range(1, self.k + 1):
+            reward, done = tick(action)
+            if log is not None:
+                log.append((reward, self.env.get_state()))
+            total += reward
+            discounted += discount * reward
+            discount *= gamma
+            if done:
+                break
+        self.ticks = ticks
+        self.total_reward = total
+        return self.env.get_state(), discounted, done
+
+    def do(self, action):
+        return self.step(action)
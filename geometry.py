@@ -0,0 +1,17 @@
+"""AABB sans pygame pour la simulation headless.
+
+Mêmes règles que pygame.Rect: positions et tailles tronquées en int,
+bords droit/bas exclus.
+"""
+
+
+def bounds(x, y, width, height):
+    """(left, top, right, bottom) entiers, comme pygame.Rect(x, y, width, height)."""
+    left = int(x)
+    top = int(y)
+    return left, top, left + int(width), top + int(height)
+
+
+def overlap(a, b):
+    """Equivalent de pygame.Rect.colliderect pour deux bounds de taille non nulle."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
@@ -1,25 +1,33 @@
 
-import pygame
-from arcade.csscolor import DARK_GREEN
-from arcade.uicolor import GREEN_NEPHRITIS
-
 from constants import PLATFORM_HEIGHT, SCREEN_HEIGHT, GRAY, BLACK, RED, GROUND_BROWN, GROUND_DARK
+from geometry import bounds
 
 
 class Platform:
 
+    __slots__ = ('x', 'y', 'width', 'height')
+
     def __init__(self, x, y, width, height=PLATFORM_HEIGHT):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
 
+    def bounds(self):
+        """collision box (left, top, right, bottom)."""
+        return bounds(self.x, self.y, self.width, self.height)
+
     def get_rect(self):
-        """collision rectangle."""
+        """collision rectangle (pygame, pour le rendu)."""
+        import pygame
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
     def draw(self, screen, camera_x):
         """désinner les plateformes à l'écran"""
+        import pygame
+        from arcade.csscolor import DARK_GREEN
+        from arcade.uicolor import GREEN_NEPHRITIS
+
         screen_x = self.x - camera_x
 
         # Base
@@ -37,17 +45,25 @@ class Platform:
 class Pit:
     """Trou mortel"""
 
+    __slots__ = ('x', 'y', 'width', 'height')
+
     def __init__(self, x, width):
         self.x = x
         self.width = width
         self.y = SCREEN_HEIGHT - 50
         self.height = 50
 
+    def bounds(self):
+        """Get la boîte de collision (left, top, right, bottom)"""
+        return bounds(self.x, self.y, self.width, self.height)
+
     def get_rect(self):
-        """Get le rectangle de collision"""
+        """Get le rectangle de collision (pygame, pour le rendu)"""
+        import pygame
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
     def draw(self, screen, camera_x):
         """Afficher le trou (transparent)"""
+        import pygame
         screen_x = self.x - camera_x
         pygame.draw.rect(screen, RED, (screen_x, self.y, self.width, 0))
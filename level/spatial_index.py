@@ -0,0 +1,94 @@
+"""Index spatial statique pour les plateformes et fossés du niveau."""
+
+from bisect import bisect_left, bisect_right
+
+
+class SpatialIndex:
+    """Grille uniforme en x + listes triées au-dessus d'obstacles statiques.
+
+    Les éléments (Platform ou Pit) doivent avoir x, y, width, height et
+    bounds(). Les requêtes renvoient leurs résultats dans l'ordre de la liste
+    d'origine, pour reproduire exactement les boucles `for platform in platforms`.
+    """
+
+    def __init__(self, items, cell_size=100):
+        self.items = list(items)
+        # Boîtes (left, top, right, bottom) calculées une fois
+        self.boxes = [item.bounds() for item in self.items]
+        self.cell_size = cell_size
+
+        # Grille uniforme: cellule → indices (ordre de liste) des boîtes qui la touchent
+        if self.boxes:
+            self.min_x = min(box[0] for box in self.boxes)
+            max_x = max(box[2] for box in self.boxes)
+        else:
+            self.min_x = max_x = 0
+        self.n_cells = max(1, (max_x - self.min_x) // cell_size + 1)
+        cells = [[] for _ in range(self.n_cells)]
+        for i, (left, top, right, bottom) in enumerate(self.boxes):
+            if right <= left or bottom <= top:
+                continue  # boîte vide: ne touche jamais rien
+            for c in range(self._cell(left), self._cell(right - 1) + 1):
+                cells[c].append(i)
+        self.cells = [tuple(cell) for cell in cells]
+
+        # Tri par x (départage par ordre de liste) pour les requêtes "devant"
+        self._by_x = sorted(range(len(self.items)), key=lambda i: (self.items[i].x, i))
+        self._xs = [self.items[i].x for i in self._by_x]
+
+        # Tri par extrémité droite pour les requêtes "se termine après"
+        self._by_end = sorted(range(len(self.items)),
+                              key=lambda i: (self.items[i].x + self.items[i].width, i))
+        self._ends = [self.items[i].x + self.items[i].width for i in self._by_end]
+
+        # Couches de même (y, height): extrémités triées + minimum suffixe des indices
+        layers = {}
+        for i in self._by_end:
+            layers.setdefault((self.items[i].y, self.items[i].height), []).append(i)
+        self._layers = []
+        for (y, height), indices in layers.items():
+            ends = [self.items[i].x + self.items[i].width for i in indices]
+            suffix_min = indices[:]
+            for k in range(len(suffix_min) - 2, -1, -1):
+                suffix_min[k] = min(suffix_min[k], suffix_min[k + 1])
+            self._layers.append((y, y + height, ends, suffix_min))
+
+    def _cell(self, x):
+        c = int((x - self.min_x) // self.cell_size)
+        return min(max(c, 0), self.n_cells - 1)
+
+    def near(self, left, right):
+        """(item, box) dont la boîte peut chevaucher [left, right) en x, dans l'ordre de liste."""
+        first = self._cell(left)
+        last = self._cell(right - 1)
+        if first == last:
+            indices = self.cells[first]
+        else:
+            indices = sorted(set().union(*self.cells[first:last + 1]))
+        return [(self.items[i], self.boxes[i]) for i in indices]
+
+    def first_ahead(self, x, max_distance):
+        """Élément le plus proche avec 0 < item.x - x < max_distance, ou None."""
+        k = bisect_right(self._xs, x)
+        if k < len(self._xs) and self._xs[k] - x < max_distance:
+            return self.items[self._by_x[k]]
+        return None
+
+    def starting_before(self, x):
+        """Éléments avec item.x < x, dans l'ordre de liste."""
+        return [self.items[i] for i in sorted(self._by_x[:bisect_left(self._xs, x)])]
+
+    def ending_after(self, x):
+        """Éléments avec item.x + item.width > x, dans l'ordre de liste."""
+        return [self.items[i] for i in sorted(self._by_end[bisect_right(self._ends, x):])]
+
+    def first_spanning(self, y, right_of):
+        """Premier élément (ordre de liste) avec item.y <= y <= item.y + height
+        et item.x + item.width > right_of, ou None."""
+        best = None
+        for top, bottom, ends, suffix_min in self._layers:
+            if top <= y <= bottom:
+                k = bisect_right(ends, right_of)
+                if k < len(ends) and (best is None or suffix_min[k] < best):
+                    best = suffix_min[k]
+        return self.items[best] if best is not None else None
@@ -1,12 +1,24 @@
 
-import pygame
 from constants import (
     SCREEN_HEIGHT, PLATFORM_HEIGHT, ENEMY_SIZE, LEVEL_LENGTH, ORANGE, SCREEN_WIDTH,
     SKY_TOP, SKY_BOTTOM, GROUND_BROWN, GROUND_DARK, FLAG_GREEN, GRAY, WHITE
 )
 from level.obstacles import Platform, Pit
+from level.spatial_index import SpatialIndex
+from geometry import bounds
 from entities.enemy import Enemy
-import os
+import assets
+
+
+_shared_level = None
+
+
+def get_shared_level():
+    """Niveau construit une seule fois par process (géométrie + textures), à ne pas modifier."""
+    global _shared_level
+    if _shared_level is None:
+        _shared_level = StaticLevel()
+    return _shared_level
 
 
 class StaticLevel:
@@ -19,6 +31,7 @@ class StaticLevel:
         # Position du Drapeau sur la dernière plateforme
         self.flag_x = LEVEL_LENGTH - 150
         self.flag_y = SCREEN_HEIGHT - PLATFORM_HEIGHT - 60
+        self.flag_bounds = bounds(self.flag_x, self.flag_y, 60, 60)
 
         # Nuage pour un effet paralax
         self.clouds = [
@@ -30,13 +43,22 @@ class StaticLevel:
             (2600, 100, 80)
         ]
 
-        # Optional background/flag textures
-        assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets")
-        bg_path = os.path.join(assets_dir, "background.png")
-        self.bg_image = pygame.image.load(bg_path).convert() if os.path.exists(bg_path) else None
-        flag_path = os.path.join(assets_dir, "flag.png")
-        self.flag_image = pygame.image.load(flag_path).convert_alpha() if os.path.exists(flag_path) else None
+        # Optional background/flag textures (loaded on first draw)
+        self._textures_loaded = False
+        self.bg_image = None
+        self.flag_image = None
+        # Surfaces pré-rendues (construites au premier rendu)
+        self._sky = None
+        self._layer = None
+        self._layer_top = 0
         self.generate_static_level()
+        self.build_index()
+
+    def build_index(self):
+        """(Re)construire les index spatiaux; à rappeler si platforms/pits changent."""
+        self.platform_index = SpatialIndex(self.platforms)
+        self.pit_index = SpatialIndex(self.pits)
+        self._layer = None
 
     def generate_static_level(self):
         ground_y = SCREEN_HEIGHT - PLATFORM_HEIGHT
@@ -86,8 +108,18 @@ class StaticLevel:
         final_plat = Platform(2770, ground_y, LEVEL_LENGTH - 2770)
         self.platforms.append(final_plat)
 
+    def _load_textures(self):
+        """Récupérer les textures optionnelles au premier rendu (jamais en headless)."""
+        if self._textures_loaded:
+            return
+        self.bg_image = assets.sprite("background.png", alpha=False)
+        self.flag_image = assets.sprite("flag.png")
+        self._textures_loaded = True
+
     def draw_background(self, screen, camera_x):
         """Déssiner le gradient du ciel, les nuages, et le sol distant"""
+        import pygame
+        self._load_textures()
         if self.bg_image:
             # Tile horizontally
             img_width = self.bg_image.get_width()
@@ -96,12 +128,7 @@ class StaticLevel:
                 screen.blit(self.bg_image, (x, 0))
         else:
             # Sky gradient fallback
-            for i in range(SCREEN_HEIGHT):
-                t = i / SCREEN_HEIGHT
-                r = int(SKY_TOP[0] * (1 - t) + SKY_BOTTOM[0] * t)
-                g = int(SKY_TOP[1] * (1 - t) + SKY_BOTTOM[1] * t)
-                b = int(SKY_TOP[2] * (1 - t) + SKY_BOTTOM[2] * t)
-                pygame.draw.line(screen, (r, g, b), (0, i), (SCREEN_WIDTH, i))
+            screen.blit(self._sky_surface(), (0, 0))
 
         # Distant ground band
         horizon_y = SCREEN_HEIGHT - 120
@@ -113,35 +140,67 @@ class StaticLevel:
             if -150 < sx < SCREEN_WIDTH + 150:
                 self._draw_cloud(screen, sx, cy, size)
 
+    def _sky_surface(self):
+        """Gradient du ciel, dessiné une seule fois dans une surface cachée."""
+        if self._sky is None:
+            import pygame
+            sky = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+            for i in range(SCREEN_HEIGHT):
+                t = i / SCREEN_HEIGHT
+                r = int(SKY_TOP[0] * (1 - t) + SKY_BOTTOM[0] * t)
+                g = int(SKY_TOP[1] * (1 - t) + SKY_BOTTOM[1] * t)
+                b = int(SKY_TOP[2] * (1 - t) + SKY_BOTTOM[2] * t)
+                pygame.draw.line(sky, (r, g, b), (0, i), (SCREEN_WIDTH, i))
+            self._sky = sky
+        return self._sky
+
+    def _level_layer(self):
+        """Plateformes, fossés et drapeau pré-rendus sur une bande transparente
+        de la longueur du niveau (invalidée par build_index)."""
+        if self._layer is None:
+            import pygame
+            full = pygame.Surface((LEVEL_LENGTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            for platform in self.platforms:
+                platform.draw(full, 0)
+            for pit in self.pits:
+                pit.draw(full, 0)
+            self._draw_flag(full, self.flag_x)
+
+            # Ne garder que les lignes utilisées (le haut de l'écran est vide)
+            used = full.get_bounding_rect()
+            self._layer_top = used.top if used.height else 0
+            self._layer = full.subsurface(
+                (0, self._layer_top, LEVEL_LENGTH, SCREEN_HEIGHT - self._layer_top)).copy().convert_alpha()
+        return self._layer
+
     def _draw_cloud(self, screen, x, y, size):
         """Simple rounded cloud."""
+        import pygame
         pygame.draw.circle(screen, WHITE, (int(x), int(y)), size // 2)
         pygame.draw.circle(screen, WHITE, (int(x + size * 0.4), int(y + 5)), int(size * 0.35))
         pygame.draw.circle(screen, WHITE, (int(x - size * 0.4), int(y + 5)), int(size * 0.35))
         pygame.draw.rect(screen, WHITE, (int(x - size * 0.6), int(y), int(size * 1.2), int(size * 0.4)))
 
     def draw(self, screen, camera_x):
-        # Draw platforms
-        for platform in self.platforms:
-            platform.draw(screen, camera_x)
-
-        # Draw pits
-        for pit in self.pits:
-            pit.draw(screen, camera_x)
-
-        # Draw flag
-        flag_screen_x = self.flag_x - camera_x
-        if -100 < flag_screen_x < SCREEN_WIDTH + 100:
-            if self.flag_image:
-                screen.blit(self.flag_image, (flag_screen_x, self.flag_y - self.flag_image.get_height() + 20))
-            else:
-                # Pole
-                pygame.draw.rect(screen, GRAY, (flag_screen_x, self.flag_y - 10, 12, 80), border_radius=3)
-                # Flag cloth
-                pygame.draw.polygon(screen, FLAG_GREEN, [
-                    (flag_screen_x + 12, self.flag_y - 5),
-                    (flag_screen_x + 70, self.flag_y + 15),
-                    (flag_screen_x + 12, self.flag_y + 35)
-                ])
-                # Flag tip
-                pygame.draw.circle(screen, FLAG_GREEN, (flag_screen_x + 70, self.flag_y + 15), 6)
+        """Blit de la portion visible de la couche pré-rendue du niveau."""
+        self._load_textures()
+        layer = self._level_layer()
+        screen.blit(layer, (0, self._layer_top),
+                    (int(camera_x), 0, screen.get_width(), layer.get_height()))
+
+    def _draw_flag(self, screen, flag_screen_x):
+        """Drapeau (texture ou mât + toile) à l'abscisse écran donnée."""
+        import pygame
+        if self.flag_image:
+            screen.blit(self.flag_image, (flag_screen_x, self.flag_y - self.flag_image.get_height() + 20))
+        else:
+            # Pole
+            pygame.draw.rect(screen, GRAY, (flag_screen_x, self.flag_y - 10, 12, 80), border_radius=3)
+            # Flag cloth
+            pygame.draw.polygon(screen, FLAG_GREEN, [
+                (flag_screen_x + 12, self.flag_y - 5),
+                (flag_screen_x + 70, self.flag_y + 15),
+                (flag_screen_x + 12, self.flag_y + 35)
+            ])
+            # Flag tip
+            pygame.draw.circle(screen, FLAG_GREEN, (flag_screen_x + 70, self.flag_y + 15), 6)
@@ -1,19 +1,163 @@
 import json
 import os
+import shutil
 
+DEFAULT_LOG_PATH = "training_stats.jsonl"
+LEGACY_LOG_PATH = "training_stats.json"
 
-def append_training_log(entry, path="training_stats.json"):
-    """Append a training summary entry to JSON log."""
+# Politiques fsync: "never" (cache OS), "flush" (à chaque vidage du buffer), "always" (à chaque entrée)
+FSYNC_POLICIES = ("never", "flush", "always")
+
+
+class TrainingLog:
+    """Journal d'entraînement JSON Lines, append-only et bufferisé.
+
+    Une entrée = une ligne JSON. Les entrées sont gardées en mémoire par
+    paquets de `buffer_size` puis écrites en fin de fichier; un crash ne peut
+    donc perdre que le dernier paquet, jamais le journal entier. Quand le
+    fichier dépasse `max_bytes`, il est renommé en `<path>.1` (les anciens
+    décalés jusqu'à `backups`) et un nouveau fichier est commencé.
+
+    legacy_path: ancien journal JSON à migrer en tête du fichier; None: le
+    training_stats.json voisin, pour le journal par défaut uniquement.
+    """
+
+    def __init__(self, path=DEFAULT_LOG_PATH, buffer_size=64, fsync="flush",
+                 max_bytes=50 * 1024 * 1024, backups=5, legacy_path=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync doit être parmi {FSYNC_POLICIES}")
+        self.path = path
+        self.buffer_size = 1 if fsync == "always" else max(1, buffer_size)
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = []
+
+        # Ancien tableau JSON à ce chemin (p. ex. TrainingLog("training_stats.json")):
+        # converti sur place, sinon les nouvelles lignes suivraient le "]"
+        if _holds_json_array(path):
+            migrate_json_log(path, path)
+        # Migration automatique seulement pour le journal par défaut, depuis l'ancien fichier
+        # du même dossier; un autre journal n'hérite pas des entrées d'une autre session
+        if legacy_path is None and os.path.basename(path) == DEFAULT_LOG_PATH:
+            legacy_path = os.path.join(os.path.dirname(path), LEGACY_LOG_PATH)
+        if (legacy_path and os.path.exists(legacy_path)
+                and os.path.abspath(path) != os.path.abspath(legacy_path)):
+            migrate_json_log(legacy_path, path)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, entry):
+        self._buffer.append(json.dumps(entry, ensure_ascii=False))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_training_log(path=DEFAULT_LOG_PATH, include_rotated=True):
+    """Itérer paresseusement sur les entrées, des plus anciennes aux plus récentes.
+
+    Une dernière ligne tronquée (crash pendant une écriture) est ignorée.
+    """
+    paths = []
+    if include_rotated:
+        i = 1
+        while os.path.exists(f"{path}.{i}"):
+            paths.append(f"{path}.{i}")
+            i += 1
+        paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+
+    for file_path in paths:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def _holds_json_array(path):
+    """True si `path` existe et contient l'ancien format (un tableau JSON, pas des lignes)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(64).lstrip()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+    return head.startswith("[")
+
+
+def migrate_json_log(json_path=LEGACY_LOG_PATH, jsonl_path=DEFAULT_LOG_PATH):
+    """Convertir une fois l'ancien tableau JSON en JSON Lines (placé avant les entrées existantes).
+
+    L'ancien fichier est renommé en `<json_path>.migrated` (copié, si la conversion
+    se fait sur place: json_path == jsonl_path). Returns: nombre d'entrées migrées.
+    """
+    in_place = os.path.abspath(json_path) == os.path.abspath(jsonl_path)
     data = []
-    if os.path.exists(path) and os.path.getsize(path) > 0:
+    if os.path.getsize(json_path) > 0:
         try:
-            with open(path, "r") as f:
+            with open(json_path, "r") as f:
                 data = json.load(f)
                 if not isinstance(data, list):
                     data = []
         except Exception:
             data = []
 
-    data.append(entry)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    tmp_path = jsonl_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for entry in data:
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        if os.path.exists(jsonl_path) and not in_place:
+            with open(jsonl_path, "r", encoding="utf-8") as existing:
+                for line in existing:
+                    out.write(line)
+        out.flush()
+        os.fsync(out.fileno())
+    if in_place:
+        shutil.copyfile(json_path, json_path + ".migrated")
+    else:
+        os.replace(json_path, json_path + ".migrated")
+    os.replace(tmp_path, jsonl_path)
+    return len(data)
+
+
+def append_training_log(entry, path=DEFAULT_LOG_PATH):
+    """Append a training summary entry to the JSON Lines log."""
+    with TrainingLog(path, fsync="always") as log:
+        log.append(entry)
@@ -1,7 +1,9 @@
-import pygame
-import pickle
+import argparse
 import os
+import sys
 from datetime import datetime
+
+import pygame
 import matplotlib
 matplotlib.use("Agg")  # Backend sans display pour l'entraînement headless
 import matplotlib.pyplot as plt
@@ -15,32 +17,93 @@ from constants import (
     REWARD_SHOOT_NO_TARGET, REWARD_GOAL, REWARD_LIFE_BONUS, REWARD_DAMAGE
 )
 from environment import Environment
-from agent import Agent
+from agent import Agent, DenseAgent, DQNAgent, TileCodingAgent, TraceAgent
 from rendering.window import ContraWindow
-from logging_utils import append_training_log
+from rendering.live_view import LiveView
+from logging_utils import TrainingLog
+from profiling import Profiler
+from replay import CHECK_REWARD, CHECK_STATE, ReplayRecorder
+from checkpoint import read_saved_metrics
+from mlp import set_blas_threads
+from parallel_training import ParallelCollector
 
 
 # ============================================================================
 # ENTRAÎNEMENT ET EXÉCUTION
 # ============================================================================
-def train(episodes=1000, render_every=100):
-    """Entraînement Q-Learning simplifié pour présentation académique"""
+
+# --agent: Q-table dict, Q-table dense, approximation linéaire (tile coding) ou DQN
+AGENTS = {"q": Agent, "dense": DenseAgent, "tiles": TileCodingAgent, "dqn": DQNAgent}
+
+
+def train(episodes=1000, render_every=100, workers=1, profile=False, seed=None, record=None, live=False,
+          replay=False, traces=None, repeat=1, agent_kind="q", record_flags=0, blas_threads=None):
+    """Entraînement Q-Learning simplifié pour présentation académique
+
+    workers > 1: collecte des épisodes en parallèle (voir parallel_training.py),
+    sans rendu.
+    profile: chronométrer step()/observations/agent (voir profiling.py) et
+    publier le résumé tous les 50 épisodes.
+    seed: graine du flux aléatoire de l'agent (et des workers), pour rejouer une session.
+    record: fichier où enregistrer les actions de chaque épisode (voir replay.py).
+    record_flags: checksums par tick enregistrés avec les actions (replay.CHECK_REWARD |
+    replay.CHECK_STATE), pour que `replay.py check` localise le premier tick divergent.
+    live: affichage découplé (voir rendering/live_view.py): les épisodes affichés
+    tournent à pleine vitesse, la fenêtre montre le dernier état à 30 fps.
+    replay: rejouer entre les épisodes des lots de transitions tirés par erreur TD
+    (voir replay_buffer.py).
+    traces: "watkins" (Q(λ)) ou "sarsa" (SARSA(λ)): traces d'éligibilité (voir agent.TraceAgent).
+    repeat: une décision de l'agent tous les `repeat` ticks (voir environment.ActionRepeat).
+    agent_kind: clé de AGENTS; traces et workers > 1 demandent "q", replay un agent
+    qui apprend de transitions 18D (Agent.learns_from_transitions).
+    blas_threads: limiter BLAS à n threads (voir mlp.set_blas_threads), p. ex. 1 pour
+    --agent dqn dont les petites multiplications matricielles ne gagnent rien au multithreading.
+    """
+    if agent_kind not in AGENTS:
+        raise ValueError(f"agent inconnu {agent_kind!r} (choix: {', '.join(AGENTS)})")
+    # Vérifié avant toute construction: sinon l'erreur sortirait d'un worker ou du replay
+    if not AGENTS[agent_kind].learns_from_transitions and (workers > 1 or replay or traces):
+        raise ValueError(f"--agent {agent_kind} apprend dans do() (pas de transitions 18D): "
+                         f"incompatible avec --workers, --replay et --traces")
+    if agent_kind != "q" and (traces or workers > 1):
+        raise ValueError("--traces et --workers ne sont disponibles qu'avec --agent q")
+
+    if blas_threads is not None:
+        set_blas_threads(blas_threads)
+
     env = Environment()
-    agent = Agent(env)
+    if traces:
+        agent = TraceAgent(env, seed=seed, mode=traces)
+    else:
+        agent = AGENTS[agent_kind](env, seed=seed)
+    checkpoint = agent.checkpoint_name
 
     # Charger si existe
-    if os.path.exists("agent.pkl"):
-        agent.load("agent.pkl")
-        print("Agent chargé depuis agent.pkl")
+    if os.path.exists(checkpoint):
+        agent.load(checkpoint)
+        print(f"Agent chargé depuis {checkpoint}")
+    if replay:
+        agent.enable_replay()
+    agent.enable_action_repeat(repeat)
 
     print("="*60)
     print("ENTRAÎNEMENT Q-LEARNING - Contra RL")
     print("="*60)
     print(f"Épisodes: {episodes}")
+    if agent_kind != "q":
+        print(f"Agent: {type(agent).__name__}")
+    if workers > 1:
+        print(f"Workers: {workers}")
+    if repeat > 1:
+        print(f"Action repeat: {repeat} ticks par décision")
+    if replay:
+        print(f"Replay prioritaire: {agent.replay_batches} lots de {agent.replay_batch_size} par épisode")
     print(f"Hyperparamètres:")
     print(f"  • Epsilon (exploration):  {agent.epsilon:.3f}")
     print(f"  • Alpha (learning rate):  {agent.alpha:.3f}")
     print(f"  • Gamma (discount):       {agent.gamma:.3f}")
+    if traces:
+        print(f"  • Lambda (traces):        {agent.lam:.3f} ({traces})")
     print("="*60 + "\n")
 
     # Sauvegarder la taille initiale de l'historique pour les graphiques
@@ -50,45 +113,30 @@ def train(episodes=1000, render_every=100):
 
     # Créer fenêtre de rendering si nécessaire
     window = None
-    if render_every > 0:
-        window = ContraWindow(agent, fps=60)
-
-    for episode in range(episodes):
-        state = agent.reset()
-        done = False
-        total_reward = 0
-        steps = 0
-        max_x = 0  # Tracking de la progression maximale
-
-        # Détermine si on affiche cet épisode
-        should_render = render_every > 0 and episode % render_every == 0
-
-        while not done and steps < MAX_STEPS:
-            # Affichage occasionnel
-            if should_render and window:
-                # Gérer événements pygame pour éviter freeze
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        print("\nFermeture de la fenêtre détectée. Arrêt du training.")
-                        if window:
-                            pygame.quit()
-                        agent.save("agent.pkl")
-                        return
-                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_d:
-                        window.debug_mode = not window.debug_mode
-
-                # Dessiner l'état actuel
-                window.draw()
-
-            action = agent.best_action()
-            next_state, reward, done = agent.do(action)
-            state = next_state
-            total_reward += reward
-            steps += 1
-
-            # Tracker la progression maximale
-            max_x = max(max_x, agent.env.player.x)
+    viewer = None
+    if render_every > 0 and workers <= 1:
+        if live:
+            viewer = LiveView(agent)
+        else:
+            window = ContraWindow(agent, fps=60)
+
+    # Journal JSON Lines: une entrée par épisode + une entrée de session
+    training_log = TrainingLog()
 
+    # Traces d'actions rejouables (python replay.py check/watch)
+    recorder = ReplayRecorder(record, flags=record_flags) if record else None
+    if recorder is not None and recorder.flags and agent.action_repeat > 1:
+        agent.env.log_ticks = True  # checksums de chaque tick, pas seulement de chaque décision
+    record_seed = seed if seed is not None else 0
+
+    # En parallèle, seules les mises à jour du learner sont chronométrées
+    profiler = None
+    if profile:
+        profiler = Profiler()
+        agent.enable_profiling(profiler)
+
+    def record_episode(episode, total_reward, max_x):
+        """Bookkeeping de fin d'épisode (métriques, epsilon, logs)."""
         # Tracking
         agent.total_episodes += 1
         progress_pct = (max_x / LEVEL_LENGTH) * 100
@@ -104,10 +152,19 @@ def train(episodes=1000, render_every=100):
         # Décroissance epsilon (exploration) par épisode
         agent.epsilon = max(EPSILON_MIN, agent.epsilon * EPSILON_DECAY)
 
+        training_log.append({
+            "type": "episode",
+            "episode": agent.total_episodes,
+            "score": total_reward,
+            "progress": round(progress_pct, 2),
+            "win": is_victory,
+            "epsilon": agent.epsilon,
+        })
+
         # Logs
         if episode % 50 == 0:
             metrics = agent.get_metrics()
-            qtable_size = len(agent.qtable)
+            qtable_size = agent.model_size()
 
             # Calculer progression moyenne
             if len(agent.progress_history) > 0:
@@ -123,109 +180,188 @@ def train(episodes=1000, render_every=100):
                   f"Q-size={qtable_size}, "
                   f"ε={agent.epsilon:.3f}, "
                   f"α={agent.alpha:.3f}, "
-                  f"γ={agent.gamma:.3f}")
-
-    # Sauvegarde conditionnelle: basée sur PROGRESSION MOYENNE (critère principal)
-    save_model = False
-
-    # Calculer progression moyenne du nouveau modèle (SESSION uniquement)
-    session_progress = agent.progress_history[initial_progress_size:]
-    session_wins = agent.win_history[initial_win_size:]
-
-    def avg_last_100(seq):
-        return sum(seq[-100:]) / min(100, len(seq)) if seq else 0
-
-    new_avg_progress = avg_last_100(session_progress)
-    new_win_rate = avg_last_100(session_wins) * 100
-    final_metrics = agent.get_metrics()
+                  f"γ={agent.gamma:.3f}"
+                  + (f", loss={metrics['loss']:.4f}" if 'loss' in metrics else ""))
+
+            if profiler is not None:
+                print(profiler.report())
+                training_log.append({
+                    "type": "profile",
+                    "episode": agent.total_episodes,
+                    "sections": profiler.summary(),
+                })
+                profiler.reset()
+
+    # Fermés aussi sur Ctrl-C ou exception: le buffer du journal et le chunk en cours seraient perdus
+    try:
+        if workers > 1:
+            # Collecte parallèle: epsilon décroît par épisode comme en mode séquentiel
+            collector = ParallelCollector(agent, workers, seed=seed,
+                                          record_flags=recorder.flags if recorder is not None else 0)
+            try:
+                episode = 0
+                while episode < episodes:
+                    round_size = min(workers * collector.episodes_per_sync, episodes - episode)
+                    epsilons = []
+                    epsilon = agent.epsilon
+                    for _ in range(round_size):
+                        epsilons.append(epsilon)
+                        epsilon = max(EPSILON_MIN, epsilon * EPSILON_DECAY)
+
+                    for score, max_x, actions, checksums in collector.run_round(epsilons):
+                        if score != 0:
+                            agent.history.append(score)
+                        if recorder is not None:
+                            recorder.add_episode(record_seed, actions, score, checksums)
+                        record_episode(episode, score, max_x)
+                        episode += 1
+                    # Les lignes modifiées par le replay sont diffusées au round suivant
+                    collector.dirty.update(agent.replay_learn(agent.replay_batches * len(epsilons)))
+            finally:
+                collector.close()
+        else:
+            for episode in range(episodes):
+                state = agent.reset()
+                done = False
+                steps = 0
+                max_x = 0  # Tracking de la progression maximale
+
+                # Détermine si on affiche cet épisode
+                should_render = render_every > 0 and episode % render_every == 0
+                trace = recorder.begin(record_seed) if recorder is not None else None
+
+                while not done and steps < MAX_STEPS:
+                    # Affichage occasionnel
+                    if should_render and window:
+                        # Gérer événements pygame pour éviter freeze
+                        for event in pygame.event.get():
+                            if event.type == pygame.QUIT:
+                                print("\nFermeture de la fenêtre détectée. Arrêt du training.")
+                                if window:
+                                    pygame.quit()
+                                agent.save(checkpoint)
+                                return
+                            elif event.type == pygame.KEYDOWN and event.key == pygame.K_d:
+                                window.debug_mode = not window.debug_mode
+
+                        # Dessiner l'état actuel
+                        window.draw()
+                    elif should_render and viewer:
+                        if viewer.closed:
+                            print("\nFermeture de la fenêtre détectée. Arrêt du training.")
+                            viewer.close()
+                            agent.save(checkpoint)
+                            return
+                        # Sans attente: le renderer ne prend que les états qu'il peut afficher
+                        viewer.publish(agent)
+
+                    action = agent.best_action(state)
+                    next_state, reward, done = agent.do(action, state)
+                    state = next_state
+                    ticks = agent.env.ticks  # > 1 en action repeat
+                    steps += ticks
+                    if trace is not None:
+                        if recorder.flags and agent.action_repeat > 1:
+                            # Checksums du reward et de l'état de chaque tick, comme les rejoue replay.py
+                            for tick_reward, tick_state in agent.env.tick_log:
+                                trace.record(action, tick_reward, tick_state)
+                        else:
+                            for _ in range(ticks):
+                                trace.record(action, reward, next_state)
+
+                    # Tracker la progression maximale
+                    max_x = max(max_x, agent.env.player.x)
+
+                total_reward = agent.score  # rewards bruts (non actualisés)
+                if trace is not None:
+                    recorder.add(trace, total_reward)
+                agent.replay_learn()
+                record_episode(episode, total_reward, max_x)
+
+        # Sauvegarde conditionnelle: basée sur PROGRESSION MOYENNE (critère principal)
+        save_model = False
+
+        # Calculer progression moyenne du nouveau modèle (SESSION uniquement)
+        session_progress = agent.progress_history[initial_progress_size:]
+        session_wins = agent.win_history[initial_win_size:]
+
+        def avg_last_100(seq):
+            return sum(seq[-100:]) / min(100, len(seq)) if seq else 0
+
+        new_avg_progress = avg_last_100(session_progress)
+        new_win_rate = avg_last_100(session_wins) * 100
+        final_metrics = agent.get_metrics()
 
-    if os.path.exists("agent.pkl"):
-        # Charger ancien modèle pour comparaison
-        try:
-            with open("agent.pkl", 'rb') as f:
-                old_data = pickle.load(f)
-
-            # Support ancien format et nouveau format
-            if len(old_data) == 2:
-                old_qtable, old_history = old_data
-                old_win_history = [1 if s > 1000 else 0 for s in old_history]
-                # Ancien format: pas de progression historique, on approxime
-                old_avg_progress = 0  # Inconnu, on sauvegarde le nouveau
-            elif len(old_data) == 4:
-                old_qtable, old_history, old_win_history, old_progress_history = old_data
-                # Calculer progression moyenne de l'ancien modèle
-                if len(old_progress_history) > 0:
-                    old_avg_progress = sum(old_progress_history[-100:]) / min(100, len(old_progress_history))
+        if os.path.exists(checkpoint):
+            # Comparer avec l'ancien modèle (seul l'en-tête du fichier est lu)
+            try:
+                old_avg_progress, old_win_rate = read_saved_metrics(checkpoint)
+
+                # CRITÈRE DE SAUVEGARDE: Progression moyenne (critère principal)
+                # On sauvegarde si: nouvelle progression > ancienne progression
+                # OU si progression égale mais Win% meilleur
+                if new_avg_progress > old_avg_progress + 0.5:  # +0.5% d'amélioration minimum
+                    print(f"\n✓ Nouveau modèle MEILLEUR:")
+                    print(f"  Progression: {new_avg_progress:.1f}% > {old_avg_progress:.1f}%")
+                    print(f"  Win Rate: {new_win_rate:.1f}% (vs {old_win_rate:.1f}%)")
+                    print(f"  → Sauvegarde dans {checkpoint}")
+                    save_model = True
+                elif abs(new_avg_progress - old_avg_progress) <= 0.5 and new_win_rate > old_win_rate:
+                    print(f"\n✓ Nouveau modèle MEILLEUR:")
+                    print(f"  Progression: {new_avg_progress:.1f}% ≈ {old_avg_progress:.1f}%")
+                    print(f"  Win Rate: {new_win_rate:.1f}% > {old_win_rate:.1f}%")
+                    print(f"  → Sauvegarde dans {checkpoint}")
+                    save_model = True
                 else:
-                    old_avg_progress = 0
-            else:
-                # Format inconnu
-                old_avg_progress = 0
-                old_win_history = []
-
-            # Calculer aussi Win% pour affichage
-            old_wins = sum(old_win_history[-100:]) if old_win_history else 0
-            old_win_rate = (old_wins / min(100, len(old_win_history))) * 100 if old_win_history else 0
-
-            # CRITÈRE DE SAUVEGARDE: Progression moyenne (critère principal)
-            # On sauvegarde si: nouvelle progression > ancienne progression
-            # OU si progression égale mais Win% meilleur
-            if new_avg_progress > old_avg_progress + 0.5:  # +0.5% d'amélioration minimum
-                print(f"\n✓ Nouveau modèle MEILLEUR:")
-                print(f"  Progression: {new_avg_progress:.1f}% > {old_avg_progress:.1f}%")
-                print(f"  Win Rate: {new_win_rate:.1f}% (vs {old_win_rate:.1f}%)")
-                print(f"  → Sauvegarde dans agent.pkl")
-                save_model = True
-            elif abs(new_avg_progress - old_avg_progress) <= 0.5 and new_win_rate > old_win_rate:
-                print(f"\n✓ Nouveau modèle MEILLEUR:")
-                print(f"  Progression: {new_avg_progress:.1f}% ≈ {old_avg_progress:.1f}%")
-                print(f"  Win Rate: {new_win_rate:.1f}% > {old_win_rate:.1f}%")
-                print(f"  → Sauvegarde dans agent.pkl")
+                    print(f"\n⚠ Nouveau modèle moins bon ou équivalent:")
+                    print(f"  Progression: {new_avg_progress:.1f}% vs {old_avg_progress:.1f}%")
+                    print(f"  Win Rate: {new_win_rate:.1f}% vs {old_win_rate:.1f}%")
+                    print(f"  → Conservation de l'ancien modèle")
+                    save_model = False
+            except Exception as e:
+                print(f"\n✓ Erreur de lecture ancien modèle ({e}) → Sauvegarde nouveau modèle")
                 save_model = True
-            else:
-                print(f"\n⚠ Nouveau modèle moins bon ou équivalent:")
-                print(f"  Progression: {new_avg_progress:.1f}% vs {old_avg_progress:.1f}%")
-                print(f"  Win Rate: {new_win_rate:.1f}% vs {old_win_rate:.1f}%")
-                print(f"  → Conservation de l'ancien modèle")
-                save_model = False
-        except Exception as e:
-            print(f"\n✓ Erreur de lecture ancien modèle ({e}) → Sauvegarde nouveau modèle")
+        else:
+            print(f"\n✓ Premier modèle → Sauvegarde dans {checkpoint}")
+            print(f"  Progression: {new_avg_progress:.1f}%, Win Rate: {final_metrics['win_rate']:.1f}%")
             save_model = True
-    else:
-        print(f"\n✓ Premier modèle → Sauvegarde dans agent.pkl")
-        print(f"  Progression: {new_avg_progress:.1f}%, Win Rate: {final_metrics['win_rate']:.1f}%")
-        save_model = True
 
-    if save_model:
-        agent.save("agent.pkl")
-        final_metrics = agent.get_metrics()
-        print(f"✓ Modèle sauvegardé (Win%={final_metrics['win_rate']:.1f}%)")
-
-    # Journaliser la session dans training_stats.json
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "episodes": episodes,
-        "alpha": agent.alpha,
-        "gamma": agent.gamma,
-        "epsilon_start": EPSILON,
-        "epsilon_min": EPSILON_MIN,
-        "epsilon_decay": EPSILON_DECAY,
-        "rewards": {
-            "progress": REWARD_PROGRESS,
-            "backward": REWARD_BACKWARD,
-            "idle": REWARD_IDLE,
-            "enemy_hit": REWARD_ENEMY_HIT,
-            "enemy_passed": REWARD_ENEMY_PASSED,
-            "wasted_bullet": REWARD_WASTED_BULLET,
-            "shoot_no_target": REWARD_SHOOT_NO_TARGET,
-            "goal": REWARD_GOAL,
-            "life_bonus": REWARD_LIFE_BONUS,
-            "damage": REWARD_DAMAGE,
-        },
-        "session_win_rate": round(new_win_rate, 2),
-        "session_progress": round(new_avg_progress, 2),
-    }
-    append_training_log(log_entry)
+        if save_model:
+            agent.save(checkpoint)
+            final_metrics = agent.get_metrics()
+            print(f"✓ Modèle sauvegardé (Win%={final_metrics['win_rate']:.1f}%)")
+
+        # Journaliser la session dans training_stats.jsonl
+        log_entry = {
+            "type": "session",
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "episodes": episodes,
+            "agent": agent_kind,
+            "alpha": agent.alpha,
+            "gamma": agent.gamma,
+            "epsilon_start": EPSILON,
+            "epsilon_min": EPSILON_MIN,
+            "epsilon_decay": EPSILON_DECAY,
+            "rewards": {
+                "progress": REWARD_PROGRESS,
+                "backward": REWARD_BACKWARD,
+                "idle": REWARD_IDLE,
+                "enemy_hit": REWARD_ENEMY_HIT,
+                "enemy_passed": REWARD_ENEMY_PASSED,
+                "wasted_bullet": REWARD_WASTED_BULLET,
+                "shoot_no_target": REWARD_SHOOT_NO_TARGET,
+                "goal": REWARD_GOAL,
+                "life_bonus": REWARD_LIFE_BONUS,
+                "damage": REWARD_DAMAGE,
+            },
+            "session_win_rate": round(new_win_rate, 2),
+            "session_progress": round(new_avg_progress, 2),
+        }
+        training_log.append(log_entry)
+    finally:
+        training_log.close()
+        if recorder is not None:
+            recorder.close()
 
     # Graphiques de présentation académique (3 panels) - SESSION ACTUELLE UNIQUEMENT
     if len(agent.history) > initial_history_size:
@@ -284,22 +420,46 @@ def train(episodes=1000, render_every=100):
     if window:
         pygame.quit()
         print("✓ Fenêtre de rendering fermée")
+    if viewer:
+        viewer.close()
+        print("✓ Fenêtre de rendering fermée")
 
     return agent
 
 
-def play(agent=None):
-    """Jouer avec l'agent entraîné"""
+def play(agent=None, live=False, agent_kind="q"):
+    """Jouer avec l'agent entraîné
+
+    live: les épisodes s'enchaînent à pleine vitesse, la fenêtre (rendering/live_view.py)
+    n'en montre que le dernier état à 30 fps.
+    agent_kind: clé de AGENTS (agent chargé depuis son checkpoint_name).
+    """
     if agent is None:
         env = Environment()
-        agent = Agent(env)
-        if os.path.exists("agent.pkl"):
-            agent.load("agent.pkl")
-            print("Agent chargé depuis agent.pkl")
+        agent = AGENTS[agent_kind](env)
+        if os.path.exists(agent.checkpoint_name):
+            agent.load(agent.checkpoint_name)
+            print(f"Agent chargé depuis {agent.checkpoint_name}")
         else:
             print("Aucun agent entraîné trouvé! Utilisation d'un agent non entraîné...")
             agent.epsilon = 1.0  # Plus d'exploration pour un agent non entraîné
 
+    if live:
+        viewer = LiveView(agent)
+        print("Démarrage de la démo en direct... (Q pour quitter)")
+        try:
+            while not viewer.closed:
+                state = agent.reset()
+                done = False
+                while not done and agent.env.steps < MAX_STEPS and not viewer.closed:
+                    action = agent.best_action(state)
+                    state, reward, done = agent.do(action, state)
+                    viewer.publish(agent)
+                print(f"Épisode terminé! Score: {agent.score:.1f}")
+        finally:
+            viewer.close()
+        return
+
     window = ContraWindow(agent)
 
     print("Démarrage de la démo... (Q pour quitter)")
@@ -316,21 +476,70 @@ def play(agent=None):
 # ============================================================================
 # MAIN
 # ============================================================================
-if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "train":
-            episodes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
-            render_every = int(sys.argv[3]) if len(sys.argv) > 3 else 0
-            train(episodes=episodes, render_every=render_every)
-        elif sys.argv[1] == "play":
-            play()
+EXAMPLES = """\
+Exemples:
+  python main.py train 1000 50          # Affiche tous les 50 épisodes
+  python main.py train 1000 0           # Pas d'affichage (rapide)
+  python main.py train 50000 0 --workers 16  # Collecte parallèle
+  python main.py train 1000 0 --profile      # Temps par phase de step()
+  python main.py train 1000 0 --seed 42      # Session reproductible
+  python main.py train 1000 0 --record replays.bin  # Rejouer: python replay.py
+  python main.py train 1000 0 --record replays.bin --checksums  # + checksum par tick
+  python main.py train 1000 1 --live   # Affichage sans ralentir le training
+  python main.py train 1000 0 --replay      # Replay prioritaire entre les épisodes
+  python main.py train 1000 0 --traces sarsa  # SARSA(λ) (ou watkins: Q(λ))
+  python main.py train 1000 0 --repeat 4     # Une décision tous les 4 ticks
+  python main.py train 1000 0 --agent tiles  # Tile coding (ou dense: Q-table dense, dqn: réseau NumPy)
+  python main.py train 1000 0 --agent dqn --blas-threads 1  # BLAS limité à 1 thread
+  python main.py play                   # Jouer avec l'agent
+  python main.py play --live            # Démo à pleine vitesse, affichage à 30 fps
+  python main.py play --agent tiles     # Démo de l'agent tile coding
+"""
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python main.py", description="Contra RL: entraîner ou jouer.",
+                                     epilog=EXAMPLES, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command")
+
+    train_parser = commands.add_parser("train", help="Entraîner l'agent")
+    train_parser.add_argument("episodes", type=int, nargs="?", default=1000)
+    train_parser.add_argument("render_every", type=int, nargs="?", default=0,
+                              help="afficher un épisode sur N (0: jamais)")
+    train_parser.add_argument("--workers", type=int, default=1, help="collecte parallèle sur N process")
+    train_parser.add_argument("--profile", action="store_true", help="temps par phase de step()")
+    train_parser.add_argument("--seed", type=int, help="session reproductible")
+    train_parser.add_argument("--record", metavar="FICHIER", help="traces d'actions (voir replay.py)")
+    train_parser.add_argument("--checksums", action="store_true", help="avec --record: checksum par tick")
+    train_parser.add_argument("--live", action="store_true", help="affichage sans ralentir le training")
+    train_parser.add_argument("--replay", action="store_true", help="replay prioritaire entre les épisodes")
+    train_parser.add_argument("--traces", choices=TraceAgent.MODES, help="traces d'éligibilité")
+    train_parser.add_argument("--repeat", type=int, default=1, help="une décision tous les N ticks")
+    train_parser.add_argument("--agent", choices=AGENTS, default="q", dest="agent_kind")
+    train_parser.add_argument("--blas-threads", type=int, help="limiter BLAS à N threads")
+
+    play_parser = commands.add_parser("play", help="Jouer avec l'agent")
+    play_parser.add_argument("--live", action="store_true", help="démo à pleine vitesse, affichage à 30 fps")
+    play_parser.add_argument("--agent", choices=AGENTS, default="q", dest="agent_kind")
+    return parser
+
+
+def main(argv):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "train":
+        train(episodes=args.episodes, render_every=args.render_every, workers=args.workers,
+              profile=args.profile, seed=args.seed, record=args.record, live=args.live,
+              replay=args.replay, traces=args.traces, repeat=args.repeat,
+              agent_kind=args.agent_kind,
+              record_flags=CHECK_REWARD | CHECK_STATE if args.checksums else 0,
+              blas_threads=args.blas_threads)
+    elif args.command == "play":
+        play(live=args.live, agent_kind=args.agent_kind)
     else:
-        # Mode interactif
-        print("Usage:")
-        print("  python main.py train [episodes] [render_every]  # Entraîner l'agent")
-        print("    Exemple: python main.py train 1000 50          # Affiche tous les 50 épisodes")
-        print("    Exemple: python main.py train 1000 0           # Pas d'affichage (rapide)")
-        print("  python main.py play                             # Jouer avec l'agent")
-        print("  python main.py                                  # Ce message")
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,151 @@
+"""Petit perceptron multicouche en NumPy pur (forward/backward écrits à la main).
+
+Couches denses float32, ReLU entre les couches, sortie linéaire. Tout est
+vectorisé sur le lot: un forward = une multiplication matricielle par couche.
+Pour des matrices de cette taille (64-256), le multithreading BLAS coûte plus
+qu'il ne rapporte et se dispute le CPU avec la simulation, d'où
+set_blas_threads().
+"""
+
+import glob
+import os
+
+import numpy as np
+
+# Réglage du nombre de threads selon la bibliothèque BLAS embarquée par NumPy
+_BLAS_SETTERS = ("scipy_openblas_set_num_threads64_", "scipy_openblas_set_num_threads",
+                 "openblas_set_num_threads64_", "openblas_set_num_threads", "MKL_Set_Num_Threads")
+
+
+def set_blas_threads(n):
+    """Limiter BLAS à `n` threads. Returns: True si la bibliothèque chargée a été réglée.
+
+    Les variables d'environnement valent pour les process lancés ensuite;
+    dans le process courant, threadpoolctl s'il est installé, sinon appel
+    direct à l'OpenBLAS/MKL fourni avec la wheel NumPy.
+    """
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(n)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        pass
+    else:
+        threadpool_limits(n)
+        return True
+
+    import ctypes
+    numpy_dir = os.path.dirname(np.__file__)
+    paths = (glob.glob(os.path.join(numpy_dir, os.pardir, "numpy.libs", "*blas*"))
+             + glob.glob(os.path.join(numpy_dir, ".dylibs", "*blas*")))
+    for path in paths:
+        try:
+            lib = ctypes.CDLL(path)
+        except OSError:
+            continue
+        for name in _BLAS_SETTERS:
+            if hasattr(lib, name):
+                getattr(lib, name)(n)
+                return True
+    return False
+
+
+class MLP:
+    """Réseau dense `sizes` = (entrées, cachées..., sorties), initialisation de He.
+
+    Tous les paramètres vivent dans un seul vecteur float32 `flat` (poids et
+    biais en sont des vues), de même que les gradients: l'optimiseur et la
+    copie vers le réseau cible travaillent sur un seul tableau.
+    """
+
+    def __init__(self, sizes, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.sizes = tuple(sizes)
+        n_params = sum(n_in * n_out + n_out for n_in, n_out in zip(sizes[:-1], sizes[1:]))
+        self.flat = np.zeros(n_params, dtype=np.float32)
+        self.grad = np.zeros(n_params, dtype=np.float32)
+        self.weights, self.biases = self._views(self.flat)
+        self._grad_weights, self._grad_biases = self._views(self.grad)
+        for w in self.weights:
+            w[...] = rng.standard_normal(w.shape) * np.sqrt(2.0 / w.shape[0])
+        self._activations = None
+
+    def _views(self, flat):
+        weights, biases = [], []
+        offset = 0
+        for n_in, n_out in zip(self.sizes[:-1], self.sizes[1:]):
+            weights.append(flat[offset:offset + n_in * n_out].reshape(n_in, n_out))
+            offset += n_in * n_out
+            biases.append(flat[offset:offset + n_out])
+            offset += n_out
+        return weights, biases
+
+    def n_params(self):
+        return self.flat.size
+
+    def copy_from(self, other):
+        self.flat[...] = other.flat
+
+    def predict(self, x):
+        """Sorties (N, n_out) pour un lot (N, n_in), sans garder de quoi rétropropager."""
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def forward(self, x):
+        """Comme predict(), en gardant les activations pour backward()."""
+        activations = [x]
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+            activations.append(x)
+        self._activations = activations
+        return x
+
+    def backward(self, grad_out):
+        """Gradient `grad` (même layout que `flat`) de la perte, connaissant d(perte)/d(sorties)
+        du dernier forward."""
+        activations = self._activations
+        grad = grad_out
+        for i in range(len(self.weights) - 1, -1, -1):
+            np.sum(grad, axis=0, out=self._grad_biases[i])
+            np.matmul(activations[i].T, grad, out=self._grad_weights[i])
+            if i > 0:
+                # ReLU: pas de gradient là où l'activation était nulle
+                grad = (grad @ self.weights[i].T) * (activations[i] > 0)
+        return self.grad
+
+
+class Adam:
+    """Optimiseur Adam sur un vecteur de paramètres (mis à jour en place)."""
+
+    def __init__(self, params, lr=1e-3, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.params = params
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.m = np.zeros_like(params)
+        self.v = np.zeros_like(params)
+        self._step = np.zeros_like(params)
+
+    def step(self, grad):
+        self.t += 1
+        # Correction du biais des moments intégrée au pas
+        lr = self.lr * np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+        m, v, step = self.m, self.v, self._step
+        m *= self.beta1
+        m += (1 - self.beta1) * grad
+        v *= self.beta2
+        v += (1 - self.beta2) * grad * grad
+        np.sqrt(v, out=step)
+        step += self.eps
+        np.divide(m, step, out=step)
+        step *= lr
+        self.params -= step
@@ -0,0 +1,134 @@
+"""Collecte d'épisodes en parallèle (multiprocessing) pour `main.train`.
+
+Chaque worker possède son propre `Environment` et une copie locale de la
+Q-table. À chaque round, le learner diffuse les lignes de la Q-table modifiées
+depuis le round précédent, les workers jouent leurs épisodes puis renvoient
+leurs transitions, que le learner rejoue dans `Agent.qtable` via `Agent.learn`.
+"""
+
+import multiprocessing
+import random
+
+from constants import MAX_STEPS
+from replay import step_checksum
+
+
+def _play_episode(agent, record_flags=0):
+    """Jouer un épisode complet.
+
+    Returns: (transitions, score, max_x, actions par tick, checksums par tick
+    ou None si record_flags == 0, voir replay.py).
+    """
+    state = agent.reset()
+    done = False
+    steps = 0
+    max_x = 0
+    transitions = []
+    actions = []
+    checksums = [] if record_flags else None
+
+    while not done and steps < MAX_STEPS:
+        action = agent.best_action(state)
+        next_state, reward, done = agent.do(action, state)
+        transitions.append((state, action, reward, next_state, done))
+        actions.extend([action] * agent.env.ticks)
+        if record_flags:
+            # En action repeat: reward et état de chaque tick (voir ActionRepeat.tick_log)
+            tick_log = agent.env.tick_log if agent.action_repeat > 1 else ((reward, next_state),)
+            checksums.extend(step_checksum(record_flags, r, s) for r, s in tick_log)
+        state = next_state
+        steps += agent.env.ticks
+        max_x = max(max_x, agent.env.player.x)
+
+    return transitions, agent.score, max_x, actions, checksums
+
+
+def _worker_loop(conn, qtable, seed, repeat, record_flags):
+    """Boucle d'un worker: ('run', updates, epsilons) → liste de résultats d'épisodes."""
+    # Imports locaux: le worker construit son propre environnement
+    from environment import Environment
+    from agent import Agent
+
+    agent = Agent(Environment(), seed=seed)
+    agent.qtable = qtable
+    agent.enable_action_repeat(repeat)
+    if record_flags and agent.action_repeat > 1:
+        agent.env.log_ticks = True
+
+    while True:
+        message = conn.recv()
+        if message[0] == 'stop':
+            break
+
+        _, updates, epsilons = message
+        agent.qtable.update(updates)
+
+        results = []
+        for epsilon in epsilons:
+            agent.epsilon = epsilon
+            results.append(_play_episode(agent, record_flags))
+        conn.send(results)
+
+    conn.close()
+
+
+class ParallelCollector:
+    """Pool de workers persistants jouant contre un snapshot de `agent.qtable`."""
+
+    def __init__(self, agent, workers, episodes_per_sync=10, seed=None, record_flags=0):
+        if not agent.learns_from_transitions:
+            raise ValueError(f"ParallelCollector: {type(agent).__name__} n'apprend pas de transitions 18D")
+        self.agent = agent
+        self.workers = workers
+        self.episodes_per_sync = episodes_per_sync
+        self.dirty = set()
+
+        base_seed = seed if seed is not None else random.randrange(2 ** 31)
+        context = multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+        for worker_id in range(workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_loop,
+                args=(child_conn, {s: dict(q) for s, q in agent.qtable.items()}, base_seed + worker_id,
+                      agent.action_repeat, record_flags),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def run_round(self, epsilons):
+        """Jouer un épisode par epsilon, répartis sur les workers.
+
+        Les transitions sont fusionnées dans `agent.qtable` dans l'ordre des
+        épisodes. Returns: liste de (score, max_x, actions, checksums), dans l'ordre de `epsilons`.
+        """
+        updates = {s: dict(self.agent.qtable[s]) for s in self.dirty}
+        self.dirty = set()
+
+        # Répartition contiguë: l'épisode i va au worker i // chunk
+        # (tous les workers reçoivent les mises à jour, même sans épisode à jouer)
+        chunk = -(-len(epsilons) // self.workers)
+        batches = [epsilons[i * chunk:(i + 1) * chunk] for i in range(self.workers)]
+        for conn, batch in zip(self.connections, batches):
+            conn.send(('run', updates, batch))
+
+        results = []
+        for conn in self.connections:
+            for transitions, score, max_x, actions, checksums in conn.recv():
+                for state, action, reward, next_state, done in transitions:
+                    self.agent.learn(state, action, reward, next_state, done)
+                    self.dirty.add(state)
+                    self.dirty.add(next_state)
+                results.append((score, max_x, actions, checksums))
+        return results
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(('stop',))
+            conn.close()
+        for process in self.processes:
+            process.join()
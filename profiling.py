@@ -0,0 +1,132 @@
+"""Instrumentation opt-in du hot path (Environment.step, observations, Agent).
+
+Désactivé par défaut: `Environment.profiler` vaut None et les méthodes ne
+sont pas enveloppées, le coût se limite à un test `is not None` par phase de
+`step`. Une fois activé, chaque section accumule nombre d'appels, temps total
+et un histogramme log-linéaire des durées (4 sous-classes par octave, en ns).
+"""
+
+from time import perf_counter_ns
+
+_SUB_BITS = 2
+_SUB = 1 << _SUB_BITS
+_N_BUCKETS = 64 * _SUB
+
+
+def _bucket(ns):
+    b = ns.bit_length()
+    if b <= _SUB_BITS + 1:
+        return ns
+    return (b << _SUB_BITS) | ((ns >> (b - _SUB_BITS - 1)) & (_SUB - 1))
+
+
+def _bucket_upper(index):
+    """Borne haute (ns) des durées rangées dans `index`."""
+    if index < (_SUB_BITS + 2) << _SUB_BITS:
+        return index + 1
+    b, sub = index >> _SUB_BITS, index & (_SUB - 1)
+    return (_SUB + sub + 1) << (b - _SUB_BITS - 1)
+
+
+class SectionStats:
+    __slots__ = ("count", "total_ns", "hist")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.hist = [0] * _N_BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        self.hist[_bucket(ns)] += 1
+
+    def percentile(self, q):
+        """Percentile approché (borne haute du bucket), en ns."""
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.hist):
+            seen += n
+            if n and seen >= target:
+                return _bucket_upper(index)
+        return 0
+
+
+class Profiler:
+    """Timers cumulés par section nommée."""
+
+    def __init__(self):
+        self.sections = {}
+        self._last = 0
+
+    def section(self, name):
+        stats = self.sections.get(name)
+        if stats is None:
+            stats = self.sections[name] = SectionStats()
+        return stats
+
+    def start(self):
+        """Début d'une suite de phases (voir lap)."""
+        self._last = perf_counter_ns()
+
+    def lap(self, name):
+        """Attribuer à `name` le temps écoulé depuis start() ou le lap précédent."""
+        now = perf_counter_ns()
+        self.section(name).add(now - self._last)
+        self._last = now
+
+    def wrap(self, name, fn):
+        """Version chronométrée de `fn`."""
+        stats = self.section(name)
+        clock = perf_counter_ns
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            result = fn(*args, **kwargs)
+            stats.add(clock() - t0)
+            return result
+        timed.__wrapped__ = fn
+        return timed
+
+    def instrument(self, obj, names, prefix=""):
+        """Remplacer les méthodes `names` de l'instance `obj` par leur version chronométrée."""
+        for name in names:
+            setattr(obj, name, self.wrap(prefix + name.lstrip("_"), getattr(obj, name)))
+
+    def reset(self):
+        """Remettre les compteurs à zéro (en place: les wrappers gardent leur section)."""
+        for stats in self.sections.values():
+            stats.count = 0
+            stats.total_ns = 0
+            stats.hist = [0] * _N_BUCKETS
+
+    def summary(self):
+        """{section: {count, total_ms, mean_us, p50_us, p90_us, p99_us}}, triées par temps total."""
+        result = {}
+        for name, stats in sorted(self.sections.items(), key=lambda kv: -kv[1].total_ns):
+            if stats.count == 0:
+                continue
+            result[name] = {
+                "count": stats.count,
+                "total_ms": round(stats.total_ns / 1e6, 3),
+                "mean_us": round(stats.total_ns / stats.count / 1e3, 3),
+                "p50_us": round(stats.percentile(0.50) / 1e3, 3),
+                "p90_us": round(stats.percentile(0.90) / 1e3, 3),
+                "p99_us": round(stats.percentile(0.99) / 1e3, 3),
+            }
+        return result
+
+    def report(self):
+        """Tableau texte du résumé, pour les logs de train()."""
+        lines = [f"  {'section':<22}{'count':>9}{'total ms':>11}{'mean µs':>10}"
+                 f"{'p50':>9}{'p90':>9}{'p99':>9}"]
+        for name, s in self.summary().items():
+            lines.append(f"  {name:<22}{s['count']:>9}{s['total_ms']:>11.1f}{s['mean_us']:>10.2f}"
+                         f"{s['p50_us']:>9.2f}{s['p90_us']:>9.2f}{s['p99_us']:>9.2f}")
+        return "\n".join(lines)
+
+
+def uninstrument(obj, names):
+    """Retirer les méthodes chronométrées posées par Profiler.instrument."""
+    for name in names:
+        obj.__dict__.pop(name, None)
@@ -0,0 +1,264 @@
+"""Q-table dense: états 18D encodés en entiers, valeurs dans un tableau float32 contigu."""
+
+import numpy as np
+
+from constants import ACTIONS
+from environment import STATE_BOUNDS
+
+
+class StateCodec:
+    """Encodage mixed-radix des états bornés de `Environment.get_state` en clés int64."""
+
+    def __init__(self, bounds=STATE_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.offsets = tuple(low for low, _ in bounds)
+        self.radices = tuple(high - low + 1 for low, high in bounds)
+        strides = []
+        stride = 1
+        for radix in reversed(self.radices):
+            strides.append(stride)
+            stride *= radix
+        self.strides = tuple(reversed(strides))
+
+    def encode(self, state):
+        """Tuple d'état → clé entière (mixed-radix)."""
+        # Hors bornes, la clé serait celle d'un autre état (vérifié sauf sous python -O)
+        assert self.in_bounds(state), f"état hors de STATE_BOUNDS: {state}"
+        return sum((v - o) * s for v, o, s in zip(state, self.offsets, self.strides))
+
+    def in_bounds(self, state):
+        return len(state) == len(self.bounds) and all(
+            low <= v <= high for v, (low, high) in zip(state, self.bounds))
+
+    def decode(self, key):
+        """Clé entière → tuple d'état."""
+        state = []
+        for offset, stride, radix in zip(self.offsets, self.strides, self.radices):
+            state.append((key // stride) % radix + offset)
+        return tuple(state)
+
+    def decode_batch(self, keys):
+        """Vecteur (M,) de clés → liste de M tuples d'état."""
+        keys = np.asarray(keys, dtype=np.int64)[:, None]
+        states = keys // np.array(self.strides, dtype=np.int64) % np.array(self.radices) + np.array(self.offsets)
+        return list(map(tuple, states.tolist()))
+
+
+def _search_sorted(sorted_keys, key):
+    """Position de `key` dans un tableau trié de clés, ou None."""
+    i = int(np.searchsorted(sorted_keys, key))
+    if i < len(sorted_keys) and sorted_keys[i] == key:
+        return i
+    return None
+
+
+class DenseQTable(StateCodec):
+    """Q-store (n_states, n_actions) en float32, indexé par encodage mixed-radix.
+
+    L'espace complet (~4e13 états) ne tient pas en mémoire: chaque état est
+    encodé en une clé int64 puis associé à une ligne du tableau à sa première
+    visite (hash-to-row). Les colonnes suivent l'ordre de `ACTIONS`.
+
+    Une table chargée depuis un fichier (`from_arrays`) garde ses lignes
+    d'origine triées par clé et les retrouve par recherche binaire: le
+    dictionnaire `index` ne contient que les états ajoutés depuis.
+    """
+
+    def __init__(self, bounds=STATE_BOUNDS, n_actions=len(ACTIONS), capacity=1024):
+        super().__init__(bounds)
+        self.n_actions = n_actions
+
+        self.index = {}  # clé encodée → ligne
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, n_actions), dtype=np.float32)
+        self.size = 0
+        self._base_size = 0  # lignes [0, _base_size) triées par clé
+
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+    @property
+    def values(self):
+        """Vue (n_states, n_actions) sur les Q-values (invalide après un agrandissement)."""
+        return self._values[:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, state):
+        return self._find(self.encode(state)) is not None
+
+    def __getitem__(self, state):
+        """Ligne de Q-values d'un état connu (vue modifiable)."""
+        row = self._find(self.encode(state))
+        if row is None:
+            raise KeyError(state)
+        return self._values[row]
+
+    def _find(self, key):
+        row = self.index.get(key)
+        if row is None and self._base_size:
+            row = _search_sorted(self.keys[:self._base_size], key)
+        return row
+
+    def row(self, state):
+        """Ligne associée à `state`, initialisée à 0 si l'état est nouveau."""
+        key = self.encode(state)
+        row = self._find(key)
+        if row is None:
+            row = self._add(key)
+        return row
+
+    def rows(self, keys):
+        """Lignes associées à un vecteur de clés (créées si besoin)."""
+        out = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys.tolist()):
+            row = self._find(key)
+            out[i] = row if row is not None else self._add(key)
+        return out
+
+    def _add(self, key):
+        if self.size == len(self.keys):
+            self._grow(max(1024, 2 * len(self.keys)))
+        row = self.size
+        self.index[key] = row
+        self.keys[row] = key
+        self._values[row] = 0
+        self.size += 1
+        return row
+
+    def detach(self):
+        """Copier en mémoire les tableaux encore mappés depuis un checkpoint (voir Agent.save)."""
+        if isinstance(self.keys, np.memmap) or isinstance(self._values, np.memmap):
+            self._grow(len(self.keys))
+
+    def _grow(self, capacity):
+        # Copie en mémoire: libère aussi les tableaux mappés d'un fichier
+        keys = np.zeros(capacity, dtype=np.int64)
+        values = np.zeros((capacity, self.n_actions), dtype=np.float32)
+        keys[:self.size] = self.keys[:self.size]
+        values[:self.size] = self._values[:self.size]
+        self.keys = keys
+        self._values = values
+
+    # ------------------------------------------------------------------
+    # Politique
+    # ------------------------------------------------------------------
+    def best_actions(self, rows, rng=None):
+        """Argmax vectorisé (indices dans ACTIONS) des lignes `rows`, ex-aequo départagés
+        uniformément au hasard."""
+        rng = rng if rng is not None else np.random.default_rng()
+        q = self._values[rows]
+        ties = q == q.max(axis=1, keepdims=True)
+        noise = rng.random(q.shape)
+        return np.argmax(np.where(ties, noise, -1.0), axis=1)
+
+    # ------------------------------------------------------------------
+    # Conversion (ancien format pickle, checkpoint)
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, qtable, **kwargs):
+        """Construire depuis le format dict {état: {action: q}}."""
+        table = cls(capacity=max(1024, len(qtable)), **kwargs)
+        for state, q_values in qtable.items():
+            row = table.row(state)
+            for a, q in q_values.items():
+                table._values[row, ACTIONS.index(a)] = q
+        return table
+
+    def to_arrays(self):
+        """(clés triées, Q-values) pour la sauvegarde (voir checkpoint.py)."""
+        order = np.argsort(self.keys[:self.size], kind='stable')
+        return self.keys[:self.size][order], self.values[order]
+
+    @classmethod
+    def from_arrays(cls, keys, values, **kwargs):
+        """Table adossée à des tableaux triés par clé (éventuellement mappés, sans copie)."""
+        table = cls(capacity=0, **kwargs)
+        table.keys = keys
+        table._values = values if values.dtype == np.float32 else values.astype(np.float32)
+        table.size = table._base_size = len(keys)
+        return table
+
+
+class LazyQTable(dict):
+    """dict {état: {action: q}} adossé à des tableaux triés par clé.
+
+    Les lignes du fichier ne deviennent des dicts Python qu'au premier accès,
+    ce qui rend `Agent.load` quasi instantané même pour une grosse table.
+    """
+
+    def __init__(self, keys, values, codec=None):
+        super().__init__()
+        self.codec = codec if codec is not None else StateCodec()
+        self.base_keys = keys
+        self.base_values = values
+        self._extra = 0  # états absents des tableaux
+
+    def _base_row(self, state):
+        return _search_sorted(self.base_keys, self.codec.encode(state))
+
+    def __missing__(self, state):
+        row = self._base_row(state)
+        if row is None:
+            raise KeyError(state)
+        q_values = {a: float(q) for a, q in zip(ACTIONS, self.base_values[row].tolist())}
+        dict.__setitem__(self, state, q_values)
+        return q_values
+
+    def __contains__(self, state):
+        return dict.__contains__(self, state) or self._base_row(state) is not None
+
+    def __setitem__(self, state, q_values):
+        if not dict.__contains__(self, state) and self._base_row(state) is None:
+            self._extra += 1
+        dict.__setitem__(self, state, q_values)
+
+    def __len__(self):
+        return len(self.base_keys) + self._extra
+
+    def detach(self):
+        """Copier en mémoire les tableaux encore mappés depuis un checkpoint (voir Agent.save)."""
+        self.base_keys = np.array(self.base_keys)
+        self.base_values = np.array(self.base_values)
+
+    def materialize(self):
+        """Charger toutes les lignes restantes dans le dict."""
+        for key in self.base_keys.tolist():
+            state = self.codec.decode(key)
+            if not dict.__contains__(self, state):
+                self.__missing__(state)
+
+    def __iter__(self):
+        self.materialize()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+
+def qtable_to_arrays(qtable, codec=None):
+    """Q-table dict (ou LazyQTable) → (clés int64 triées, Q-values float64 (n, n_actions))."""
+    codec = codec if codec is not None else StateCodec()
+    states = list(dict.keys(qtable))
+    keys = np.array([codec.encode(s) for s in states], dtype=np.int64)
+    values = np.array([[q[a] for a in ACTIONS] for q in dict.values(qtable)],
+                      dtype=np.float64).reshape(len(states), len(ACTIONS))
+
+    if isinstance(qtable, LazyQTable):
+        # Lignes jamais matérialisées: reprises telles quelles des tableaux d'origine
+        untouched = ~np.isin(qtable.base_keys, keys)
+        keys = np.concatenate([keys, qtable.base_keys[untouched]])
+        values = np.concatenate([values, np.asarray(qtable.base_values[untouched], dtype=np.float64)])
+
+    order = np.argsort(keys, kind='stable')
+    return keys[order], values[order]
@@ -0,0 +1,75 @@
+"""Radar incrémental pour les observations de `Environment`.
+
+Au lieu de refiltrer toutes les listes à chaque step, le radar maintient la
+liste des ennemis visibles (spawnés et actifs), mise à jour sur les
+événements spawn / mort / désactivation. Les balles ennemies sont suivies
+de la même façon par BulletPool.enemy_slots (entities/bullet.py).
+
+Les fossés et plateformes devant le joueur ne sont pas suivis par des
+curseurs glissants: ils sont cherchés par bisection dans les index statiques
+du niveau (level/spatial_index.py). O(log n) au lieu de O(1) amorti, mais
+sans état à recaler après un restore() ou un saut du joueur, et sans
+dupliquer la recherche de SpatialIndex.first_ahead.
+"""
+
+
+class Radar:
+    """Obstacles et ennemis proches maintenus par événements (voir module)."""
+
+    def __init__(self, level, enemies):
+        self.level = level
+
+        self.enemies = enemies
+        self._enemy_rank = {enemy: i for i, enemy in enumerate(enemies)}
+        # Ordre de spawn: x initial croissant (un ennemi non spawné ne bouge pas)
+        self._spawn_order = sorted(enemies, key=lambda e: (e.x, self._enemy_rank[e]))
+        self.reset()
+
+    @property
+    def pits(self):
+        """SpatialIndex des fossés (first_ahead...), relu si le niveau reconstruit ses index."""
+        return self.level.pit_index
+
+    @property
+    def platforms(self):
+        return self.level.platform_index
+
+    def reset(self):
+        """Début d'épisode: aucun ennemi spawné."""
+        self._spawn_cursor = 0
+        self.visible_enemies = []  # spawnés et actifs, dans l'ordre de `enemies`
+
+    def rebuild(self):
+        """Recalculer les ensembles depuis l'état courant des entités (après restauration)."""
+        self._spawn_cursor = 0
+        while (self._spawn_cursor < len(self._spawn_order)
+               and self._spawn_order[self._spawn_cursor].spawned):
+            self._spawn_cursor += 1
+        self.visible_enemies = [e for e in self.enemies if e.active and e.spawned]
+
+    # ------------------------------------------------------------------
+    # Événements
+    # ------------------------------------------------------------------
+    def spawn(self, player_x):
+        """Spawner les ennemis dont x < player_x + 500."""
+        order = self._spawn_order
+        while self._spawn_cursor < len(order) and order[self._spawn_cursor].x < player_x + 500:
+            enemy = order[self._spawn_cursor]
+            self._spawn_cursor += 1
+            if enemy.spawned:
+                continue
+            enemy.spawned = True
+            if enemy.active:
+                self._insert_enemy(enemy)
+
+    def _insert_enemy(self, enemy):
+        rank = self._enemy_rank[enemy]
+        visible = self.visible_enemies
+        k = len(visible)
+        while k > 0 and self._enemy_rank[visible[k - 1]] > rank:
+            k -= 1
+        visible.insert(k, enemy)
+
+    def remove_enemy(self, enemy):
+        """Ennemi tué ou désactivé."""
+        self.visible_enemies.remove(enemy)
@@ -0,0 +1,142 @@
+"""Affichage découplé de la simulation (suivi en direct sans ralentir l'entraînement).
+
+La boucle de simulation appelle `publish(agent)` après chaque step, sans
+jamais attendre l'affichage: ce n'est qu'au moment où le renderer est prêt
+pour une nouvelle frame qu'un snapshot de l'environnement (Environment.snapshot,
+quelques µs) est pris. Le renderer le restaure dans son propre Environment
+et le dessine à sa cadence; les steps intermédiaires sont simplement sautés.
+
+Par défaut le rendu se fait dans publish() lui-même, au plus une frame par
+1/fps seconde et sans clock.tick bloquant (~1 ms par frame, soit quelques %
+du débit à 30 fps). threaded=True le déplace dans un thread dédié (fenêtre,
+événements et clock.tick compris), mais à cause du GIL le thread se dispute
+l'interpréteur avec la simulation: mesuré plus lent et saccadé. Sous macOS,
+SDL impose de toute façon le thread principal pour la fenêtre.
+"""
+
+import sys
+import threading
+import time
+
+import pygame
+
+from environment import Environment
+from rendering.window import ContraWindow
+
+
+class _FrameSource:
+    """Ce que ContraWindow lit de l'agent: un Environment privé, le score, la taille du modèle."""
+
+    def __init__(self):
+        self.env = Environment()
+        self.score = 0
+        self.size = 0
+
+    def model_size(self):
+        return self.size
+
+
+class LiveView:
+    """Fenêtre alimentée par snapshots; `closed` passe à True si l'utilisateur la ferme."""
+
+    def __init__(self, agent, fps=30, threaded=False):
+        if threaded and sys.platform == "darwin":
+            raise ValueError("LiveView(threaded=True): la fenêtre SDL doit rester dans le thread principal sous macOS")
+        self.agent = agent
+        self.fps = fps
+        self.threaded = threaded
+        self.closed = False
+        self.frames_shown = 0
+
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()  # le renderer attend une frame
+        self._ready = threading.Event()   # une frame attend le renderer
+        self._latest = None
+        self._stop = threading.Event()
+        self._window = None
+
+        if self.threaded:
+            started = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(started,),
+                                            name="live-view", daemon=True)
+            self._thread.start()
+            started.wait()
+        else:
+            self._thread = None
+            self._open()
+            self._next_frame = 0.0
+
+    def _open(self):
+        self._source = _FrameSource()
+        self._window = ContraWindow(self._source, fps=self.fps)
+
+    def publish(self, agent=None):
+        """Proposer l'état courant de `agent.env` (ignoré si le renderer est occupé)."""
+        agent = agent or self.agent
+        if self.threaded:
+            if self._wanted.is_set():
+                frame = (agent.env.snapshot(), agent.score, agent.model_size())
+                with self._lock:
+                    self._latest = frame
+                    self._wanted.clear()
+                    self._ready.set()
+            return
+
+        now = time.perf_counter()
+        if now >= self._next_frame:
+            self._next_frame = now + 1.0 / self.fps
+            self._pump_events()
+            self._show((agent.env.snapshot(), agent.score, agent.model_size()), tick=False)
+
+    def _pump_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.closed = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_q:
+                    self.closed = True
+                elif event.key == pygame.K_d:
+                    self._window.debug_mode = not self._window.debug_mode
+
+    def _show(self, frame, tick=True):
+        snapshot, score, size = frame
+        source = self._source
+        source.env.restore(snapshot)
+        source.score = score
+        source.size = size
+        self._window.draw(tick)
+        self.frames_shown += 1
+
+    def _run(self, started):
+        """Boucle du thread de rendu: la fenêtre est créée et détruite ici."""
+        try:
+            self._open()
+        except Exception:
+            self.closed = True
+            raise
+        finally:
+            started.set()
+        period = 1.0 / self.fps
+        try:
+            while not self._stop.is_set():
+                self._pump_events()
+                self._wanted.set()
+                if not self._ready.wait(period):
+                    continue  # pas de step publié (épisode non affiché, fin d'entraînement)
+                with self._lock:
+                    frame = self._latest
+                    self._latest = None
+                    self._ready.clear()
+                self._show(frame)  # draw() cadence le thread via clock.tick(fps)
+        finally:
+            self._window.close()
+            self._window = None
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        elif self._window is not None:
+            self._window.close()
+            self._window = None
@@ -0,0 +1,111 @@
+"""Rendu hors écran de la scène en tableaux NumPy (observations en pixels).
+
+Aucune fenêtre n'est ouverte et aucun `clock.tick` ne limite la cadence:
+la scène (rendering.scene.draw_scene) est dessinée dans une Surface en
+mémoire, éventuellement réduite (smoothscale) puis convertie en niveaux de gris.
+
+Les frames sont des tableaux uint8 (hauteur, largeur, 3), ou (hauteur,
+largeur) en niveaux de gris.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from rendering.camera import Camera
+from rendering.scene import draw_scene
+
+
+def _ensure_display():
+    """convert()/convert_alpha() des sprites exigent un mode vidéo: sans serveur
+    d'affichage, ouvrir une fenêtre cachée 1x1 du driver SDL "dummy"."""
+    import pygame
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return
+    if (sys.platform.startswith("linux") and not pygame.display.get_init()
+            and "DISPLAY" not in os.environ and "WAYLAND_DISPLAY" not in os.environ):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+
+class OffscreenRenderer:
+    """Rendu de `Environment` dans une Surface hors écran, lu en NumPy.
+
+    size: (largeur, hauteur) des frames (None: taille de l'écran de jeu).
+    grayscale: luminance sur un seul canal.
+    """
+
+    def __init__(self, size=None, grayscale=False):
+        import pygame
+        _ensure_display()
+
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.size = tuple(size) if size else (SCREEN_WIDTH, SCREEN_HEIGHT)
+        if self.size == (SCREEN_WIDTH, SCREEN_HEIGHT):
+            self.frame_surface = self.surface
+        else:
+            self.frame_surface = pygame.Surface(self.size)
+        self.grayscale = grayscale
+
+        width, height = self.size
+        self.shape = (height, width) if grayscale else (height, width, 3)
+        # Tampons de la conversion en gris (évite les allocations par frame)
+        self._luma = np.empty((height, width), dtype=np.uint16)
+        self._channel = np.empty((height, width), dtype=np.uint16)
+
+        # Caméra propre: le rendu ne modifie pas env.camera
+        self.camera = Camera()
+
+    def draw(self, env):
+        """Dessiner la scène de `env` dans frame_surface."""
+        import pygame
+        self.camera.update(env.player.x)
+        draw_scene(self.surface, env, self.camera.get_x())
+        if self.frame_surface is not self.surface:
+            pygame.transform.smoothscale(self.surface, self.size, self.frame_surface)
+
+    @contextmanager
+    def view(self):
+        """Vue zéro-copie (hauteur, largeur, 3) sur la dernière frame dessinée.
+
+        La surface reste verrouillée tant que la vue existe: ne pas la garder
+        au-delà du bloc with (draw() échouerait).
+        """
+        import pygame
+        pixels = pygame.surfarray.pixels3d(self.frame_surface)
+        try:
+            yield pixels.transpose(1, 0, 2)
+        finally:
+            del pixels
+
+    def render(self, env, out=None):
+        """Dessiner `env` et copier la frame dans `out` (alloué si None). Returns: out."""
+        self.draw(env)
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        with self.view() as pixels:
+            if self.grayscale:
+                # Luminance ITU-R 601 en entiers: (77 R + 150 G + 29 B) / 256
+                luma, channel = self._luma, self._channel
+                np.multiply(pixels[..., 0], 77, out=luma, dtype=np.uint16)
+                np.multiply(pixels[..., 1], 150, out=channel, dtype=np.uint16)
+                luma += channel
+                np.multiply(pixels[..., 2], 29, out=channel, dtype=np.uint16)
+                luma += channel
+                np.right_shift(luma, 8, out=out, casting='unsafe')
+            else:
+                out[...] = pixels
+        return out
+
+    def render_batch(self, envs, out=None):
+        """Frames de plusieurs environnements dans un tableau (N, *shape)."""
+        envs = list(envs)
+        if out is None:
+            out = np.empty((len(envs),) + self.shape, dtype=np.uint8)
+        for i, env in enumerate(envs):
+            self.render(env, out[i])
+        return out
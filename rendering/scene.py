@@ -0,0 +1,16 @@
+"""Dessin de la scène de jeu (sans UI), partagé par ContraWindow et OffscreenRenderer."""
+
+
+def draw_scene(screen, env, camera_x):
+    """Fond, niveau, joueur, ennemis et balles actifs de `env` sur `screen`."""
+    env.level.draw_background(screen, camera_x)
+    env.level.draw(screen, camera_x)
+    env.player.draw(screen, camera_x)
+
+    for enemy in env.enemies:
+        if enemy.active:
+            enemy.draw(screen, camera_x)
+
+    for bullet in env.bullets:
+        if bullet.active:
+            bullet.draw(screen, camera_x)
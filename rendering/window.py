@@ -6,6 +6,7 @@ from constants import (
     RADAR_RANGE_NEAR, RADAR_RANGE_MID, RADAR_RANGE_FAR
 )
 from constants import MAX_STEPS
+from rendering.scene import draw_scene
 
 
 class ContraWindow:
@@ -24,24 +25,13 @@ class ContraWindow:
         self.tiny_font = pygame.font.Font(None, 18)
         self.debug_mode = False
 
-    def draw(self):
+    def draw(self, tick=True):
         # Mise à jour de la caméra
         self.env.camera.update(self.env.player.x)
         camera_x = self.env.camera.get_x()
 
-        self.env.level.draw_background(self.screen, camera_x)
-
         # Déléguer le dessin aux entités
-        self.env.level.draw(self.screen, camera_x)
-        self.env.player.draw(self.screen, camera_x)
-
-        for enemy in self.env.enemies:
-            if enemy.active:
-                enemy.draw(self.screen, camera_x)
-
-        for bullet in self.env.bullets:
-            if bullet.active:
-                bullet.draw(self.screen, camera_x)
+        draw_scene(self.screen, self.env, camera_x)
 
         # UI enrichie
         score_text = self.font.render(f"Score: {self.agent.score:.1f}", True, WHITE)
@@ -51,7 +41,7 @@ class ContraWindow:
         progress_text = self.small_font.render(f"Progress: {progress}%", True, WHITE)
 
         state_text = self.small_font.render(f"State: {self.env.get_state()}", True, WHITE)
-        qtable_text = self.small_font.render(f"Q-table: {len(self.agent.qtable)}", True, WHITE)
+        qtable_text = self.small_font.render(f"Q-table: {self.agent.model_size()}", True, WHITE)
 
         if self.debug_mode:
             self._draw_debug_overlay(camera_x)
@@ -88,7 +78,8 @@ class ContraWindow:
             self.screen.blit(text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2))
 
         pygame.display.flip()
-        self.clock.tick(self.fps)
+        if tick:
+            self.clock.tick(self.fps)
 
     def _draw_debug_overlay(self, camera_x):
         """Visual debugging: radar rings + distance lines to threats."""
@@ -130,10 +121,7 @@ class ContraWindow:
             draw_distance_line(enemy_center, ORANGE)
 
         # Le trou le plus proche (en face)
-        pits_ahead = [
-            pit for pit in self.env.level.pits
-            if pit.x + pit.width > self.env.player.x  # in front or under
-        ]
+        pits_ahead = self.env.level.pit_index.ending_after(self.env.player.x)  # in front or under
         if pits_ahead:
             nearest_pit = min(pits_ahead, key=lambda p: abs((p.x + p.width / 2) - self.env.player.x))
             pit_rect = nearest_pit.get_rect()
@@ -150,7 +138,9 @@ class ContraWindow:
 
         # Sol/plateforme sous les pieds et plus proche devant
         player_rect = self.env.player.get_rect()
-        standing_platforms = [p for p in self.env.level.platforms if player_rect.colliderect(p.get_rect()) or (p.y >= player_rect.bottom and p.x - camera_x < SCREEN_WIDTH + 100)]
+        platform_index = self.env.level.platform_index
+        standing_platforms = [p for p in platform_index.starting_before(camera_x + SCREEN_WIDTH + 100)
+                              if player_rect.colliderect(p.get_rect()) or p.y >= player_rect.bottom]
         if standing_platforms:
             # Distance verticale au sol actuel
             current = min(standing_platforms, key=lambda p: abs(p.y - self.env.player.y))
@@ -159,9 +149,8 @@ class ContraWindow:
             self.screen.blit(label, (player_center[0] + 10, player_center[1] + 10))
 
         # Plateforme la plus proche devant (pour anticiper)
-        platforms_ahead = [p for p in self.env.level.platforms if p.x > self.env.player.x]
-        if platforms_ahead:
-            nearest_plat = min(platforms_ahead, key=lambda p: p.x - self.env.player.x)
+        nearest_plat = platform_index.first_ahead(self.env.player.x, float('inf'))
+        if nearest_plat:
             plat_rect = nearest_plat.get_rect()
             plat_center = (int(plat_rect.centerx - camera_x), int(plat_rect.centery))
             draw_distance_line(plat_center, GRAY)
@@ -185,13 +174,36 @@ class ContraWindow:
                         self.debug_mode = not self.debug_mode
 
             # Action de l'agent
-            action = self.agent.best_action()
-            state, reward, done = self.agent.do(action)
+            action = self.agent.best_action(state)
+            state, reward, done = self.agent.do(action, state)
 
             # Affichage
             self.draw()
 
         return True
 
+    def replay_episode(self, actions):
+        """Rejoue une liste d'actions enregistrée (voir replay.py) au lieu de l'agent."""
+        self.agent.reset()
+
+        for action in actions:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        return False
+                    elif event.key == pygame.K_d:
+                        self.debug_mode = not self.debug_mode
+
+            _, reward, done = self.env.step(action)
+            self.agent.score += reward
+
+            self.draw()
+            if done:
+                break
+
+        return True
+
     def close(self):
         pygame.quit()
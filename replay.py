@@ -0,0 +1,266 @@
+"""Enregistrement et rejeu d'épisodes sous forme de traces d'actions compactes.
+
+La simulation est déterministe (voir Environment.snapshot): un épisode se
+rejoue exactement à partir de ses seules actions. Chaque action (5 valeurs)
+tient sur 3 bits; une option ajoute un checksum CRC32 par step du reward
+et/ou de l'état, pour localiser le premier step qui diverge.
+
+Format du fichier (append-only, découpé en chunks):
+    MAGIC (8 octets)
+    chunk*: en-tête <4sBIII (b"EPIS", compressé?, nb épisodes, taille, crc32) | payload
+Payload = épisodes concaténés:
+    <QIBd (seed, nb steps, flags checksum, score) | actions 3 bits | [uint32 × nb steps]
+Un chunk tronqué en fin de fichier (crash pendant l'écriture) est ignoré.
+
+Usage:
+    python replay.py list replays.bin [--limit N]
+    python replay.py check replays.bin       # rejeu headless + vérification
+    python replay.py watch replays.bin INDEX [--fps 60]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b"CONTRAR1"
+_CHUNK = struct.Struct("<4sBIII")
+_EPISODE = struct.Struct("<QIBd")
+
+# Contenu des checksums par step (flags)
+CHECK_REWARD = 1
+CHECK_STATE = 2
+
+Episode = namedtuple('Episode', ('seed', 'score', 'actions', 'flags', 'checksums'))
+
+
+def pack_actions(actions):
+    """Actions (0-7) → octets, 3 bits par action."""
+    a = np.asarray(actions, dtype=np.uint8)
+    bits = np.unpackbits(a[:, None], axis=1, bitorder='little')[:, :3]
+    return np.packbits(bits.ravel(), bitorder='little').tobytes()
+
+
+def unpack_actions(data, n_steps):
+    """Inverse de pack_actions: tableau uint8 de `n_steps` actions."""
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')
+    bits = bits[:3 * n_steps].reshape(n_steps, 3)
+    return bits[:, 0] | (bits[:, 1] << 1) | (bits[:, 2] << 2)
+
+
+def step_checksum(flags, reward, state):
+    """CRC32 du reward (float64) et/ou de l'état (int8 par dimension) d'un step."""
+    crc = 0
+    if flags & CHECK_REWARD:
+        crc = zlib.crc32(struct.pack("<d", reward), crc)
+    if flags & CHECK_STATE:
+        crc = zlib.crc32(bytes(v & 0xFF for v in state), crc)
+    return crc
+
+
+class EpisodeTrace:
+    """Trace d'un épisode en cours d'enregistrement (voir ReplayRecorder.begin)."""
+
+    __slots__ = ('seed', 'flags', 'actions', 'checksums')
+
+    def __init__(self, seed, flags):
+        self.seed = seed
+        self.flags = flags
+        self.actions = []
+        self.checksums = []
+
+    def record(self, action, reward, state):
+        self.actions.append(action)
+        if self.flags:
+            self.checksums.append(step_checksum(self.flags, reward, state))
+
+
+class ReplayRecorder:
+    """Écrivain append-only: les épisodes sont regroupés par chunks compressés."""
+
+    def __init__(self, path, flags=0, chunk_episodes=256, compress=6):
+        self.path = path
+        self.flags = flags
+        self.chunk_episodes = chunk_episodes
+        self.compress = compress
+        self._pending = []
+        self._n_pending = 0
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path}: pas un fichier de replays {MAGIC.decode()}")
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(MAGIC)
+
+    def begin(self, seed=0):
+        """Nouvelle trace; la passer à add() en fin d'épisode."""
+        return EpisodeTrace(seed, self.flags)
+
+    def add(self, trace, score):
+        self.add_episode(trace.seed, trace.actions, score,
+                         trace.checksums if trace.flags else None)
+
+    def add_episode(self, seed, actions, score, checksums=None):
+        flags = self.flags if checksums is not None else 0
+        parts = [_EPISODE.pack(seed, len(actions), flags, score), pack_actions(actions)]
+        if flags:
+            parts.append(np.asarray(checksums, dtype="<u4").tobytes())
+        self._pending.append(b"".join(parts))
+        self._n_pending += 1
+        if self._n_pending >= self.chunk_episodes:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            payload = b"".join(self._pending)
+            compressed = self.compress > 0
+            if compressed:
+                payload = zlib.compress(payload, self.compress)
+            self._file.write(_CHUNK.pack(b"EPIS", compressed, self._n_pending,
+                                         len(payload), zlib.crc32(payload)))
+            self._file.write(payload)
+            self._pending = []
+            self._n_pending = 0
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_replays(path):
+    """Itérer paresseusement sur les Episode du fichier, chunk par chunk."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: pas un fichier de replays {MAGIC.decode()}")
+        while True:
+            header = f.read(_CHUNK.size)
+            if len(header) < _CHUNK.size:
+                return
+            tag, compressed, n_episodes, size, crc = _CHUNK.unpack(header)
+            payload = f.read(size)
+            if tag != b"EPIS" or len(payload) < size or zlib.crc32(payload) != crc:
+                return  # chunk tronqué ou corrompu: fin des données valides
+            if compressed:
+                payload = zlib.decompress(payload)
+
+            offset = 0
+            for _ in range(n_episodes):
+                seed, n_steps, flags, score = _EPISODE.unpack_from(payload, offset)
+                offset += _EPISODE.size
+                n_bytes = (3 * n_steps + 7) // 8
+                actions = unpack_actions(payload[offset:offset + n_bytes], n_steps)
+                offset += n_bytes
+                checksums = None
+                if flags:
+                    checksums = np.frombuffer(payload, dtype="<u4", count=n_steps, offset=offset)
+                    offset += 4 * n_steps
+                yield Episode(seed, score, actions, flags, checksums)
+
+
+def replay(episode, env=None):
+    """Rejouer headless. Returns: (score, premier step divergent ou None).
+
+    Sans checksums, seul le score final est comparé (divergence = dernier step).
+    """
+    if env is None:
+        from environment import Environment
+        env = Environment()
+    env.reset()
+    score = 0
+    for step, action in enumerate(episode.actions.tolist()):
+        state, reward, done = env.step(action)
+        score += reward
+        if episode.flags and step_checksum(episode.flags, reward, state) != episode.checksums[step]:
+            return score, step
+        if done:
+            break
+    if score != episode.score:
+        return score, len(episode.actions) - 1
+    return score, None
+
+
+def watch(episode, fps=60):
+    """Rejouer un épisode dans ContraWindow."""
+    from environment import Environment
+    from agent import Agent
+    from rendering.window import ContraWindow
+
+    agent = Agent(Environment())
+    window = ContraWindow(agent, fps=fps)
+    try:
+        window.replay_episode(episode.actions.tolist())
+    finally:
+        window.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python replay.py", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="épisodes du fichier")
+    list_parser.add_argument("path")
+    list_parser.add_argument("--limit", type=int)
+    check_parser = commands.add_parser("check", help="rejeu headless + vérification")
+    check_parser.add_argument("path")
+    watch_parser = commands.add_parser("watch", help="rejouer un épisode à l'écran")
+    watch_parser.add_argument("path")
+    watch_parser.add_argument("index", type=int)
+    watch_parser.add_argument("--fps", type=int, default=60)
+    return parser
+
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "list":
+        for index, episode in enumerate(read_replays(args.path)):
+            if args.limit is not None and index >= args.limit:
+                break
+            print(f"#{index}: seed={episode.seed} steps={len(episode.actions)} "
+                  f"score={episode.score:.1f} checksums={'oui' if episode.flags else 'non'}")
+        return 0
+
+    if args.command == "check":
+        from environment import Environment
+        env = Environment()
+        n_episodes = n_steps = failures = 0
+        t0 = time.perf_counter()
+        for index, episode in enumerate(read_replays(args.path)):
+            score, divergence = replay(episode, env)
+            n_episodes += 1
+            n_steps += len(episode.actions)
+            if divergence is not None:
+                failures += 1
+                print(f"✗ #{index}: divergence au step {divergence} "
+                      f"(score {score:.1f} vs {episode.score:.1f} enregistré)")
+        elapsed = time.perf_counter() - t0
+        print(f"{n_episodes} épisodes, {n_steps} steps rejoués en {elapsed:.1f}s, {failures} divergence(s)")
+        return 1 if failures else 0
+
+    for i, episode in enumerate(read_replays(args.path)):
+        if i == args.index:
+            watch(episode, args.fps)
+            return 0
+    print(f"Épisode #{args.index} introuvable")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,177 @@
+"""Mémoire de transitions avec échantillonnage prioritaire (prioritized experience replay).
+
+Les transitions (s, a, r, s', done) sont rangées dans un buffer circulaire de
+tableaux NumPy compacts; les états y sont stockés encodés en clés int64
+(voir qtable.StateCodec). Une transition est tirée avec une probabilité
+proportionnelle à priorité ** alpha, la priorité étant l'erreur TD |δ| + eps:
+les transitions rares mais fortes (drapeau, chute dans un trou) sont rejouées
+bien plus souvent que les steps ordinaires. Les poids d'importance
+(N · P(i)) ** -beta corrigent le biais introduit.
+
+Références: Schaul et al., "Prioritized Experience Replay" (2016).
+"""
+
+import numpy as np
+
+from qtable import StateCodec
+
+
+class SumTree:
+    """Arbre binaire complet de sommes: chaque nœud vaut la somme de ses feuilles.
+
+    Mises à jour et tirages sont vectorisés (un passage par niveau).
+    """
+
+    def __init__(self, capacity):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.size = size
+        self.tree = np.zeros(2 * size, dtype=np.float64)  # tree[1] = racine
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Fixer la priorité des feuilles `indices` puis recalculer leurs ancêtres."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        self.tree[nodes] = priorities
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Feuilles dont l'intervalle de somme cumulée contient `values` (dans [0, total)).
+
+        Jamais une feuille de priorité nulle: une valeur arrondie à `total` (ou
+        au-delà d'un sous-arbre par cumul d'erreurs) finit sur la dernière
+        feuille non nulle au lieu de descendre dans un sous-arbre vide.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.size:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = (values >= left_sum) & (self.tree[left + 1] > 0)
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.size
+
+
+class PrioritizedReplay:
+    """Buffer circulaire de `capacity` transitions, tiré par priorités (SumTree).
+
+    alpha: 0 = tirage uniforme, 1 = proportionnel à l'erreur TD.
+    beta: correction d'importance initiale, augmentée de beta_step par tirage jusqu'à 1.
+    """
+
+    def __init__(self, capacity=100_000, alpha=0.6, beta=0.4, beta_step=1e-3,
+                 eps=1e-2, seed=None, codec=None):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_step = beta_step
+        self.eps = eps
+        self.codec = codec if codec is not None else StateCodec()
+        self.rng = np.random.default_rng(seed)
+
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_keys = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+        self.priorities = np.zeros(capacity, dtype=np.float64)  # |δ| + eps (avant ** alpha)
+
+        self.tree = SumTree(capacity)
+        self._dirty = []  # slots ajoutés depuis le dernier tirage (arbre mis à jour par lots)
+        self.position = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, state, action, reward, next_state, done, td_error):
+        """Ranger une transition (états en tuples), priorité initiale |td_error|."""
+        i = self.position
+        self.keys[i] = self.codec.encode(state)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_keys[i] = self.codec.encode(next_state)
+        self.dones[i] = done
+        self.priorities[i] = abs(td_error) + self.eps
+        self._dirty.append(i)
+
+        self.position = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _flush(self):
+        if self._dirty:
+            slots = np.array(self._dirty, dtype=np.int64)
+            self.tree.update(slots, self.priorities[slots] ** self.alpha)
+            self._dirty = []
+
+    def sample(self, batch_size):
+        """Tirage stratifié de `batch_size` transitions.
+
+        Returns: (slots, keys, actions, rewards, next_keys, dones, weights).
+        """
+        if self.count == 0:
+            raise ValueError("PrioritizedReplay.sample: buffer vide")
+        self._flush()
+        total = self.tree.total
+        # Un tirage par segment de [0, total): moins de variance qu'un tirage libre
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        slots = self.tree.find(values)
+
+        probs = self.tree.tree[slots + self.tree.size] / total
+        weights = (self.count * probs) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_step)
+
+        return (slots, self.keys[slots], self.actions[slots], self.rewards[slots],
+                self.next_keys[slots], self.dones[slots], weights)
+
+    def update_priorities(self, slots, td_errors):
+        """Nouvelles priorités |δ| + eps des transitions rejouées."""
+        self.priorities[slots] = np.abs(td_errors) + self.eps
+        self.tree.update(slots, self.priorities[slots] ** self.alpha)
+
+
+class ReplayBuffer:
+    """Buffer circulaire uniforme d'observations float32 (voir agent.DQNAgent).
+
+    Contrairement à PrioritizedReplay, les observations sont rangées telles
+    quelles (vecteurs continus, pas de clé d'état discrète).
+    """
+
+    def __init__(self, capacity, obs_dim, seed=None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.obs = np.zeros((capacity, obs_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.intp)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_obs = np.zeros((capacity, obs_dim), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+        self.position = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, obs, action, reward, next_obs, done):
+        i = self.position
+        self.obs[i] = obs
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_obs[i] = next_obs
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """Tirage uniforme avec remise. Returns: (obs, actions, rewards, next_obs, dones)."""
+        if self.count == 0:
+            raise ValueError("ReplayBuffer.sample: buffer vide")
+        idx = self.rng.integers(0, self.count, size=batch_size)
+        return self.obs[idx], self.actions[idx], self.rewards[idx], self.next_obs[idx], self.dones[idx]
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules du projet importables depuis tests/ (ils sont à la racine du dépôt)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
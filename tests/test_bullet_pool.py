@@ -0,0 +1,21 @@
+from constants import OWNER_ENEMY, OWNER_PLAYER
+from entities.bullet import BulletPool
+from level.spatial_index import SpatialIndex
+
+
+def test_enemy_slots_follow_spawn_deactivation_and_sweep():
+    pool = BulletPool(capacity=2)
+    no_platforms = SpatialIndex([])
+    pool.spawn(100, 300, 1, OWNER_PLAYER)
+    a = pool.spawn(200, 300, -1, OWNER_ENEMY)
+    b = pool.spawn(300, 300, -1, OWNER_ENEMY)  # au-delà de la capacité: _grow
+    assert len(pool.enemy_slots) == 2
+    assert {id(x) for x in pool.enemy_bullets()} == {id(a), id(b)}
+
+    a.active = False
+    assert list(pool.enemy_bullets()) == [b]
+    pool.sweep(no_platforms)
+    assert [pool.slots[i] for i in pool.enemy_slots] == [b]
+
+    pool.clear()
+    assert not pool.enemy_slots and list(pool.enemy_bullets()) == []
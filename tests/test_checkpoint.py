@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from agent import Agent, DenseAgent
+from environment import Environment
+
+
+def _play(agent, steps):
+    """Quelques transitions apprises; returns: états visités."""
+    states = []
+    state = agent.reset()
+    for _ in range(steps):
+        states.append(state)
+        next_state, _, done = agent.do(agent.best_action(state), state)
+        state = agent.reset() if done else next_state
+    return states
+
+
+def _q_row(agent, state):
+    if isinstance(agent, DenseAgent):
+        return np.array(agent.qtable[state])
+    return np.array([agent.qtable[state][a] for a in sorted(agent.qtable[state])])
+
+
+def _mapped(agent):
+    table = agent.qtable
+    arrays = (table.keys, table._values) if isinstance(agent, DenseAgent) else \
+        (table.base_keys, table.base_values)
+    return any(isinstance(a, np.memmap) for a in arrays)
+
+
+@pytest.mark.parametrize("agent_cls", [Agent, DenseAgent])
+def test_save_load_learn_save_round_trip(tmp_path, agent_cls):
+    path = str(tmp_path / "agent.pkl")
+    agent = agent_cls(Environment(), seed=0)
+    states = _play(agent, 300)
+    agent.save(path)
+
+    loaded = agent_cls(Environment(), seed=0)
+    loaded.load(path)
+    assert loaded.model_size() == agent.model_size()
+    for state in states:
+        np.testing.assert_allclose(_q_row(loaded, state), _q_row(agent, state), rtol=1e-6)
+
+    # Apprendre puis réécrire le fichier encore mappé par load()
+    more = _play(loaded, 300)
+    loaded.save(path)
+    assert not _mapped(loaded)
+
+    reloaded = agent_cls(Environment(), seed=0)
+    reloaded.load(path)
+    assert reloaded.model_size() == loaded.model_size()
+    for state in states + more:
+        np.testing.assert_allclose(_q_row(reloaded, state), _q_row(loaded, state), rtol=1e-6)
@@ -0,0 +1,58 @@
+import json
+
+from logging_utils import TrainingLog, append_training_log, read_training_log
+
+
+def test_legacy_json_is_migrated_before_new_entries(tmp_path):
+    legacy = tmp_path / "training_stats.json"
+    legacy.write_text(json.dumps([{"episode": 1}, {"episode": 2}]))
+    path = tmp_path / "training_stats.jsonl"
+
+    with TrainingLog(str(path), legacy_path=str(legacy)) as log:
+        log.append({"episode": 3})
+
+    assert [e["episode"] for e in read_training_log(str(path))] == [1, 2, 3]
+    assert not legacy.exists()
+    assert (tmp_path / "training_stats.json.migrated").exists()
+
+
+def test_old_default_path_is_not_migrated_onto_itself(tmp_path, monkeypatch):
+    # Ancien appel: append_training_log(entry, path="training_stats.json")
+    monkeypatch.chdir(tmp_path)
+    append_training_log({"episode": 1}, path="training_stats.json")
+    append_training_log({"episode": 2}, path="training_stats.json")
+
+    assert [e["episode"] for e in read_training_log("training_stats.json")] == [1, 2]
+    assert not (tmp_path / "training_stats.json.migrated").exists()
+
+
+def test_legacy_array_at_log_path_is_converted_in_place(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "training_stats.json").write_text(json.dumps([{"a": 1}, {"a": 2}]))
+
+    with TrainingLog("training_stats.json") as log:
+        log.append({"b": 3})
+
+    assert list(read_training_log("training_stats.json")) == [{"a": 1}, {"a": 2}, {"b": 3}]
+    assert json.loads((tmp_path / "training_stats.json.migrated").read_text()) == [{"a": 1}, {"a": 2}]
+
+
+def test_non_default_log_leaves_legacy_file_alone(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "training_stats.json").write_text(json.dumps([{"a": 1}]))
+
+    with TrainingLog("run2.jsonl") as log:
+        log.append({"b": 3})
+
+    assert list(read_training_log("run2.jsonl")) == [{"b": 3}]
+    assert (tmp_path / "training_stats.json").exists()
+    assert not (tmp_path / "training_stats.json.migrated").exists()
+
+
+def test_default_log_migrates_legacy_file_next_to_it(tmp_path):
+    (tmp_path / "training_stats.json").write_text(json.dumps([{"a": 1}]))
+
+    with TrainingLog(str(tmp_path / "training_stats.jsonl")) as log:
+        log.append({"b": 3})
+
+    assert list(read_training_log(str(tmp_path / "training_stats.jsonl"))) == [{"a": 1}, {"b": 3}]
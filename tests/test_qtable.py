@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from agent import Agent, DenseAgent
+from constants import ACTIONS
+from environment import Environment, STATE_BOUNDS
+from qtable import StateCodec
+
+
+def test_encode_rejects_out_of_bounds_states():
+    codec = StateCodec()
+    high = tuple(h for _, h in STATE_BOUNDS)
+    assert codec.decode(codec.encode(high)) == high
+    with pytest.raises(AssertionError):
+        codec.encode((high[0] + 1,) + high[1:])  # tomberait sur la ligne d'un autre état
+    with pytest.raises(AssertionError):
+        codec.encode(high[:-1])
+
+
+def test_dense_and_dict_agents_agree_on_greedy_actions():
+    env = Environment()
+    agents = [Agent(None, seed=0), DenseAgent(None, seed=0)]
+    rng = random.Random(0)
+
+    states = set()
+    state = env.reset()
+    for _ in range(3000):
+        action = rng.choice(ACTIONS)
+        next_state, reward, done = env.step(action)
+        for agent in agents:
+            agent.learn(state, action, reward, next_state, done)
+        states.add(state)
+        state = env.reset() if done else next_state
+
+    for agent in agents:
+        agent.epsilon = 0
+    compared = 0
+    for state in states:
+        q_dict = np.array([agents[0].qtable[state][a] for a in ACTIONS])
+        q_dense = np.array(agents[1].qtable[state], dtype=np.float64)
+        np.testing.assert_allclose(q_dense, q_dict, rtol=1e-5, atol=1e-6)
+        best_dict = set(np.flatnonzero(q_dict == q_dict.max()))
+        best_dense = set(np.flatnonzero(q_dense == q_dense.max()))
+        if len(best_dict) == 1 and len(best_dense) == 1:  # ex-aequo: départage aléatoire
+            assert best_dict == best_dense, state
+            greedy = ACTIONS[best_dict.pop()]
+            assert agents[0].best_action(state) == agents[1].best_action(state) == greedy
+            compared += 1
+    assert compared > 100
@@ -0,0 +1,38 @@
+import contextlib
+import io
+
+import pytest
+
+import main
+from replay import CHECK_REWARD, CHECK_STATE, Episode, read_replays, replay
+
+
+def _train_recorded(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "replays.bin")
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.train(episodes=3, render_every=0, seed=1, record=path,
+                   record_flags=CHECK_REWARD | CHECK_STATE, **kwargs)
+    return list(read_replays(path))
+
+
+@pytest.mark.parametrize("repeat", [1, 4])
+def test_recorded_checksums_replay_without_divergence(tmp_path, monkeypatch, repeat):
+    episodes = _train_recorded(tmp_path, monkeypatch, repeat=repeat)
+
+    assert len(episodes) == 3
+    for episode in episodes:
+        assert episode.flags == CHECK_REWARD | CHECK_STATE
+        assert len(episode.checksums) == len(episode.actions)
+        assert replay(episode) == (episode.score, None)
+
+
+def test_checksums_localize_first_divergent_tick(tmp_path, monkeypatch):
+    episode = _train_recorded(tmp_path, monkeypatch, repeat=4)[0]
+    actions = episode.actions.copy()
+    tick = len(actions) // 2
+    actions[tick] = 0 if actions[tick] != 0 else 1  # gauche <-> autre action
+
+    _, divergence = replay(Episode(episode.seed, episode.score, actions,
+                                   episode.flags, episode.checksums))
+    assert divergence == tick
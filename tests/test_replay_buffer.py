@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from replay_buffer import PrioritizedReplay, ReplayBuffer, SumTree
+
+
+def _filled(td_errors, capacity=8, alpha=0.6, beta=0.4):
+    buffer = PrioritizedReplay(capacity, alpha=alpha, beta=beta, beta_step=0.0, seed=0)
+    for i, td_error in enumerate(td_errors):
+        buffer.add(buffer.codec.decode(i), 0, 0.0, buffer.codec.decode(i + 1), False, td_error)
+    return buffer
+
+
+def _expected_probs(buffer):
+    p = buffer.priorities[:buffer.count] ** buffer.alpha
+    return p / p.sum()
+
+
+def test_sampling_frequencies_follow_priority_power_alpha():
+    buffer = _filled([0.0, 1.0, 3.0, 7.0, 15.0])
+    counts = np.zeros(buffer.capacity)
+    for _ in range(2000):
+        slots = buffer.sample(32)[0]
+        np.add.at(counts, slots, 1)
+
+    assert counts[buffer.count:].sum() == 0
+    np.testing.assert_allclose(counts[:buffer.count] / counts.sum(), _expected_probs(buffer), atol=5e-3)
+
+
+def test_importance_weights():
+    buffer = _filled([0.0, 1.0, 3.0, 7.0, 15.0], beta=0.5)
+    slots, *_, weights = buffer.sample(64)
+
+    expected = (buffer.count * _expected_probs(buffer)[slots]) ** -0.5
+    np.testing.assert_allclose(weights, expected / expected.max())
+    assert weights.max() == 1.0
+
+
+def test_find_never_returns_an_empty_leaf_at_the_total():
+    tree = SumTree(5)  # 8 feuilles, 3 remplies
+    tree.update([0, 1, 2], [0.1, 0.2, 0.3])
+    total = tree.total
+    values = [0.0, np.nextafter(total, 0), total, total * (1 + 1e-12), 0.1 + 0.2 - 1e-17]
+
+    leaves = tree.find(values)
+    assert leaves.tolist()[:4] == [0, 2, 2, 2]
+    assert tree.tree[leaves + tree.size].min() > 0
+
+
+def test_sampling_an_empty_buffer_raises():
+    with pytest.raises(ValueError, match="vide"):
+        PrioritizedReplay(8).sample(4)
+    with pytest.raises(ValueError, match="vide"):
+        ReplayBuffer(8, obs_dim=3).sample(4)
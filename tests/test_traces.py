@@ -0,0 +1,70 @@
+import pytest
+
+from agent import TraceAgent
+from constants import ACTIONS
+
+A, B = ACTIONS[0], ACTIONS[1]
+
+
+def _agent(mode, gamma=0.9, lam=0.8, trace_min=1e-6):
+    agent = TraceAgent(None, seed=0, mode=mode, lam=lam, trace_min=trace_min)
+    agent.alpha = 0.5
+    agent.gamma = gamma
+    return agent
+
+
+def _run_chain(agent, n_states, action=A):
+    """s0 → s1 → ... → terminal, toujours `action`, récompense 1 sur la dernière transition."""
+    for i in range(n_states):
+        done = i == n_states - 1
+        agent.learn((i,), action, 1.0 if done else 0.0, (i + 1,), done)
+
+
+@pytest.mark.parametrize("mode", TraceAgent.MODES)
+def test_three_state_chain_matches_lambda_return(mode):
+    # Q = 0 au départ: la λ-return de s_k vaut (γλ)^(2-k), seule l'erreur TD terminale est non nulle
+    agent = _agent(mode)
+    _run_chain(agent, 3)
+
+    gl = agent.gamma * agent.lam
+    for k, expected in enumerate([gl ** 2, gl, 1.0]):
+        assert agent.qtable[(k,)][A] == pytest.approx(agent.alpha * expected)
+        assert agent.qtable[(k,)][B] == 0
+    assert agent.traces == {} and agent._pending is None
+
+
+def test_watkins_cuts_traces_on_an_exploratory_action():
+    agent = _agent("watkins")
+    agent.qtable[(1,)] = {a: 0.0 for a in ACTIONS}
+    agent.qtable[(1,)][B] = 0.5  # A n'est pas glouton en s1
+    _run_chain(agent, 3)
+
+    gl = agent.gamma * agent.lam
+    # s0: sa seule erreur TD (γ max Q(s1, ·) = γ 0.5), trace coupée avant le reward terminal
+    assert agent.qtable[(0,)][A] == pytest.approx(agent.alpha * agent.gamma * 0.5)
+    assert agent.qtable[(1,)][A] == pytest.approx(agent.alpha * gl)
+    assert agent.qtable[(2,)][A] == pytest.approx(agent.alpha)
+
+
+def test_sarsa_waits_for_the_next_action_and_bootstraps_on_it():
+    agent = _agent("sarsa")
+    agent.qtable[(1,)] = {a: 0.0 for a in ACTIONS}
+    agent.qtable[(1,)][B] = 1.0
+
+    agent.learn((0,), A, 0.0, (1,), False)
+    assert agent._pending == ((0,), A, 0.0, (1,))
+    assert agent.qtable[(0,)][A] == 0  # pas de mise à jour avant a'
+
+    # a' = A: cible γ Q(s1, A) = 0, pas γ max Q(s1, ·) comme en Q-learning
+    agent.learn((1,), A, 0.0, (2,), False)
+    assert agent.qtable[(0,)][A] == 0
+    assert agent._pending == ((1,), A, 0.0, (2,))
+
+
+def test_traces_below_trace_min_are_pruned():
+    agent = _agent("watkins", gamma=1.0, lam=0.5, trace_min=0.2)
+    _run_chain(agent, 5)
+
+    # Traces 1, 0.5, 0.25 gardées, 0.125 élaguée: le reward ne remonte que sur 3 états
+    expected = [0.0, 0.0, 0.25, 0.5, 1.0]
+    assert [agent.qtable[(k,)][A] for k in range(5)] == pytest.approx([agent.alpha * e for e in expected])
@@ -0,0 +1,61 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("options", [{"workers": 2}, {"replay": True}, {"traces": "sarsa"}])
+@pytest.mark.parametrize("agent_kind", ["tiles", "dqn"])
+def test_do_learners_reject_transition_options(agent_kind, options):
+    with pytest.raises(ValueError, match="--workers, --replay et --traces"):
+        main.train(episodes=1, render_every=0, agent_kind=agent_kind, **options)
+
+
+def test_dqn_agent_leaves_blas_threads_alone(monkeypatch):
+    import agent
+    from environment import Environment
+
+    calls = []
+    monkeypatch.setattr(agent, "set_blas_threads", calls.append)
+    agent.DQNAgent(Environment())
+    assert calls == []
+
+
+def test_interrupted_training_flushes_the_log(tmp_path, monkeypatch):
+    from agent import Agent
+    from logging_utils import read_training_log
+
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def replay_learn(self, *args):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return set()
+
+    monkeypatch.setattr(Agent, "replay_learn", replay_learn)
+    with pytest.raises(KeyboardInterrupt):
+        main.train(episodes=5, render_every=0, seed=0, record="episodes.rpl")
+
+    assert [e["episode"] for e in read_training_log() if e["type"] == "episode"] == [1]
+
+
+def test_cli_maps_train_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "train", lambda **kwargs: calls.append(kwargs))
+    main.main(["train", "20", "5", "--agent", "dense", "--seed", "3", "--record", "r.bin",
+               "--checksums", "--repeat", "4", "--blas-threads", "1"])
+
+    (kwargs,) = calls
+    assert (kwargs["episodes"], kwargs["render_every"], kwargs["agent_kind"]) == (20, 5, "dense")
+    assert (kwargs["seed"], kwargs["record"], kwargs["repeat"], kwargs["blas_threads"]) == (3, "r.bin", 4, 1)
+    assert kwargs["record_flags"] == main.CHECK_REWARD | main.CHECK_STATE
+    assert kwargs["workers"] == 1 and not kwargs["replay"] and kwargs["traces"] is None
+
+
+@pytest.mark.parametrize("argv", [["train", "--blas-threads"], ["train", "--agent", "nope"], ["play", "--agent"]])
+def test_cli_rejects_bad_options_with_usage_error(argv, monkeypatch):
+    monkeypatch.setattr(main, "train", lambda **kwargs: pytest.fail("train appelé"))
+    with pytest.raises(SystemExit) as exc:
+        main.main(argv)
+    assert exc.value.code == 2
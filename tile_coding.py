@@ -0,0 +1,67 @@
+"""Tile coding haché: observation continue → indices de tuiles dans un tableau de taille fixe.
+
+Les features sont regroupées (p. ex. distance et largeur du prochain fossé);
+chaque groupe est pavé par `n_tilings` grilles décalées les unes des autres
+(décalage asymétrique 1, 3, 5... par dimension). Une observation active
+exactement une tuile par (grille, groupe); les coordonnées de la tuile sont
+hachées dans [0, size), d'où une mémoire constante quelle que soit la
+longueur de l'entraînement (les collisions rares sont tolérées).
+
+Tout est vectorisé: un appel à tiles() = une poignée d'opérations NumPy.
+
+Références: Sutton & Barto, "Reinforcement Learning: An Introduction", §9.5.4.
+"""
+
+import numpy as np
+
+# Multiplicateur final (hachage multiplicatif de Knuth, bits de poids fort gardés)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+class TileCoder:
+    """Tuiles hachées sur les groupes `groups` de features bornées par `bounds`.
+
+    groups: tuples (indices des features, tuiles par dimension).
+    size: nombre de lignes de poids (puissance de 2).
+    seed: graine du hachage; doit rester la même entre sauvegarde et chargement.
+    """
+
+    def __init__(self, bounds, groups, n_tilings=8, size=2 ** 18, seed=0):
+        if size & (size - 1):
+            raise ValueError(f"TileCoder: size doit être une puissance de 2 (reçu {size})")
+        self.n_tilings = n_tilings
+        self.size = size
+        self.n_active = n_tilings * len(groups)
+
+        columns, tiles, local, starts = [], [], [], []
+        for features, n_tiles in groups:
+            starts.append(len(columns))
+            for j, feature in enumerate(features):
+                columns.append(feature)
+                tiles.append(n_tiles)
+                local.append(j)
+        low = np.array([bounds[f][0] for f in columns], dtype=np.float64)
+        high = np.array([bounds[f][1] for f in columns], dtype=np.float64)
+        tiles = np.array(tiles, dtype=np.float64)
+
+        self._columns = np.array(columns, dtype=np.intp)
+        self._low = low
+        self._scale = tiles / (high - low)
+        self._max = tiles
+        self._starts = np.array(starts, dtype=np.intp)
+        # Décalage de la grille t sur la j-ième dimension d'un groupe: t * (2j + 1) / n_tilings
+        t = np.arange(n_tilings)[:, None]
+        self._offsets = (t * (2 * np.array(local) + 1) / n_tilings) % 1.0
+
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 2 ** 63, size=len(columns), dtype=np.uint64) | np.uint64(1)
+        self._salts = rng.integers(0, 2 ** 63, size=(n_tilings, len(groups)), dtype=np.uint64)
+        self._shift = np.uint64(64 - size.bit_length() + 1)
+
+    def tiles(self, features):
+        """Indices (n_active,) des tuiles actives pour une observation (séquence de floats)."""
+        values = np.asarray(features, dtype=np.float64)[self._columns]
+        scaled = np.clip((values - self._low) * self._scale, 0.0, self._max)
+        coords = (scaled + self._offsets).astype(np.uint64)  # floor (valeurs positives)
+        hashed = np.add.reduceat(coords * self._multipliers, self._starts, axis=1) + self._salts
+        return ((hashed * _GOLDEN) >> self._shift).astype(np.intp).ravel()
@@ -0,0 +1,508 @@
+"""Batch environment: N copies of the static level advanced in lockstep with NumPy.
+
+Chaque instance reproduit exactement `Environment.step` (physique, spawn,
+rewards) : les Q-tables apprises ici sont transférables à l'environnement scalaire.
+"""
+
+import numpy as np
+
+from constants import (
+    SCREEN_HEIGHT, PLAYER_SIZE, GRAVITY, JUMP_FORCE, PLAYER_SPEED, PLAYER_MAX_LIVES,
+    ENEMY_SIZE, ENEMY_SPEED, ENEMY_SHOOT_RANGE, BULLET_SIZE, BULLET_SPEED,
+    LEVEL_LENGTH, RADAR_RANGE_NEAR, RADAR_RANGE_FAR, BUCKET_SIZE, MAX_STEPS,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_SHOOT, ACTION_IDLE,
+    REWARD_SHOOT, REWARD_PROGRESS, REWARD_BACKWARD, REWARD_IDLE,
+    REWARD_ENEMY_HIT, REWARD_DAMAGE, REWARD_WASTED_BULLET,
+    REWARD_SHOOT_NO_TARGET, REWARD_ENEMY_PASSED,
+    REWARD_DEATH, REWARD_GOAL, REWARD_LIFE_BONUS, REWARD_TIMEOUT,
+    OWNER_PLAYER, OWNER_ENEMY
+)
+from level.static_level import get_shared_level
+
+
+def _overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Equivalent vectorisé de pygame.Rect.colliderect (positions tronquées en int)."""
+    ax = np.trunc(ax)
+    ay = np.trunc(ay)
+    bx = np.trunc(bx)
+    by = np.trunc(by)
+    return (ax < bx + bw) & (bx < ax + aw) & (ay < by + bh) & (by < ay + ah)
+
+
+class VectorEnvironment:
+    """N instances de `Environment` en structure-of-arrays, auto-reset inclus."""
+
+    def __init__(self, num_envs, bullet_capacity=32):
+        self.num_envs = num_envs
+        self.level = get_shared_level()
+
+        # Géométrie statique (partagée par toutes les instances)
+        platforms = self.level.platforms
+        self.plat_x = np.array([p.x for p in platforms], dtype=np.float64)
+        self.plat_y = np.array([p.y for p in platforms], dtype=np.float64)
+        self.plat_w = np.array([p.width for p in platforms], dtype=np.float64)
+        self.plat_h = np.array([p.height for p in platforms], dtype=np.float64)
+        self.pit_x = np.array([p.x for p in self.level.pits], dtype=np.float64)
+        self.pit_w = np.array([p.width for p in self.level.pits], dtype=np.float64)
+
+        # Ennemis: valeurs initiales + propriétés constantes par type
+        enemies = self.level.enemies
+        self.num_enemies = len(enemies)
+        self.enemy_x0 = np.array([e.x for e in enemies], dtype=np.float64)
+        self.enemy_y = np.array([e.y for e in enemies], dtype=np.float64)
+        self.enemy_walker = np.array([e.enemy_type == 'walker' for e in enemies], dtype=bool)
+        self.enemy_shooter = np.array([e.enemy_type in ['shooter', 'stationary'] for e in enemies], dtype=bool)
+        self.enemy_has_platform = np.array([bool(e.platform) for e in enemies], dtype=bool)
+        self.enemy_plat_x = np.array([e.platform.x if e.platform else 0 for e in enemies], dtype=np.float64)
+        self.enemy_plat_w = np.array([e.platform.width if e.platform else 0 for e in enemies], dtype=np.float64)
+        self.enemy_speed = np.where(self.enemy_walker, ENEMY_SPEED, 0).astype(np.float64)
+
+        n, e = num_envs, self.num_enemies
+
+        # Player
+        self.player_x = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.player_vel_x = np.zeros(n)
+        self.player_vel_y = np.zeros(n)
+        self.player_on_ground = np.zeros(n, dtype=bool)
+        self.player_direction = np.zeros(n, dtype=np.int64)
+        self.player_lives = np.zeros(n, dtype=np.int64)
+        self.player_cooldown = np.zeros(n, dtype=np.int64)
+
+        # Enemies
+        self.enemy_x = np.zeros((n, e))
+        self.enemy_direction = np.zeros((n, e), dtype=np.int64)
+        self.enemy_cooldown = np.zeros((n, e), dtype=np.int64)
+        self.enemy_hp = np.zeros((n, e), dtype=np.int64)
+        self.enemy_active = np.zeros((n, e), dtype=bool)
+        self.enemy_spawned = np.zeros((n, e), dtype=bool)
+
+        # Bullets: liste compacte par instance (ordre d'insertion conservé)
+        self._alloc_bullets(bullet_capacity)
+
+        # Tracking
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.max_x = np.zeros(n)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.victory = np.zeros(n, dtype=bool)
+        # États terminaux des instances réinitialisées au dernier step
+        self.terminal_states = [None] * n
+
+        self._reset_mask(np.ones(n, dtype=bool))
+
+    def _alloc_bullets(self, capacity):
+        n = self.num_envs
+        self.bullet_capacity = capacity
+        self.bullet_count = np.zeros(n, dtype=np.int64)
+        self.bullet_x = np.zeros((n, capacity))
+        self.bullet_y = np.zeros((n, capacity))
+        self.bullet_direction = np.zeros((n, capacity), dtype=np.int64)
+        self.bullet_owner = np.zeros((n, capacity), dtype=np.int64)
+        self.bullet_active = np.zeros((n, capacity), dtype=bool)
+        # Balle joueur pas encore "rentabilisée" (équivalent de player_bullets_shot)
+        self.bullet_pending = np.zeros((n, capacity), dtype=bool)
+
+    def _grow_bullets(self, needed):
+        """Agrandir le pool si une instance dépasse la capacité (rare)."""
+        if needed <= self.bullet_capacity:
+            return
+        capacity = max(needed, self.bullet_capacity * 2)
+        old = (self.bullet_count, self.bullet_x, self.bullet_y, self.bullet_direction,
+               self.bullet_owner, self.bullet_active, self.bullet_pending)
+        old_capacity = self.bullet_capacity
+        self._alloc_bullets(capacity)
+        self.bullet_count = old[0]
+        for new, prev in zip((self.bullet_x, self.bullet_y, self.bullet_direction,
+                              self.bullet_owner, self.bullet_active, self.bullet_pending), old[1:]):
+            new[:, :old_capacity] = prev
+
+    def _reset_mask(self, mask):
+        """Remettre à l'état initial les instances sélectionnées."""
+        self.player_x[mask] = 100
+        self.player_y[mask] = SCREEN_HEIGHT - 100
+        self.player_vel_x[mask] = 0
+        self.player_vel_y[mask] = 0
+        self.player_on_ground[mask] = False
+        self.player_direction[mask] = 1
+        self.player_lives[mask] = PLAYER_MAX_LIVES
+        self.player_cooldown[mask] = 0
+
+        self.enemy_x[mask] = self.enemy_x0
+        self.enemy_direction[mask] = -1
+        self.enemy_cooldown[mask] = 0
+        self.enemy_hp[mask] = 1
+        self.enemy_active[mask] = True
+        self.enemy_spawned[mask] = False
+
+        self.bullet_count[mask] = 0
+        self.bullet_active[mask] = False
+        self.bullet_pending[mask] = False
+
+        self.steps[mask] = 0
+        self.max_x[mask] = 0
+        self.game_over[mask] = False
+        self.victory[mask] = False
+
+    def reset(self):
+        """Réinitialiser toutes les instances. Returns: liste de N états."""
+        self._reset_mask(np.ones(self.num_envs, dtype=bool))
+        self.terminal_states = [None] * self.num_envs
+        return self.get_states()
+
+    # ------------------------------------------------------------------
+    # Bullets
+    # ------------------------------------------------------------------
+    def _append_bullets(self, mask, x, y, direction, owner):
+        """Ajouter une balle en fin de liste pour chaque instance de `mask`."""
+        idx = np.nonzero(mask)[0]
+        if idx.size == 0:
+            return
+        self._grow_bullets(int(self.bullet_count[idx].max()) + 1)
+        slot = self.bullet_count[idx]
+        self.bullet_x[idx, slot] = x[idx]
+        self.bullet_y[idx, slot] = y[idx]
+        self.bullet_direction[idx, slot] = direction[idx]
+        self.bullet_owner[idx, slot] = owner
+        self.bullet_active[idx, slot] = True
+        self.bullet_pending[idx, slot] = owner == OWNER_PLAYER
+        self.bullet_count[idx] += 1
+
+    def _compact_bullets(self, keep):
+        """Retirer les balles non conservées en préservant l'ordre d'insertion."""
+        order = np.argsort(~keep, axis=1, kind='stable')
+        for name in ('bullet_x', 'bullet_y', 'bullet_direction', 'bullet_owner',
+                     'bullet_active', 'bullet_pending'):
+            setattr(self, name, np.take_along_axis(getattr(self, name), order, axis=1))
+        self.bullet_count = keep.sum(axis=1)
+        in_list = np.arange(self.bullet_capacity) < self.bullet_count[:, None]
+        self.bullet_active &= in_list
+        self.bullet_pending &= in_list
+
+    def _update_bullets(self, live, reward):
+        """Phase 6: retrait des balles mortes (pénalité) puis déplacement."""
+        in_list = (np.arange(self.bullet_capacity) < self.bullet_count[:, None]) & live[:, None]
+        dead = in_list & ~self.bullet_active
+        wasted = dead & (self.bullet_owner == OWNER_PLAYER) & self.bullet_pending
+        # Additions successives (même arrondi flottant que la version scalaire)
+        wasted_count = wasted.sum(axis=1)
+        for k in range(int(wasted_count.max(initial=0))):
+            reward += np.where(wasted_count > k, REWARD_WASTED_BULLET, 0)
+
+        keep = (np.arange(self.bullet_capacity) < self.bullet_count[:, None]) & ~dead
+        self._compact_bullets(keep)
+
+        moving = self.bullet_active & live[:, None]
+        self.bullet_x = np.where(moving, self.bullet_x + BULLET_SPEED * self.bullet_direction, self.bullet_x)
+        out = moving & ((self.bullet_x < -100) | (self.bullet_x > LEVEL_LENGTH + 100))
+        self.bullet_active &= ~out
+        moving &= ~out
+
+        hit = np.zeros_like(moving)
+        for i in range(len(self.plat_x)):
+            hit |= _overlap(self.bullet_x, self.bullet_y, BULLET_SIZE, BULLET_SIZE,
+                            self.plat_x[i], self.plat_y[i], self.plat_w[i], self.plat_h[i])
+        self.bullet_active &= ~(moving & hit)
+
+    # ------------------------------------------------------------------
+    # Player
+    # ------------------------------------------------------------------
+    def _player_move(self, actions, live):
+        """Phase 1 (Player.move). Returns: masque des tirs effectifs."""
+        left = live & (actions == ACTION_LEFT)
+        right = live & (actions == ACTION_RIGHT)
+        idle = live & (actions == ACTION_IDLE)
+        self.player_vel_x[left] = -PLAYER_SPEED
+        self.player_direction[left] = -1
+        self.player_vel_x[right] = PLAYER_SPEED
+        self.player_direction[right] = 1
+        self.player_vel_x[idle] = 0
+
+        jump = live & (actions == ACTION_JUMP) & self.player_on_ground
+        self.player_vel_y[jump] = JUMP_FORCE
+        self.player_on_ground[jump] = False
+
+        shoot = live & (actions == ACTION_SHOOT) & (self.player_cooldown == 0)
+        self.player_cooldown[shoot] = 15
+        bullet_x = self.player_x + np.where(self.player_direction == 1, PLAYER_SIZE, 0)
+        bullet_y = self.player_y + PLAYER_SIZE // 2
+        self._append_bullets(shoot, bullet_x, bullet_y, self.player_direction, OWNER_PLAYER)
+        return shoot
+
+    def _player_update(self, live):
+        """Phase 2 (Player.update). Returns: masque des chutes mortelles."""
+        size = PLAYER_SIZE
+        self.player_vel_y = np.where(live, self.player_vel_y + GRAVITY, self.player_vel_y)
+        self.player_x = np.where(live, self.player_x + self.player_vel_x, self.player_x)
+
+        # Collision horizontale (rect calculé une seule fois, comme Player.update)
+        rect_x = self.player_x.copy()
+        rect_y = self.player_y.copy()
+        for i in range(len(self.plat_x)):
+            hit = live & _overlap(rect_x, rect_y, size, size,
+                                  self.plat_x[i], self.plat_y[i], self.plat_w[i], self.plat_h[i])
+            self.player_x = np.where(hit & (self.player_vel_x > 0), self.plat_x[i] - size, self.player_x)
+            self.player_x = np.where(hit & (self.player_vel_x < 0), self.plat_x[i] + self.plat_w[i], self.player_x)
+
+        # Collision verticale
+        self.player_y = np.where(live, self.player_y + self.player_vel_y, self.player_y)
+        rect_x = self.player_x.copy()
+        rect_y = self.player_y.copy()
+        self.player_on_ground[live] = False
+        for i in range(len(self.plat_x)):
+            hit = live & _overlap(rect_x, rect_y, size, size,
+                                  self.plat_x[i], self.plat_y[i], self.plat_w[i], self.plat_h[i])
+            falling = hit & (self.player_vel_y > 0)
+            ceiling = hit & (self.player_vel_y < 0)
+            self.player_y = np.where(falling, self.plat_y[i] - size, self.player_y)
+            self.player_y = np.where(ceiling, self.plat_y[i] + self.plat_h[i], self.player_y)
+            self.player_vel_y[falling | ceiling] = 0
+            self.player_on_ground |= falling
+
+        self.player_x = np.where(live, np.clip(self.player_x, 0, LEVEL_LENGTH - size), self.player_x)
+
+        fell_off = live & (self.player_y > SCREEN_HEIGHT + 50)
+        cooling = live & ~fell_off & (self.player_cooldown > 0)
+        self.player_cooldown[cooling] -= 1
+        return fell_off
+
+    # ------------------------------------------------------------------
+    # Enemies
+    # ------------------------------------------------------------------
+    def _update_enemies(self, live):
+        """Phase 5: spawn + Enemy.update, dans l'ordre des ennemis."""
+        for j in range(self.num_enemies):
+            x = self.enemy_x[:, j]
+            spawn = live & ~self.enemy_spawned[:, j] & (x < self.player_x + 500)
+            self.enemy_spawned[spawn, j] = True
+
+            acting = live & self.enemy_active[:, j]
+            spawned = self.enemy_spawned[:, j]
+            self.enemy_active[acting & (x < self.player_x - 1000), j] = False
+
+            if self.enemy_walker[j] and self.enemy_has_platform[j]:
+                walking = acting & spawned
+                direction = self.enemy_direction[:, j]
+                x = np.where(walking, x + self.enemy_speed[j] * direction, x)
+                low = walking & (x <= self.enemy_plat_x[j])
+                high_limit = self.enemy_plat_x[j] + self.enemy_plat_w[j] - ENEMY_SIZE
+                high = walking & ~low & (x >= high_limit)
+                x = np.where(low, self.enemy_plat_x[j], x)
+                x = np.where(high, high_limit, x)
+                direction[low] = 1
+                direction[high] = -1
+                self.enemy_x[:, j] = x
+
+            if self.enemy_shooter[j]:
+                shooting = acting & spawned
+                cooldown = self.enemy_cooldown[:, j]
+                cooldown[shooting & (cooldown > 0)] -= 1
+                fire = shooting & (np.abs(x - self.player_x) < ENEMY_SHOOT_RANGE) & (cooldown == 0)
+                cooldown[fire] = 120
+                direction = np.where(self.player_x < x, -1, 1)
+                self._append_bullets(fire, x + ENEMY_SIZE // 2,
+                                     np.full(self.num_envs, self.enemy_y[j] + ENEMY_SIZE // 2),
+                                     direction, OWNER_ENEMY)
+
+    # ------------------------------------------------------------------
+    # Step
+    # ------------------------------------------------------------------
+    def step(self, actions):
+        """Avancer les N instances d'un step.
+        Returns: (states, rewards, dones) — les instances terminées sont
+        réinitialisées et leur état final est dans `terminal_states`.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        n = self.num_envs
+        self.steps += 1
+        reward = np.zeros(n)
+        done = np.zeros(n, dtype=bool)
+        live = np.ones(n, dtype=bool)
+        old_x = self.player_x.copy()
+        old_max_x = self.max_x.copy()
+
+        def finish(mask, value):
+            """Terminer l'épisode (équivalent d'un `return` dans Environment.step)."""
+            reward[:] = np.where(mask, value, reward)
+            done[mask] = True
+            live[mask] = False
+
+        # 1. PLAYER ACTION
+        shot = self._player_move(actions, live)
+        reward += np.where(shot, REWARD_SHOOT, 0)
+        visible = self.enemy_active & self.enemy_spawned
+        enemy_dist = np.where(visible, np.abs(self.enemy_x - self.player_x[:, None]), np.inf)
+        nearest = enemy_dist.min(axis=1, initial=np.inf)
+        reward += np.where(shot & (nearest > RADAR_RANGE_NEAR), REWARD_SHOOT_NO_TARGET, 0)
+
+        # 2. PLAYER PHYSICS
+        fell_off = self._player_update(live)
+        self.game_over |= fell_off
+        finish(fell_off, REWARD_DEATH)
+
+        # 3. PROGRESSION REWARDS
+        self.max_x = np.where(live, np.maximum(self.max_x, self.player_x), self.max_x)
+        progress = live & (self.player_x > old_max_x)
+        reward += np.where(progress, REWARD_PROGRESS * ((self.player_x - old_max_x) / 10), 0)
+        backward = live & ~progress & (self.player_x < old_x - 2)
+        reward += np.where(backward, REWARD_BACKWARD, 0)
+
+        # 4. IDLE PENALTY
+        reward += np.where(live & (actions == ACTION_IDLE), REWARD_IDLE, 0)
+
+        # 5. ENEMY SPAWNING & UPDATE
+        self._update_enemies(live)
+
+        # 6. BULLET UPDATE & WASTED BULLET PENALTY
+        self._update_bullets(live, reward)
+
+        # 7. COLLISION DETECTION
+        px, py = self.player_x, self.player_y
+        for j in range(self.num_enemies):
+            touch = (live & self.enemy_active[:, j] & self.enemy_spawned[:, j]
+                     & _overlap(px, py, PLAYER_SIZE, PLAYER_SIZE,
+                                self.enemy_x[:, j], self.enemy_y[j], ENEMY_SIZE, ENEMY_SIZE))
+            self.player_lives[touch] -= 1
+            dead = touch & (self.player_lives <= 0)
+            self.game_over |= dead
+            finish(dead, REWARD_DEATH)
+            hurt = touch & ~dead
+            reward += np.where(hurt, REWARD_DAMAGE, 0)
+            self.enemy_active[hurt, j] = False
+
+        rows = np.arange(n)
+        for b in range(int(self.bullet_count.max(initial=0))):
+            touch = (live & self.bullet_active[:, b] & (self.bullet_owner[:, b] == OWNER_ENEMY)
+                     & _overlap(px, py, PLAYER_SIZE, PLAYER_SIZE,
+                                self.bullet_x[:, b], self.bullet_y[:, b], BULLET_SIZE, BULLET_SIZE))
+            self.bullet_active[touch, b] = False
+            self.player_lives[touch] -= 1
+            dead = touch & (self.player_lives <= 0)
+            self.game_over |= dead
+            finish(dead, REWARD_DEATH)
+            reward += np.where(touch & ~dead, REWARD_DAMAGE, 0)
+
+        for b in range(int(self.bullet_count.max(initial=0))):
+            shooting = live & self.bullet_active[:, b] & (self.bullet_owner[:, b] == OWNER_PLAYER)
+            hits = (shooting[:, None] & self.enemy_active & self.enemy_spawned
+                    & _overlap(self.bullet_x[:, b, None], self.bullet_y[:, b, None], BULLET_SIZE, BULLET_SIZE,
+                               self.enemy_x, self.enemy_y[None, :], ENEMY_SIZE, ENEMY_SIZE))
+            touched = hits.any(axis=1)
+            target = hits.argmax(axis=1)
+            self.bullet_active[touched, b] = False
+            self.bullet_pending[touched, b] = False
+            hp = self.enemy_hp[rows, target] - touched
+            self.enemy_hp[rows, target] = hp
+            killed = touched & (hp <= 0)
+            self.enemy_active[rows[killed], target[killed]] = False
+            reward += np.where(killed, REWARD_ENEMY_HIT, 0)
+
+        # 7bis. Ennemis laissés derrière
+        for j in range(self.num_enemies):
+            passed = live & self.enemy_active[:, j] & self.enemy_spawned[:, j] & (self.enemy_x[:, j] < px - 250)
+            reward += np.where(passed, REWARD_ENEMY_PASSED, 0)
+
+        # 8. VICTORY CHECK
+        flag = live & _overlap(px, py, PLAYER_SIZE, PLAYER_SIZE,
+                               self.level.flag_x, self.level.flag_y, 60, 60)
+        speed_bonus = np.maximum(0, (5000 - self.steps) / 5)
+        self.victory |= flag
+        finish(flag, REWARD_GOAL + (REWARD_LIFE_BONUS * self.player_lives) + speed_bonus)
+
+        # 9. TIMEOUT
+        finish(live & (self.steps > MAX_STEPS), REWARD_TIMEOUT)
+
+        states = self.get_states()
+        self.terminal_states = [None] * n
+        if done.any():
+            for i in np.nonzero(done)[0]:
+                self.terminal_states[i] = states[i]
+            self._reset_mask(done)
+            reset_states = self.get_states()
+            for i in np.nonzero(done)[0]:
+                states[i] = reset_states[i]
+        return states, reward, done
+
+    # ------------------------------------------------------------------
+    # Observation (équivalent vectorisé de Environment.get_state)
+    # ------------------------------------------------------------------
+    def get_state_array(self):
+        """Matrice (N, 18) des états 18D."""
+        n = self.num_envs
+        x = self.player_x
+        y = self.player_y
+        feet = y + PLAYER_SIZE
+        cols = []
+
+        # A. Player state (5D)
+        cols.append(np.minimum(59, (x / BUCKET_SIZE).astype(np.int64)))
+        on_ground = self.player_on_ground.astype(np.int64)
+        cols.append(on_ground)
+        cols.append(np.where(self.player_on_ground, 0, np.where(self.player_vel_y < -5, 1, 2)))
+        cols.append(np.where(self.player_vel_x < -1, -1, np.where(self.player_vel_x > 1, 1, 0)))
+        cols.append(on_ground)
+
+        # B. Pits
+        pit_dist = self.pit_x[None, :] - x[:, None]
+        in_range = (pit_dist > 0) & (pit_dist < RADAR_RANGE_FAR)
+        has_pit = in_range.any(axis=1)
+        closest = np.where(in_range, pit_dist, np.inf).argmin(axis=1)
+        distance = np.where(has_pit, pit_dist[np.arange(n), closest], 0)
+        cols.append(np.where(has_pit, np.minimum(12, (distance / BUCKET_SIZE).astype(np.int64)), 0))
+        width = self.pit_w[closest] if len(self.pit_w) else np.zeros(n)
+        cols.append(np.where(has_pit, np.minimum(5, (width / BUCKET_SIZE).astype(np.int64) + 1), 0))
+
+        remaining = (self.plat_x + self.plat_w)[None, :] - (x + PLAYER_SIZE)[:, None]
+        standing = ((self.plat_y[None, :] <= feet[:, None]) & (feet[:, None] <= (self.plat_y + self.plat_h)[None, :])
+                    & (remaining > 0))
+        first = standing.argmax(axis=1)
+        pixels = remaining[np.arange(n), first]
+        ground = np.select([pixels < 30, pixels < 60, pixels < 100], [1, 2, 3], 4)
+        cols.append(np.where(standing.any(axis=1), ground, 0))
+
+        # C. Platforms ahead
+        plat_dist = self.plat_x[None, :] - x[:, None]
+        ahead = (plat_dist > 0) & (plat_dist < RADAR_RANGE_FAR)
+        has_plat = ahead.any(axis=1)
+        closest = np.where(ahead, plat_dist, np.inf).argmin(axis=1)
+        distance = plat_dist[np.arange(n), closest]
+        cols.append(np.where(has_plat, np.minimum(12, (np.where(has_plat, distance, 0) / BUCKET_SIZE).astype(np.int64)), 0))
+        height_diff = y - self.plat_y[closest]
+        height = np.select([height_diff < -80, height_diff < -40, height_diff < 40, height_diff < 80],
+                           [2, 1, 0, -1], -2)
+        cols.append(np.where(has_plat, height, 0))
+
+        # D. Enemies
+        visible = self.enemy_active & self.enemy_spawned
+        enemy_dist = np.where(visible, np.abs(self.enemy_x - x[:, None]), np.inf)
+        has_enemy = visible.any(axis=1)
+        closest = enemy_dist.argmin(axis=1)
+        distance = np.where(has_enemy, enemy_dist[np.arange(n), closest], 0)
+        cols.append(np.where(has_enemy, np.minimum(12, (distance / BUCKET_SIZE).astype(np.int64)), 0))
+        cols.append(np.where(has_enemy, np.where(self.enemy_shooter[closest], 2, 1), 0))
+        cols.append(np.minimum(3, (enemy_dist < RADAR_RANGE_NEAR).sum(axis=1)))
+
+        # E. Bullets
+        in_list = np.arange(self.bullet_capacity) < self.bullet_count[:, None]
+        enemy_bullets = in_list & self.bullet_active & (self.bullet_owner == OWNER_ENEMY)
+        coming = (((self.bullet_direction == 1) & (self.bullet_x < x[:, None]))
+                  | ((self.bullet_direction == -1) & (self.bullet_x > x[:, None])))
+        same_height = np.abs(self.bullet_y - y[:, None]) < 50
+        dangerous = enemy_bullets & coming & same_height
+        has_bullet = dangerous.any(axis=1)
+        bullet_dist = np.where(dangerous, np.abs(self.bullet_x - x[:, None]), np.inf).min(axis=1, initial=np.inf)
+        bullet_dist = np.where(has_bullet, bullet_dist, 0)
+        danger = np.select([bullet_dist < 100, bullet_dist < 200, bullet_dist < 400], [3, 2, 1], 0)
+        cols.append(np.where(has_bullet, danger, 0))
+        cols.append(np.where(has_bullet, np.minimum(8, (bullet_dist / BUCKET_SIZE).astype(np.int64)), 0))
+        cols.append(np.minimum(3, dangerous.sum(axis=1)))
+
+        # F. Goal
+        distance = (LEVEL_LENGTH - 100) - x
+        cols.append(np.where(distance < 0, -1, np.where(distance < 50, 0, 1)))
+        cols.append(np.minimum(10, (np.abs(distance) / 300).astype(np.int64)))
+
+        return np.stack([np.asarray(c, dtype=np.int64) for c in cols], axis=1)
+
+    def get_states(self):
+        """Liste de N tuples 18D, compatibles avec les clés de `Agent.qtable`."""
+        return [tuple(row) for row in self.get_state_array().tolist()]